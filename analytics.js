@@ -0,0 +1,172 @@
+// Batched, offline-tolerant analytics queue (defines window.trackEvent).
+//
+// trackEvent() only appends to an in-memory queue. The queue is flushed when
+// the browser is idle and whenever the page is hidden or unloaded:
+//   - GA events (GA_EVENTS) are handed to gtag in one go,
+//   - every event is POSTed as one batch with navigator.sendBeacon to
+//     window.ANALYTICS_ENDPOINT (see ingest_events.py), if one is configured.
+// Batches that can't be sent (offline, or the beacon is refused) are kept in
+// IndexedDB and retried on the next flush, when the browser comes back
+// online, and on the next page load.
+//
+// Batch format: { v: 1, session_id, sent_at, events: [{ name, t, params }] }
+//
+// Also defines window.measurePhase(): every performance.measure() named
+// 'sim:<phase>' (load phases in index.html / app.jsx, step transitions and
+// artefact mounts in hr-simulation.jsx) is reported as a perf_measure event.
+(function () {
+    const BATCH_VERSION = 1;
+    const MAX_BATCH = 50;        // sendBeacon payloads are capped at ~64KB
+    const IDLE_TIMEOUT = 5000;   // flush within 5s even if never idle
+    const DB_NAME = 'analytics';
+    const STORE = 'batches';
+    const GA_EVENTS = new Set(['screen_view', 'simulation_start', 'simulation_complete', 'badge_shared']);
+
+    // Parsed once instead of on every event
+    const params = new URLSearchParams(window.location.search);
+    const userName = params.get('user_name');
+    const debug = params.has('debug');
+    const sessionId = (window.crypto && crypto.randomUUID)
+        ? crypto.randomUUID()
+        : Date.now().toString(36) + Math.random().toString(36).slice(2);
+
+    if (userName && typeof gtag === 'function') {
+        gtag('set', 'user_properties', { user_name: userName });
+    }
+
+    let queue = [];
+    let flushScheduled = false;
+
+    // --- IndexedDB outbox ---------------------------------------------------
+    let dbPromise = null;
+    function openDb() {
+        if (!window.indexedDB) return Promise.resolve(null);
+        if (!dbPromise) {
+            dbPromise = new Promise(resolve => {
+                const request = indexedDB.open(DB_NAME, 1);
+                request.onupgradeneeded = () => request.result.createObjectStore(STORE, { autoIncrement: true });
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null); // private mode etc.: stay in-memory only
+            });
+        }
+        return dbPromise;
+    }
+
+    function storeBatch(batch) {
+        return openDb().then(db => {
+            if (!db) return;
+            db.transaction(STORE, 'readwrite').objectStore(STORE).add(batch);
+        });
+    }
+
+    // Read and delete every stored batch in one transaction
+    function takeStoredBatches() {
+        return openDb().then(db => {
+            if (!db) return [];
+            return new Promise(resolve => {
+                const tx = db.transaction(STORE, 'readwrite');
+                const store = tx.objectStore(STORE);
+                const request = store.getAll();
+                request.onsuccess = () => {
+                    store.clear();
+                    tx.oncomplete = () => resolve(request.result);
+                };
+                request.onerror = () => resolve([]);
+            });
+        });
+    }
+
+    // --- Sending --------------------------------------------------------------
+    function send(batch) {
+        const endpoint = window.ANALYTICS_ENDPOINT;
+        if (!endpoint) return true;
+        if (!navigator.onLine || !navigator.sendBeacon) return false;
+        // text/plain keeps the beacon a "simple" request (no CORS preflight)
+        const body = new Blob([JSON.stringify(batch)], { type: 'text/plain' });
+        return navigator.sendBeacon(endpoint, body);
+    }
+
+    function sendOrStore(batch) {
+        if (!send(batch)) storeBatch(batch);
+    }
+
+    function flush() {
+        flushScheduled = false;
+        if (!queue.length) return;
+        const events = queue;
+        queue = [];
+
+        if (typeof gtag === 'function') {
+            events.forEach(e => {
+                if (GA_EVENTS.has(e.name)) gtag('event', e.name, e.params);
+            });
+        }
+
+        for (let i = 0; i < events.length; i += MAX_BATCH) {
+            sendOrStore({
+                v: BATCH_VERSION,
+                session_id: sessionId,
+                sent_at: Date.now(),
+                events: events.slice(i, i + MAX_BATCH),
+            });
+        }
+    }
+
+    function retryStored() {
+        if (!window.ANALYTICS_ENDPOINT || !navigator.onLine) return;
+        takeStoredBatches().then(batches => batches.forEach(sendOrStore));
+    }
+
+    function scheduleFlush() {
+        if (flushScheduled) return;
+        flushScheduled = true;
+        if (window.requestIdleCallback) {
+            requestIdleCallback(flush, { timeout: IDLE_TIMEOUT });
+        } else {
+            setTimeout(flush, 1000);
+        }
+    }
+
+    window.trackEvent = function (eventName, eventParams = {}) {
+        const finalParams = userName ? { ...eventParams, user_name: userName } : eventParams;
+        if (debug) console.log('📊 Track:', eventName, finalParams);
+        queue.push({ name: eventName, t: Date.now(), params: finalParams });
+        scheduleFlush();
+    };
+
+    // --- Performance measures -------------------------------------------------
+    window.measurePhase = function (phase, start, end, detail) {
+        try {
+            performance.measure('sim:' + phase, { start: start, end: end, detail: detail });
+        } catch (e) {
+            // User Timing Level 2 browsers: no measure options, no phase numbers
+        }
+    };
+
+    if (window.PerformanceObserver) {
+        const connection = navigator.connection || {};
+        try {
+            // buffered: also picks up the phases measured before this script ran
+            new PerformanceObserver(list => list.getEntries().forEach(entry => {
+                if (entry.name.indexOf('sim:') !== 0) return;
+                window.trackEvent('perf_measure', Object.assign({
+                    phase: entry.name.slice(4),
+                    duration_ms: Math.round(entry.duration),
+                    start_ms: Math.round(entry.startTime),
+                    net: connection.effectiveType || null,
+                    device_memory: navigator.deviceMemory || null,
+                }, entry.detail || {}));
+            })).observe({ type: 'measure', buffered: true });
+        } catch (e) {
+            // No observable 'measure' entries in this browser
+        }
+    }
+
+    // Page hide is the last reliable moment to send anything on mobile
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flush();
+    });
+    window.addEventListener('pagehide', flush);
+    window.addEventListener('online', retryStored);
+    retryStored();
+})();
@@ -0,0 +1,188 @@
+const { useState, useEffect, useRef, useCallback } = React;
+
+// UI Version Mapping Configuration
+const UI_VERSION_MAP = {
+  'simulation_1-5': 'v1',
+  'simulation_v2_1-5': 'v2',
+  'simulation_v3_1-5': 'v3',
+  'v4': 'v3'
+};
+
+// Resolve a repeated-string reference ("\u0001<index>") from a dist/ bundle
+function inflateBundle(node, strings) {
+  if (typeof node === 'string') return node.charCodeAt(0) === 1 ? strings[+node.slice(1)] : node;
+  if (Array.isArray(node)) return node.map(n => inflateBundle(n, strings));
+  if (node && typeof node === 'object') {
+    const out = {};
+    for (const k in node) out[k] = inflateBundle(node[k], strings);
+    return out;
+  }
+  return node;
+}
+
+// Network and JSON parse time are measured separately ('sim:fetch' / 'sim:parse')
+const fetchJson = (url, options) => {
+  const start = performance.now();
+  return fetch(url, options).then(r => {
+    if (!r.ok) throw new Error(`HTTP error! status: ${r.status}`);
+    const fetched = performance.now();
+    window.measurePhase('fetch', start, fetched, { url });
+    return r.json().then(json => {
+      window.measurePhase('parse', fetched, performance.now(), { url });
+      return json;
+    });
+  });
+};
+
+// Load the full simulation for a chunk stub ({ simulation_metadata, step_count, _chunk })
+function fetchChunk(stub) {
+  return fetchJson(stub._chunk).then(b => inflateBundle(b.d, b.s));
+}
+
+// Resolve simId through dist/sim-manifest.json (fetched by index.html):
+// prefer per-simulation chunks, then the compact bundle, then the pretty JSON.
+// Manifest targets have content-hashed names, so they are fetched without any
+// cache-busting and served from the browser/CDN cache on repeat visits. With
+// chunks, only the index and the first simulation are fetched up front; the
+// rest stay as metadata-only stubs.
+function loadSimulation(simId, firstIndex) {
+  const manifest = window.simManifest || fetchJson('dist/sim-manifest.json', { cache: 'no-cache' }).catch(() => ({}));
+  return manifest
+    .then(m => {
+      const chunked = m.chunked && m.chunked[simId];
+      if (chunked) {
+        const base = `dist/${chunked.index.replace(/[^/]+$/, '')}`;
+        console.log(`Loading chunk index: dist/${chunked.index}`);
+        return fetchJson(`dist/${chunked.index}`).then(index => {
+          const simulations = index.simulations.map(s => ({
+            simulation_metadata: s.simulation_metadata,
+            step_count: s.step_count,
+            _chunk: base + s.chunk
+          }));
+          const first = Math.min(firstIndex, simulations.length - 1);
+          return fetchChunk(simulations[first]).then(sim => {
+            simulations[first] = sim;
+            return { ...index.path, simulations };
+          });
+        });
+      }
+      const entry = m.paths && m.paths[simId];
+      // Unhashed source file: revalidate instead of bypassing the cache
+      if (!entry) return fetchJson(`${simId}.json`, { cache: 'no-cache' });
+      console.log(`Loading bundle: dist/${entry.file}`);
+      return fetchJson(`dist/${entry.file}`).then(b => inflateBundle(b.d, b.s));
+    });
+}
+
+function AppWrapper() {
+  const [data, setData] = useState(null);
+  // The compiled bundle (dist/app.<hash>.js) defines the engine before this runs
+  const [engineReady, setEngineReady] = useState(!!window.HRSimulationApp);
+  const [uiVersion, setUiVersion] = useState('v2'); // Default to v2
+  const [progress, setProgress] = useState(null);
+  // Dropped once the saved progress turns out to be past the start of simulation 1
+  const [showHook, setShowHook] = useState(!!prerenderedHook);
+  const dataRef = useRef(null);
+  const pendingChunks = useRef({});
+
+  // Fetch a simulation chunk once (no-op when already loaded) and swap it into data
+  const ensureSimulation = useCallback((idx) => {
+    const sim = dataRef.current?.simulations?.[idx];
+    if (!sim || !sim._chunk) return Promise.resolve(sim);
+    if (!pendingChunks.current[idx]) {
+      pendingChunks.current[idx] = fetchChunk(sim).then(full => {
+        const simulations = dataRef.current.simulations.slice();
+        simulations[idx] = full;
+        dataRef.current = { ...dataRef.current, simulations };
+        window.SIMULATION_DATA = dataRef.current;
+        setData(dataRef.current);
+        return full;
+      }).catch(err => {
+        delete pendingChunks.current[idx];
+        console.error(`Failed to load simulation ${idx + 1}:`, err);
+      });
+    }
+    return pendingChunks.current[idx];
+  }, []);
+
+  useEffect(() => {
+    // Fetch simulation data based on URL parameter
+    // Example: /?sim=custom_test loads custom_test.json
+    const params = new URLSearchParams(window.location.search);
+    const simId = params.get('sim') || 'v4';
+    const jsonPath = `${simId}.json`;
+
+    // Determine UI version from simId
+    const detectedVersion = UI_VERSION_MAP[simId] || 'v2';
+    setUiVersion(detectedVersion);
+    console.log(`UI Version detected: ${detectedVersion} for ${simId}`);
+
+    console.log(`Loading simulation from: ${jsonPath}`);
+
+    // One IndexedDB read for the saved progress (window.progressStore), which
+    // also decides which simulation chunk to fetch first
+    const saved = window.progressStore ? window.progressStore.read(simId).catch(() => null) : Promise.resolve(null);
+    saved
+      .then(snapshot => {
+        setProgress(snapshot);
+        if (snapshot && !window.progressStore.atStart(snapshot)) {
+          window.startHookClicked = false;
+          setShowHook(false);
+        }
+        const firstIndex = params.has('sim_index') || !snapshot
+          ? parseInt(params.get('sim_index') || '0', 10)
+          : snapshot.sim_index;
+        return loadSimulation(simId, firstIndex);
+      })
+      .then(d => {
+        dataRef.current = d;
+        window.SIMULATION_DATA = d;
+        window.UI_VERSION = detectedVersion; // Store globally for components
+        setData(d);
+      })
+      .catch(err => {
+        console.error("Failed to load JSON:", err);
+        setData({ error: true, message: `Failed to load ${jsonPath}. Check if file exists.` });
+      });
+
+    if (window.HRSimulationApp) return;
+
+    // Source fallback only: in-browser Babel runs the script tags async
+    const pollStart = performance.now();
+    const timer = setInterval(() => {
+      if (window.HRSimulationApp) {
+        window.measurePhase('engine-poll', pollStart, performance.now());
+        setEngineReady(true);
+        clearInterval(timer);
+      }
+    }, 100);
+    return () => clearInterval(timer);
+  }, []);
+
+  // Keep the prerendered Start Hook Card (see prerender.py) instead of a spinner
+  if ((!data || !engineReady) && showHook) return <div dangerouslySetInnerHTML={{ __html: prerenderedHook }} />;
+  if (!data) return <div style={{ color: '#8BA3B9', padding: '40px', textAlign: 'center' }}>Loading data...</div>;
+  if (!engineReady) return <div style={{ color: '#8BA3B9', padding: '40px', textAlign: 'center' }}>Initializing engine...</div>;
+
+  const simId = new URLSearchParams(window.location.search).get('sim') || 'v4';
+  return (
+    <>
+      <window.Profiled id="HRSimulationApp">
+        <window.HRSimulationApp simulationData={data} uiVersion={uiVersion} loadSimulation={ensureSimulation}
+          initialProgress={progress} progressKey={simId} />
+      </window.Profiled>
+      {window.PROFILE && <window.ProfilerOverlay />}
+    </>
+  );
+}
+
+// In-browser Babel fallback: index.html marked when Babel started compiling
+if (performance.getEntriesByName('sim:compile-start').length) {
+  performance.measure('sim:engine-compile', 'sim:compile-start');
+}
+
+const rootNode = document.getElementById('root');
+// Taken before React clears #root
+const prerenderedHook = rootNode.innerHTML;
+const root = ReactDOM.createRoot(rootNode);
+root.render(<AppWrapper />);
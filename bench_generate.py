@@ -0,0 +1,245 @@
+import copy
+import csv
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from compile_path import iter_path
+
+# Generation benchmark.
+#
+# Synthesizes paths shaped like simulation_v2_1-5.json (from 5 up to thousands
+# of simulations, with a configurable number of steps each) together with a
+# matching overlay sheet, then runs the pipeline the way generate_v3.py and
+# generate_v4.py do:
+#
+#     v3      rotate                          (V2 -> V3)
+#     v4      overlay -> segments -> validate (V3 -> V4)
+#     bundle  minified, string-interned bundle + .gz/.br
+#     chunks  per-simulation chunks + index
+#
+# Every stage runs in a fresh interpreter so its wall time and peak RSS are
+# its own, and always from a cold build cache. Results are written as JSON
+# (bench/<commit>.json by default) so runs can be compared across commits.
+#
+# Usage: python bench_generate.py [--sizes 5,50,500,5000] [--steps 5]
+#                                 [--out results.json] [--compare old.json]
+
+TEMPLATE = 'simulation_v2_1-5.json'
+OVERLAYS = os.path.join('content', 'v4_overlays.csv')
+SIZES = [5, 50, 500, 5000]
+STAGES = ['v3', 'v4', 'bundle', 'chunks']
+
+
+def _template():
+    with open(TEMPLATE, 'r') as f:
+        text = f.read()
+    path = {}
+    for key, value in iter_path(text):
+        path[key] = list(value) if key == 'simulations' else value
+    return path
+
+
+def _template_overlays():
+    from overlay_import import iter_rows
+
+    rows = {}
+    for _, row in iter_rows(OVERLAYS):
+        rows.setdefault(row['simulation_id'], {})[int(row['step_id'])] = row
+    return [rows[sim_id] for sim_id in rows]
+
+
+def synthesize(workdir, simulations, steps):
+    """Write a synthetic path (v2.json) and overlay sheet (overlays.csv) into `workdir`.
+
+    Simulation i copies template simulation i % n with its steps repeated up
+    to `steps`, and gets the overlay rows of template simulation i % m, so
+    every stage does the same work per step as on the real content.
+    """
+    from overlay_import import COLUMNS
+
+    template = _template()
+    sources = template['simulations']
+    overlays = _template_overlays()
+
+    path_file = os.path.join(workdir, 'v2.json')
+    sheet_file = os.path.join(workdir, 'overlays.csv')
+    with open(path_file, 'w') as out, open(sheet_file, 'w', newline='', encoding='utf-8') as sheet:
+        writer = csv.DictWriter(sheet, fieldnames=COLUMNS)
+        writer.writeheader()
+
+        out.write('{\n')
+        for key, value in template.items():
+            if key != 'simulations':
+                out.write(f'  {json.dumps(key)}: {json.dumps(value)},\n')
+        out.write('  "simulations": [\n')
+        for i in range(simulations):
+            # Written one simulation at a time: 5,000 x 5 steps is ~45MB of JSON in
+            simulation = copy.deepcopy(sources[i % len(sources)])
+            sim_id = f'SIM_{i + 1:05d}'
+            simulation['simulation_metadata']['simulation_id'] = sim_id
+            base_steps = simulation['step_level_design']
+            simulation['step_level_design'] = []
+            for j in range(steps):
+                step = copy.deepcopy(base_steps[j % len(base_steps)])
+                step['step_id'] = j + 1
+                simulation['step_level_design'].append(step)
+
+            rows = overlays[i % len(overlays)]
+            for j in range(steps):
+                row = rows.get(j % len(base_steps) + 1)
+                if row is not None:
+                    writer.writerow({**row, 'simulation_id': sim_id, 'step_id': j + 1})
+
+            out.write('    ' + json.dumps(simulation))
+            out.write(',\n' if i + 1 < simulations else '\n')
+        out.write('  ]\n}\n')
+    return path_file, sheet_file
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _dir_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory) for name in names)
+
+
+def run_stage(stage, workdir):
+    """Run one pipeline stage on the synthetic files in `workdir` (in this process)."""
+    from bundle import write_bundle, write_chunks
+    from compile_path import compile_path, path_simulation_ids, rotate_question_types, segment_prompts
+    from overlay_import import StreamingOverlay, iter_overlays
+    from validate_path import validate_stage
+
+    v2, v3, v4 = (os.path.join(workdir, name) for name in ('v2.json', 'v3.json', 'v4.json'))
+    dist = os.path.join(workdir, 'dist')
+
+    start = time.perf_counter()
+    if stage == 'v3':
+        compile_path(v2, v3, [rotate_question_types])
+        output = os.path.getsize(v3)
+    elif stage == 'v4':
+        overlays = StreamingOverlay(iter_overlays(os.path.join(workdir, 'overlays.csv')), path_simulation_ids(v3))
+        compile_path(v3, v4, [overlays, segment_prompts, validate_stage])
+        output = os.path.getsize(v4)
+    elif stage == 'bundle':
+        entry = write_bundle(v4, dist)
+        output = entry['bytes'] + entry['gzip_bytes'] + entry.get('br_bytes', 0)
+    elif stage == 'chunks':
+        write_chunks(v4, dist)
+        output = _dir_bytes(os.path.join(dist, 'v4'))
+    else:
+        raise ValueError(f'unknown stage {stage!r} (expected one of {", ".join(STAGES)})')
+    return {
+        'wall': time.perf_counter() - start,
+        'peak_rss_kb': _peak_rss_kb(),
+        'output_bytes': output,
+    }
+
+
+def _run_stage_isolated(stage, workdir):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--stage', stage, workdir],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'stage {stage} failed:\n{result.stderr.strip()}')
+    return json.loads(result.stdout)
+
+
+def bench(sizes=SIZES, steps=5):
+    """Yield one result per path size."""
+    for simulations in sizes:
+        workdir = tempfile.mkdtemp(prefix='bench-')
+        try:
+            path_file, _ = synthesize(workdir, simulations, steps)
+            run = {
+                'simulations': simulations,
+                'steps': simulations * steps,
+                'input_bytes': os.path.getsize(path_file),
+                'stages': {},
+            }
+            for stage in STAGES:
+                run['stages'][stage] = _run_stage_isolated(stage, workdir)
+            yield run
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _print_run(run):
+    print(f"  {run['simulations']} simulations / {run['steps']} steps ({run['input_bytes'] / 1e6:.1f}MB in)")
+    for stage, r in run['stages'].items():
+        per_step = r['wall'] / run['steps'] * 1e6
+        print(f"    {stage:<7} {r['wall'] * 1000:9.1f}ms  {per_step:7.1f}us/step  "
+              f"{r['peak_rss_kb'] / 1024:7.1f}MB peak  {r['output_bytes'] / 1e6:8.2f}MB out")
+
+
+def _print_comparison(old, new):
+    # Match runs on size; ratios > 1 are slower / bigger than the baseline
+    baseline = {run['simulations']: run for run in old['runs']}
+    print(f"Compared with {old.get('commit', '?')}:")
+    for run in new['runs']:
+        before = baseline.get(run['simulations'])
+        if before is None or before['steps'] != run['steps']:
+            continue
+        for stage, r in run['stages'].items():
+            if stage not in before['stages']:
+                continue
+            b = before['stages'][stage]
+            print(f"  {run['simulations']:>6} {stage:<7} time x{r['wall'] / b['wall']:.2f}  "
+                  f"rss x{r['peak_rss_kb'] / b['peak_rss_kb']:.2f}  "
+                  f"bytes x{r['output_bytes'] / max(1, b['output_bytes']):.2f}")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args[:1] == ['--stage']:
+        print(json.dumps(run_stage(args[1], args[2])))
+        sys.exit(0)
+
+    def option(name, default):
+        return args[args.index(name) + 1] if name in args else default
+
+    sizes = [int(n) for n in option('--sizes', ','.join(map(str, SIZES))).split(',')]
+    steps = int(option('--steps', '5'))
+    commit = _commit()
+    out = option('--out', os.path.join('bench', f'{commit}.json'))
+
+    results = {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'steps_per_simulation': steps,
+        'runs': [],
+    }
+    print(f'Benchmarking {TEMPLATE}-shaped paths, {steps} steps per simulation ({" -> ".join(STAGES)})')
+    for run in bench(sizes, steps):
+        results['runs'].append(run)
+        _print_run(run)
+
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'✅ Results saved to {out}')
+
+    if '--compare' in args:
+        with open(option('--compare', None), 'r') as f:
+            _print_comparison(json.load(f), results)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sys
+
+# On-disk build cache for compile_path.
+#
+# Every (simulation_id, step_id) is keyed on a hash of its source step, the
+# per-step inputs of each stage (e.g. its V4_CONTENT overlay) and the code of
+# the stages themselves. A step whose key is unchanged is spliced into the
+# output from its cached serialized text instead of being recomputed.
+#
+# Caches live in a `.build_cache/` directory next to the outputs, one file per
+# output. A cache whose source file no longer exists is evicted.
+
+CACHE_DIR = '.build_cache'
+CACHE_VERSION = 1
+
+
+def cache_path(dst):
+    return os.path.join(os.path.dirname(os.path.abspath(dst)), CACHE_DIR, os.path.basename(dst) + '.cache')
+
+
+def stages_fingerprint(stages):
+    # Changing the transform code must invalidate every cached step
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    for stage in stages:
+        # Stages are functions or callable objects (overlay_import.StreamingOverlay)
+        digest.update(getattr(stage, '__qualname__', type(stage).__qualname__).encode())
+        module = sys.modules.get(stage.__module__)
+        source = getattr(module, '__file__', None)
+        if source and os.path.exists(source):
+            with open(source, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def evict_stale(cache_dir):
+    """Remove caches whose source file has gone away. Returns the evicted paths."""
+    evicted = []
+    if not os.path.isdir(cache_dir):
+        return evicted
+    for name in sorted(os.listdir(cache_dir)):
+        if not name.endswith('.cache'):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            with open(path, 'r') as f:
+                source = json.load(f).get('source')
+        except (OSError, ValueError):
+            source = None
+        if not source or not os.path.exists(source):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            evicted.append(path)
+    return evicted
+
+
+class StepCache:
+    def __init__(self, src, dst, stages):
+        self.src = os.path.abspath(src)
+        self.path = cache_path(dst)
+        self.fingerprint = stages_fingerprint(stages)
+        self.hits = 0
+        self.misses = 0
+        self._old = {}
+        self._new = {}
+
+        evict_stale(os.path.dirname(self.path))
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == self.fingerprint and data.get('source') == self.src:
+                self._old = data.get('steps', {})
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def detached(cls, entries):
+        """An in-memory cache over a subset of entries, for use in a worker process."""
+        cache = cls.__new__(cls)
+        cache.hits = 0
+        cache.misses = 0
+        cache._old = entries
+        cache._new = {}
+        return cache
+
+    def subset(self, sim_id):
+        """The cached entries of one simulation, to ship to a worker."""
+        if not hasattr(self, '_by_sim'):
+            self._by_sim = {}
+            for entry, value in self._old.items():
+                self._by_sim.setdefault(entry.rsplit(':', 1)[0], {})[entry] = value
+        return self._by_sim.get(str(sim_id), {})
+
+    def merge(self, entries, hits, misses):
+        """Fold a worker's results back into this cache."""
+        self._new.update(entries)
+        self.hits += hits
+        self.misses += misses
+
+    @staticmethod
+    def _entry(sim_id, step, step_idx):
+        return f"{sim_id}:{step.get('step_id', step_idx)}"
+
+    def key(self, sim_id, step_idx, step, step_inputs):
+        material = json.dumps([sim_id, step_idx, step, step_inputs], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, sim_id, step, step_idx, hash_key):
+        cached = self._old.get(self._entry(sim_id, step, step_idx))
+        if cached and cached[0] == hash_key:
+            self.hits += 1
+            self._new[self._entry(sim_id, step, step_idx)] = cached
+            return cached[1]
+        self.misses += 1
+        return None
+
+    def put(self, sim_id, step, step_idx, hash_key, fragment):
+        self._new[self._entry(sim_id, step, step_idx)] = [hash_key, fragment]
+
+    def save(self):
+        # Only entries touched by this build are kept, so removed steps drop out
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'source': self.src, 'fingerprint': self.fingerprint, 'steps': self._new}, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+from bundle import DIST_DIR, update_manifest, write_hashed
+
+# Ahead-of-time build of the front end.
+#
+# hr-simulation.jsx and app.jsx are plain scripts that talk through window.*
+# globals, so each is wrapped in its own function scope (both declare
+# `const { useState, ... } = React`) and the result is transpiled and
+# minified with esbuild into dist/app.<hash>.js, registered as the "app"
+# engine in dist/sim-manifest.json. index.html loads it from there with the
+# production React builds; without it, it falls back to in-browser Babel.
+#
+# Needs esbuild on PATH, in node_modules (`npm install`), or reachable via npx.
+
+SOURCES = ['hr-simulation.jsx', 'app.jsx']
+NAME = 'app'
+
+
+def find_esbuild():
+    local = os.path.join('node_modules', '.bin', 'esbuild')
+    if os.path.exists(local):
+        return [local]
+    if shutil.which('esbuild'):
+        return ['esbuild']
+    return ['npx', '--yes', 'esbuild']
+
+
+def engine_source(sources=SOURCES):
+    parts = []
+    for name in sources:
+        with open(name, 'r') as f:
+            parts.append(f'// {name}\n(() => {{\n{f.read()}\n}})();\n')
+    return '\n'.join(parts)
+
+
+def build_engine(out_dir=DIST_DIR, sources=SOURCES, minify=True):
+    """Transpile the JSX sources into a single content-hashed production script. Returns its manifest entry."""
+    cmd = find_esbuild() + [
+        '--loader=jsx',
+        '--jsx-factory=React.createElement',
+        '--jsx-fragment=React.Fragment',
+        '--target=es2017',
+        '--sourcefile=app.jsx',
+    ]
+    if minify:
+        cmd.append('--minify')
+    payload = subprocess.run(cmd, input=engine_source(sources).encode(), capture_output=True, check=True).stdout
+
+    name, sizes = write_hashed(out_dir, NAME, payload, '.js')
+    entry = {'file': name, 'bytes': len(payload), 'sha256': hashlib.sha256(payload).hexdigest()}
+    entry.update(sizes)
+    update_manifest(out_dir, NAME, entry, key='engine')
+    return entry
+
+
+if __name__ == '__main__':
+    try:
+        entry = build_engine(minify='--no-minify' not in sys.argv)
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, 'stderr', None)
+        print(f'Error: esbuild failed ({e}). Install it with `npm install` or put it on PATH.')
+        if stderr:
+            print(stderr.decode(errors='replace'))
+        sys.exit(1)
+    print(f"✅ Built {DIST_DIR}/{entry['file']} from {' + '.join(SOURCES)} ({entry['bytes']} bytes, {entry['gzip_bytes']} gzipped)")
+
+    from build_sw import write_service_worker
+    try:
+        write_service_worker()
+    except FileNotFoundError:
+        pass  # No path built yet; generate_v4.py writes sw.js
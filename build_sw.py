@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import re
+import sys
+
+from bundle import DIST_DIR, MANIFEST
+
+# Build-time service worker for offline play and instant repeat loads.
+#
+# Generates sw.js (next to index.html, so its scope covers the app) from
+# dist/sim-manifest.json. On install it precaches the page shell, the compiled
+# engine, React (the crossorigin scripts in index.html) and the active path:
+# its chunk index plus every chunk while they fit in PRECACHE_LIMIT, otherwise
+# just the first one, and its candidate pools. At runtime:
+#
+#     dist/ (content-hashed) + React    cache-first, cached on first fetch
+#     sim-manifest.json, other GETs     network-first, cache when offline
+#     the page itself, analytics.js     stale-while-revalidate
+#
+# The cache name carries a hash of the precache list, so every rebuild that
+# changes an output installs a fresh cache and drops the old one. Re-run after
+# generate_v4.py / build_engine.py (both do it automatically).
+#
+# Usage: python build_sw.py [simId ...]   (default: v4)
+
+OUTPUT = 'sw.js'
+PAGE = 'index.html'
+SHELL = ['./', PAGE, 'analytics.js']
+ACTIVE_PATHS = ['v4']
+PRECACHE_LIMIT = 2 * 1024 * 1024
+CACHE_PREFIX = 'hr-sim-'
+
+TEMPLATE = """// Generated by build_sw.py from dist/sim-manifest.json - do not edit.
+const CACHE = %(cache)s;
+const PRECACHE = %(precache)s;
+const SHELL = %(shell)s;
+const IMMUTABLE_ORIGINS = %(origins)s;
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches.open(CACHE)
+      .then(cache => cache.addAll(PRECACHE))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys
+        .filter(key => key.startsWith(%(prefix)s) && key !== CACHE)
+        .map(key => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+function put(request, response) {
+  if (response && response.ok) {
+    const copy = response.clone();
+    caches.open(CACHE).then(cache => cache.put(request, copy));
+  }
+  return response;
+}
+
+function cacheFirst(request) {
+  return caches.match(request).then(hit => hit || fetch(request).then(response => put(request, response)));
+}
+
+function networkFirst(request) {
+  return fetch(request)
+    .then(response => put(request, response))
+    .catch(() => caches.match(request, { ignoreSearch: true }));
+}
+
+function staleWhileRevalidate(request, key) {
+  const network = fetch(request).then(response => put(key, response));
+  return caches.match(key, { ignoreSearch: true }).then(hit => {
+    if (hit) {
+      network.catch(() => {});
+      return hit;
+    }
+    return network;
+  });
+}
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+
+  if (url.origin !== location.origin) {
+    // React from the CDN; analytics and everything else go straight to the network
+    if (IMMUTABLE_ORIGINS.includes(url.origin)) event.respondWith(cacheFirst(request));
+    return;
+  }
+
+  const path = url.pathname.slice(new URL(self.registration.scope).pathname.length);
+  if (request.mode === 'navigate') {
+    event.respondWith(staleWhileRevalidate(request, %(page)s));
+  } else if (path.startsWith('dist/') && !path.endsWith(%(manifest)s)) {
+    event.respondWith(cacheFirst(request));
+  } else if (SHELL.includes(path)) {
+    event.respondWith(staleWhileRevalidate(request, request));
+  } else {
+    event.respondWith(networkFirst(request));
+  }
+});
+"""
+
+
+def cdn_scripts(page=PAGE):
+    """The crossorigin <script> URLs in index.html (React / ReactDOM)."""
+    with open(page, 'r') as f:
+        return re.findall(r'<script crossorigin src="([^"]+)"', f.read())
+
+
+def precache_list(manifest, active_paths=ACTIVE_PATHS, dist=DIST_DIR):
+    urls = list(SHELL) + [f'{dist}/{MANIFEST}']
+    for entry in manifest.get('engine', {}).values():
+        urls.append(f"{dist}/{entry['file']}")
+
+    for sim_id in active_paths:
+        chunked = manifest.get('chunked', {}).get(sim_id)
+        bundle = manifest.get('paths', {}).get(sim_id)
+        if chunked:
+            index_path = os.path.join(dist, chunked['index'])
+            urls.append(f"{dist}/{chunked['index']}")
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            base = chunked['index'].rsplit('/', 1)[0]
+            total = 0
+            for position, simulation in enumerate(index['simulations']):
+                total += simulation['bytes']
+                if position and total > PRECACHE_LIMIT:
+                    break
+                urls.append(f"{dist}/{base}/{simulation['chunk']}")
+        elif bundle:
+            urls.append(f"{dist}/{bundle['file']}")
+        for pool in manifest.get('pools', {}).get(sim_id, {}).values():
+            urls.append(f"{dist}/{pool['file']}")
+    return urls + cdn_scripts()
+
+
+def write_service_worker(active_paths=ACTIVE_PATHS, out=OUTPUT, dist=DIST_DIR):
+    """Generate sw.js from the current manifest. Returns the precached URLs."""
+    with open(os.path.join(dist, MANIFEST), 'r') as f:
+        manifest = json.load(f)
+    precache = precache_list(manifest, active_paths, dist)
+    version = hashlib.sha256(json.dumps(precache).encode()).hexdigest()[:10]
+    origins = sorted({re.match(r'https?://[^/]+', url).group(0) for url in precache if '://' in url})
+
+    source = TEMPLATE % {
+        'cache': json.dumps(CACHE_PREFIX + version),
+        'precache': json.dumps(precache, indent=2),
+        'shell': json.dumps(SHELL),
+        'origins': json.dumps(origins),
+        'prefix': json.dumps(CACHE_PREFIX),
+        'page': json.dumps(PAGE),
+        'manifest': json.dumps(MANIFEST),
+    }
+    tmp = out + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(source)
+    os.replace(tmp, out)
+    return precache
+
+
+if __name__ == '__main__':
+    paths = sys.argv[1:] or ACTIVE_PATHS
+    try:
+        precache = write_service_worker(paths)
+    except FileNotFoundError as e:
+        print(f'Error: {e.filename} not found - run generate_v4.py (and build_engine.py) first')
+        sys.exit(1)
+    print(f'✅ Wrote {OUTPUT}: {len(precache)} precached files for {", ".join(paths)}')
@@ -0,0 +1,241 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+from compile_path import iter_path, simulation_id, step_key
+
+try:
+    import brotli
+except ImportError:  # Optional: .br siblings are skipped without it
+    brotli = None
+
+# Compact delivery bundle for a compiled path.
+#
+# `dist/<simId>.<hash>.min.json` holds minified JSON in which every string
+# value that repeats (outcome texts, theory titles, key points...) is stored
+# once in a string table and referenced from the tree as "\u0001<index>":
+#
+#     {"v": 1, "s": ["Correct. ...", ...], "d": {...path with refs...}}
+#
+# Next to it go precompressed .gz / .br siblings (for hosts that serve
+# precompressed files). Every file name carries a hash of its content, so it
+# can be cached forever; `dist/sim-manifest.json` is the only file that has to
+# be revalidated and maps each simId (and the engine, see build_engine.py) to
+# its current file. The previous build of each file is kept (KEEP_BUILDS) so a
+# page that loaded the old manifest can still fetch what it points at; older
+# builds are pruned.
+#
+# `write_chunks` splits a path instead: `dist/<simId>/index.<hash>.json` holds
+# the path header and every simulation's `simulation_metadata` only, and each
+# simulation goes to its own `dist/<simId>/sim-NN.<hash>.json` in the bundle
+# format above, so the first screen only needs the index and one chunk.
+
+BUNDLE_VERSION = 1
+DIST_DIR = 'dist'
+REF_PREFIX = '\x01'
+MANIFEST = 'sim-manifest.json'
+HASH_LENGTH = 10
+KEEP_BUILDS = 2                  # the current build and the one before it
+
+
+def _walk_strings(node, counts):
+    if isinstance(node, str):
+        counts[node] += 1
+    elif isinstance(node, dict):
+        for value in node.values():
+            _walk_strings(value, counts)
+    elif isinstance(node, list):
+        for value in node:
+            _walk_strings(value, counts)
+
+
+def _replace_strings(node, refs):
+    if isinstance(node, str):
+        return refs.get(node, node)
+    if isinstance(node, dict):
+        return {key: _replace_strings(value, refs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_replace_strings(value, refs) for value in node]
+    return node
+
+
+def intern_strings(data, min_count=2):
+    """Return (table, tree) with repeated string values moved into `table`."""
+    counts = Counter()
+    _walk_strings(data, counts)
+    if any(s.startswith(REF_PREFIX) for s in counts):
+        raise ValueError('String values must not start with \\u0001')
+
+    table, refs = [], {}
+    for value, count in counts.most_common():
+        if count < min_count:
+            break
+        ref = f'{REF_PREFIX}{len(table)}'
+        # Only intern when the references plus one table entry are smaller
+        encoded, encoded_ref = len(json.dumps(value)), len(json.dumps(ref))
+        if count * (encoded - encoded_ref) <= encoded + 1:
+            continue
+        refs[value] = ref
+        table.append(value)
+    return table, _replace_strings(data, refs)
+
+
+def _minify(value):
+    return json.dumps(value, separators=(',', ':'))
+
+
+def update_manifest(out_dir, sim_id, entry, key='paths'):
+    path = os.path.join(out_dir, MANIFEST)
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault(key, {})[sim_id] = entry
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _write_compressed(path, payload):
+    # mtime=0 keeps the .gz byte-identical across rebuilds
+    sizes = {}
+    gz = gzip.compress(payload, compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gz)
+    sizes['gzip_bytes'] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(payload, quality=11)
+        with open(path + '.br', 'wb') as f:
+            f.write(br)
+        sizes['br_bytes'] = len(br)
+    return sizes
+
+
+def hashed_name(stem, payload, ext):
+    """`<stem>.<content hash><ext>`, e.g. v4.3f2a9c01be.min.json."""
+    return f'{stem}.{hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]}{ext}'
+
+
+def write_hashed(directory, stem, payload, ext, keep=KEEP_BUILDS):
+    """Write `payload` (+ .gz/.br) under its hashed name and prune older builds of the same file.
+
+    The `keep` most recent builds (this one included) survive, newest by mtime.
+    Returns (name, compressed sizes).
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = hashed_name(stem, payload, ext)
+    with open(os.path.join(directory, name), 'wb') as f:
+        f.write(payload)
+    sizes = _write_compressed(os.path.join(directory, name), payload)
+
+    build = re.compile(rf'({re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)})(\.gz|\.br)?')
+    builds = {}
+    for other in os.listdir(directory):
+        match = build.fullmatch(other)
+        if match and match.group(1) != name:
+            builds.setdefault(match.group(1), []).append(other)
+    age = {base: max(os.path.getmtime(os.path.join(directory, f)) for f in files) for base, files in builds.items()}
+    for base in sorted(builds, key=age.get, reverse=True)[max(keep - 1, 0):]:
+        for other in builds[base]:
+            os.remove(os.path.join(directory, other))
+    return name, sizes
+
+
+def write_bundle(src, out_dir=DIST_DIR):
+    """Write the minified bundle, its compressed siblings and manifest entry for `src`."""
+    sim_id = os.path.splitext(os.path.basename(src))[0]
+    with open(src, 'r') as f:
+        data = json.load(f)
+
+    table, tree = intern_strings(data)
+    payload = _minify({'v': BUNDLE_VERSION, 's': table, 'd': tree}).encode()
+
+    name, sizes = write_hashed(out_dir, sim_id, payload, '.min.json')
+    entry = {
+        'file': name,
+        'bytes': len(payload),
+        'source_bytes': os.path.getsize(src),
+        'sha256': hashlib.sha256(payload).hexdigest(),
+        'strings': len(table),
+    }
+    entry.update(sizes)
+    update_manifest(out_dir, sim_id, entry)
+    return entry
+
+
+def write_chunks(src, out_dir=DIST_DIR):
+    """Split `src` into an index plus one bundle per simulation, streaming one simulation at a time."""
+    sim_id = os.path.splitext(os.path.basename(src))[0]
+    chunk_dir = os.path.join(out_dir, sim_id)
+    os.makedirs(chunk_dir, exist_ok=True)
+    with open(src, 'r') as f:
+        text = f.read()
+
+    index = {'v': BUNDLE_VERSION, 'path': {}, 'simulations': []}
+    chunk_bytes = 0
+    written = set()
+    for key, value in iter_path(text):
+        if key != 'simulations':
+            index['path'][key] = value
+            continue
+        for position, simulation in enumerate(value):
+            table, tree = intern_strings(simulation)
+            payload = _minify({'v': BUNDLE_VERSION, 's': table, 'd': tree}).encode()
+            name, _ = write_hashed(chunk_dir, f'sim-{position + 1:02d}', payload, '.json')
+            written.add(name)
+            chunk_bytes += len(payload)
+
+            index['simulations'].append({
+                'simulation_id': simulation_id(simulation),
+                'simulation_metadata': simulation.get('simulation_metadata', {}),
+                'step_count': len(simulation.get(step_key(simulation), [])),
+                'chunk': name,
+                'bytes': len(payload),
+            })
+
+    payload = _minify(index).encode()
+    name, sizes = write_hashed(chunk_dir, 'index', payload, '.json')
+    written.add(name)
+
+    # Chunks are kept while an index that survived write_hashed's pruning still
+    # points at them; any other chunk is left over from an older build (e.g. a
+    # removed simulation). Candidate pools (candidate_pool.py) share the
+    # directory and are kept.
+    index_file = re.compile(rf'index\.[0-9a-f]{{{HASH_LENGTH}}}\.json')
+    referenced = set(written)
+    for other in os.listdir(chunk_dir):
+        if index_file.fullmatch(other):
+            referenced.add(other)
+            with open(os.path.join(chunk_dir, other), 'r') as f:
+                referenced.update(sim['chunk'] for sim in json.load(f).get('simulations', []))
+    chunk_file = re.compile(rf'(index|sim-\d+)\.[0-9a-f]{{{HASH_LENGTH}}}\.json(\.gz|\.br)?')
+    for other in os.listdir(chunk_dir):
+        if chunk_file.fullmatch(other) and re.sub(r'\.(gz|br)$', '', other) not in referenced:
+            os.remove(os.path.join(chunk_dir, other))
+
+    entry = {
+        'index': f'{sim_id}/{name}',
+        'index_bytes': len(payload),
+        'chunks': len(index['simulations']),
+        'chunk_bytes': chunk_bytes,
+    }
+    entry.update(sizes)
+    update_manifest(out_dir, sim_id, entry, key='chunked')
+    return entry
+
+
+if __name__ == '__main__':
+    # Usage: python bundle.py [path.json ...]
+    sources = sys.argv[1:] or ['v4.json']
+    for src in sources:
+        entry = write_bundle(src)
+        compressed = f", {entry['gzip_bytes']} gz" + (f", {entry['br_bytes']} br" if 'br_bytes' in entry else '')
+        print(f"✅ {src} -> {DIST_DIR}/{entry['file']}: {entry['source_bytes']} -> {entry['bytes']} bytes{compressed}")
+        chunks = write_chunks(src)
+        print(f"   {DIST_DIR}/{chunks['index']}: {chunks['index_bytes']} bytes index + {chunks['chunks']} simulation chunks")
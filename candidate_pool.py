@@ -0,0 +1,168 @@
+import os
+import random
+import sys
+
+from bundle import DIST_DIR, _minify, update_manifest, write_hashed
+from compile_path import discover_paths, iter_path
+
+# Synthetic candidate pools for screening artefacts.
+#
+# A path declares its pools at the top level and points selection steps at
+# them:
+#
+#     "candidate_pools": {
+#       "S1_screening": {"size": 600, "seed": 11, "role": "Senior Recruiter",
+#                        "must_have_skills": ["Full-cycle recruiting", "Tech hiring"]}
+#     },
+#     ... {"step_id": 1, "candidate_pool": "S1_screening", ...}
+#
+# Each pool is generated deterministically from its seed (same spec, same
+# candidates, same hashed file) and written as dist/<simId>/pool-<poolId>.<hash>.json
+# in a column layout, rows sorted by match score:
+#
+#     {"v": 1, "id": ..., "size": 600, "select": 5, "skills": [...],
+#      "columns": {"name": [...], "role": [...], "company": [...], "experience": [...],
+#                  "match": [...], "must_have": [...], "flags": [[...]], "skills": [[...]]},
+#      "index": {"flags": {"gaps": [rows]}, "skills": [[rows], ...]}}
+#
+# Index lists hold ascending row numbers, i.e. best match first, so the engine
+# filters by risk flag or skill with a lookup (and a merge for both) instead of
+# scanning the pool. Flag ids are those of window.RISK_FLAGS in index.html.
+#
+# Usage: python candidate_pool.py [path.json ...]   (default: every path config here)
+
+POOL_VERSION = 1
+DEFAULT_SIZE = 500
+DEFAULT_SELECT = 5
+
+FIRST_NAMES = ['Priya', 'Arjun', 'Kavitha', 'Rahul', 'Sneha', 'Vikram', 'Ananya', 'Deepak', 'Meera', 'Karan',
+               'Divya', 'Rohan', 'Lakshmi', 'Aditya', 'Pooja', 'Siddharth', 'Nisha', 'Manoj', 'Shreya', 'Varun',
+               'Farah', 'Imran', 'Gurpreet', 'Tenzin', 'Neha', 'Abhishek', 'Swati', 'Harish', 'Ishita', 'Naveen']
+LAST_NAMES = ['Sharma', 'Mehta', 'Rajan', 'Deshmukh', 'Kulkarni', 'Iyer', 'Nair', 'Verma', 'Reddy', 'Gupta',
+              'Menon', 'Bose', 'Chatterjee', 'Pillai', 'Singh', 'Khan', 'Joshi', 'Rao', 'Das', 'Banerjee']
+ROLES = ['Senior Recruiter', 'Talent Acquisition Lead', 'HR Business Partner', 'Recruiting Coordinator',
+         'Technical Recruiter', 'People Operations', 'Recruitment Manager', 'HR Generalist', 'Sourcing Specialist']
+COMPANIES = ['Razorpay', 'Flipkart', 'Freshworks', 'TCS', 'Microsoft', 'Zerodha', 'Infosys', 'Swiggy', 'Wipro',
+             'Zomato', 'Accenture', 'Early-stage startup', 'Series B SaaS', 'Regional staffing agency']
+SKILLS = ['Full-cycle recruiting', 'Tech hiring', 'ATS management', 'Stakeholder management', 'Comp & Ben',
+          'Volume hiring', 'Campus recruitment', 'Employer branding', 'Interview scheduling', 'Onboarding',
+          'Sourcing', 'Offer negotiation', 'Vendor management', 'SLA tracking', 'HRIS', 'Compliance',
+          'Diversity hiring', 'Workforce planning']
+# (flag id, base probability)
+FLAGS = [('gaps', 0.12), ('hopping', 0.15), ('overstate', 0.10), ('culture', 0.08)]
+
+
+def generate_pool(pool_id, spec):
+    """Generate the candidates of one pool spec as a list of dicts, best match first."""
+    rng = random.Random(f'{pool_id}:{spec.get("seed", 0)}')
+    must_have = [skill for skill in spec.get('must_have_skills', []) if skill]
+    skills = SKILLS + [skill for skill in must_have if skill not in SKILLS]
+    role = spec.get('role')
+
+    candidates = []
+    for _ in range(spec.get('size', DEFAULT_SIZE)):
+        years = rng.randint(1, 12)
+        # Must-have skills show up often enough for a realistic shortlist
+        picked = [skill for skill in must_have if rng.random() < 0.45]
+        others = [skill for skill in skills if skill not in picked]
+        picked += rng.sample(others, max(0, rng.randint(2, 4) - len(picked)))
+        flags = [flag for flag, p in FLAGS if rng.random() < p]
+        # Long skill lists on short careers read as overstatement
+        if len(picked) == 4 and years <= 2 and 'overstate' not in flags:
+            flags.append('overstate')
+
+        covered = sum(skill in picked for skill in must_have) / len(must_have) if must_have else rng.random()
+        candidate_role = role if role and rng.random() < 0.3 else rng.choice(ROLES)
+        match = 35 + 40 * covered + min(years, 8) * 2 + (5 if candidate_role == role else 0) - 6 * len(flags)
+        match += rng.uniform(-5, 5)
+        candidates.append({
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'role': candidate_role,
+            'company': rng.choice(COMPANIES),
+            'experience': f'{years} year' + ('s' if years > 1 else ''),
+            'match': max(20, min(99, round(match))),
+            'must_have': covered == 1 if must_have else False,
+            'flags': sorted(flags),
+            'skills': sorted(skills.index(skill) for skill in picked),
+        })
+
+    candidates.sort(key=lambda c: -c['match'])
+    return skills, candidates
+
+
+def pool_document(pool_id, spec):
+    skills, candidates = generate_pool(pool_id, spec)
+    columns = {key: [c[key] for c in candidates]
+               for key in ('name', 'role', 'company', 'experience', 'match', 'must_have', 'flags', 'skills')}
+
+    flag_index = {flag: [] for flag, _ in FLAGS}
+    skill_index = [[] for _ in skills]
+    for row, candidate in enumerate(candidates):
+        for flag in candidate['flags']:
+            flag_index[flag].append(row)
+        for skill in candidate['skills']:
+            skill_index[skill].append(row)
+
+    return {
+        'v': POOL_VERSION,
+        'id': pool_id,
+        'size': len(candidates),
+        'select': spec.get('select', DEFAULT_SELECT),
+        'skills': skills,
+        'columns': columns,
+        'index': {'flags': flag_index, 'skills': skill_index},
+    }
+
+
+def path_pools(src):
+    """The "candidate_pools" specs declared by a path file ({} when it has none)."""
+    with open(src, 'r') as f:
+        text = f.read()
+    for key, value in iter_path(text):
+        if key == 'candidate_pools':
+            return value
+        if key == 'simulations':
+            # Still has to be consumed before the next top-level key
+            for _ in value:
+                pass
+    return {}
+
+
+def write_pools(src, out_dir=DIST_DIR):
+    """Generate every pool of `src` into dist/ and record them in the manifest. Returns the entries."""
+    sim_id = os.path.splitext(os.path.basename(src))[0]
+    pools = path_pools(src)
+    if not pools:
+        return {}
+
+    entries = {}
+    for pool_id, spec in sorted(pools.items()):
+        payload = _minify(pool_document(pool_id, spec)).encode()
+        name, sizes = write_hashed(os.path.join(out_dir, sim_id), f'pool-{pool_id}', payload, '.json')
+        entries[pool_id] = {'file': f'{sim_id}/{name}', 'size': spec.get('size', DEFAULT_SIZE), 'bytes': len(payload)}
+        entries[pool_id].update(sizes)
+    update_manifest(out_dir, sim_id, entries, key='pools')
+    return entries
+
+
+def write_all_pools(src_dir='.', out_dir=DIST_DIR):
+    """write_pools for every path config in `src_dir`. Returns {path: entries} for paths with pools."""
+    built = {}
+    for src in discover_paths(src_dir):
+        entries = write_pools(src, out_dir)
+        if entries:
+            built[src] = entries
+    return built
+
+
+if __name__ == '__main__':
+    if sys.argv[1:]:
+        built = {src: write_pools(src) for src in sys.argv[1:]}
+    else:
+        built = write_all_pools()
+    if not any(built.values()):
+        print('No candidate_pools declared')
+    for src, entries in built.items():
+        for pool_id, entry in entries.items():
+            print(f"✅ {src} pool {pool_id}: {entry['size']} candidates -> {DIST_DIR}/{entry['file']} "
+                  f"({entry['bytes']} bytes, {entry['gzip_bytes']} gzipped)")
@@ -0,0 +1,463 @@
+import json
+import os
+import re
+import sys
+
+# Single-pass path compiler.
+#
+# A path file is streamed through once: simulations are read and decoded one
+# at a time from the source file, each simulation's steps flow through a chain
+# of stages, and the result is written straight to the output before the next
+# simulation is decoded. No intermediate files, no whole-document deep copy.
+#
+# A stage is a generator function `stage(simulation, steps)` that consumes an
+# iterator of (step_idx, step) pairs and yields (step_idx, step) pairs with the
+# step dict (possibly) modified. A stage whose output depends on data other
+# than the step itself exposes it as `stage.step_input(simulation, step)` so
+# the build cache can hash it.
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+READ_SIZE = 1 << 16
+
+
+class _Reader:
+    """Buffered JSON tokens over a path's text or an open file.
+
+    A file is read a block at a time and the buffer is trimmed to what has
+    not been decoded yet, so it holds about one simulation.
+    """
+
+    def __init__(self, source):
+        self._file = None if isinstance(source, str) else source
+        self.text = source if isinstance(source, str) else ''
+        self.pos = 0
+        self._consumed = 0      # characters dropped from the front of text
+
+    def _read(self, size=0):
+        chunk = self._file.read(max(size, READ_SIZE)) if self._file else ''
+        if not chunk:
+            self._file = None
+            return False
+        self._consumed += self.pos
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ('' at the end)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._read():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self._consumed + self.pos}")
+        self.pos += 1
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                # The value runs past the buffer: read as much again and retry
+                if self._read(len(self.text)):
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next block
+            if end < len(self.text) or not self._read():
+                self.pos = end
+                return value
+
+
+def iter_path(source):
+    """Yield the top-level (key, value) pairs of a path document.
+
+    `source` is the document's text or a file open on it; a file is read
+    only as far as the pair being decoded. The value for "simulations" is a
+    lazy iterator that decodes one simulation at a time; it must be fully
+    consumed before asking for the next pair.
+    """
+    reader = _Reader(source)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.decode()
+        reader.expect(':')
+
+        if key == 'simulations' and reader.peek() == '[':
+            reader.pos += 1
+
+            def simulations():
+                if reader.peek() == ']':
+                    reader.pos += 1
+                    return
+                while True:
+                    yield reader.decode()
+                    if reader.peek() == ']':
+                        reader.pos += 1
+                        return
+                    reader.expect(',')
+
+            yield key, simulations()
+        else:
+            yield key, reader.decode()
+
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
+
+
+def simulation_id(simulation):
+    meta = simulation.get('simulation_metadata', {})
+    return meta.get('simulation_id') or simulation.get('simulation_id')
+
+
+def path_simulation_ids(src):
+    """simulation_id of every simulation in `src`, in path order."""
+    ids = []
+    with open(src, 'r') as f:
+        for key, value in iter_path(f):
+            if key == 'simulations' and value:
+                ids = [simulation_id(simulation) for simulation in value]
+    return ids
+
+
+def discover_paths(directory):
+    """Return the sorted path configs in `directory` (non-recursive)."""
+    found = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not name.endswith('.json') or not os.path.isfile(path):
+            continue
+        try:
+            with open(path, 'r') as f:
+                # Only read as far as the "simulations" key
+                for key, value in iter_path(f):
+                    if key == 'simulations':
+                        if not isinstance(value, list):
+                            found.append(path)
+                        break
+        except ValueError:
+            # Not a JSON object (or empty, like path.json)
+            continue
+    return found
+
+
+def step_key(simulation):
+    # Older paths (learn-ai.json) keep steps under "steps"
+    return 'steps' if 'steps' in simulation and 'step_level_design' not in simulation else 'step_level_design'
+
+
+def _dumps(value, depth):
+    # Same layout as json.dump(..., indent=2) at the given nesting depth
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * depth)
+
+
+def run_stages(simulation, stages, steps=None):
+    """Run (step_idx, step) pairs through `stages`; defaults to every step of `simulation`."""
+    if steps is None:
+        steps = enumerate(simulation.get(step_key(simulation), []))
+    for stage in stages:
+        steps = stage(simulation, steps)
+    return steps
+
+
+_STEPS_PLACEHOLDER = '\x00step_level_design\x00'
+
+
+def compile_simulation(simulation, stages, cache=None):
+    """Transform and serialize one simulation. Returns (simulation_id, text, step_count)."""
+    # Without a cache the whole simulation is transformed and serialized.
+    # With one, only steps whose input hash changed are transformed and
+    # serialized; clean steps are spliced in from their cached text.
+    key = step_key(simulation)
+    steps = simulation.get(key, [])
+    sim_id = simulation_id(simulation)
+    if cache is None:
+        simulation[key] = [step for _, step in run_stages(simulation, stages)]
+        return sim_id, _dumps(simulation, 2), len(simulation[key])
+
+    fragments = [None] * len(steps)
+    dirty = []
+    for step_idx, step in enumerate(steps):
+        hash_key = cache.key(sim_id, step_idx, step, [
+            stage.step_input(simulation, step) for stage in stages if hasattr(stage, 'step_input')
+        ])
+        fragments[step_idx] = cache.get(sim_id, step, step_idx, hash_key)
+        if fragments[step_idx] is None:
+            dirty.append((step_idx, hash_key))
+
+    hash_keys = dict(dirty)
+    for step_idx, step in run_stages(simulation, stages, ((i, steps[i]) for i, _ in dirty)):
+        fragments[step_idx] = _dumps(step, 4)
+        cache.put(sim_id, step, step_idx, hash_keys[step_idx], fragments[step_idx])
+
+    simulation[key] = _STEPS_PLACEHOLDER
+    text = _dumps(simulation, 2)
+    steps_text = '[\n        ' + ',\n        '.join(fragments) + '\n      ]' if fragments else '[]'
+    return sim_id, text.replace(json.dumps(_STEPS_PLACEHOLDER), steps_text, 1), len(fragments)
+
+
+def compile_path(src, dst, stages, cache=None, map_simulations=None):
+    """Stream `src` through `stages` into `dst`.
+
+    `cache` is an optional build_cache.StepCache; when given, only steps
+    whose inputs changed since the last build are recomputed.
+
+    `map_simulations(simulations)` replaces the in-process loop when given
+    (build_all.py fans simulations out to a process pool); it must yield
+    compile_simulation() results in input order.
+
+    Returns a list of (simulation_id, step_count) for every simulation written.
+    """
+    if map_simulations is None:
+        def map_simulations(simulations):
+            for simulation in simulations:
+                yield compile_simulation(simulation, stages, cache)
+
+    # Written next to dst and moved into place, so a stage that raises
+    # half-way (e.g. validation) never leaves a truncated output behind
+    summary = []
+    tmp = dst + '.tmp'
+    with open(src, 'r') as f, open(tmp, 'w') as out:
+        out.write('{')
+        first_key = True
+        for key, value in iter_path(f):
+            out.write('\n  ' if first_key else ',\n  ')
+            first_key = False
+            out.write(json.dumps(key) + ': ')
+
+            if key != 'simulations' or isinstance(value, list):
+                out.write(_dumps(value, 1))
+                continue
+
+            first_sim = True
+            for sim_id, sim_text, count in map_simulations(value):
+                out.write('[\n    ' if first_sim else ',\n    ')
+                first_sim = False
+                out.write(sim_text)
+                summary.append((sim_id, count))
+            out.write('[]' if first_sim else '\n  ]')
+        out.write('}' if first_key else '\n}')
+    os.replace(tmp, dst)
+    return summary
+
+
+# --- Stages ---------------------------------------------------------------
+
+QUESTION_TYPES = ['find_error', 'fill_blank', 'violated_principles']
+
+
+def rotate_question_types(simulation, steps):
+    """V2 -> V3: rotate every MCQ step through the three question types."""
+    for step_idx, step in steps:
+        # Determine which question type to use (rotate)
+        question_type = QUESTION_TYPES[step_idx % 3]
+
+        # Store original MCQ data
+        original_options = step.get('options_inputs', [])
+        theory = step.get('theory_content', {})
+
+        # Update interaction type
+        step['interaction_type'] = question_type
+
+        if question_type == 'find_error':
+            # Use first (correct) option as base, mark parts as errors
+            base_prompt = original_options[0] if original_options else 'Sample prompt text here.'
+            words = base_prompt.split()
+
+            # Create segments - mark middle sections as potential errors
+            segments = []
+            for i, word in enumerate(words):
+                is_error = i in [len(words)//3, len(words)//2]  # Mark some as errors
+                segments.append({
+                    'id': i,
+                    'text': word + ' ',
+                    'is_error': is_error
+                })
+
+            step['segments'] = segments
+            step['error_explanation'] = step.get('explain_this_question', 'This violates best practices.')
+
+        elif question_type == 'fill_blank':
+            # Take the correct prompt and add a blank
+            base_prompt = original_options[0] if original_options else 'Write a job description with [____] requirements.'
+
+            # Find a good place to insert blank (look for keywords)
+            if 'inclusive' in base_prompt.lower():
+                prompt_template = base_prompt.replace('inclusive language', '[____]')
+                blank_options = ['inclusive language', 'buzzwords', 'jargon', 'vague terms']
+                correct_index = 0
+            elif 'specific' in base_prompt.lower():
+                prompt_template = base_prompt.replace('specific', '[____]')
+                blank_options = ['specific', 'vague', 'generic', 'random']
+                correct_index = 0
+            else:
+                # Default transformation
+                words = base_prompt.split()
+                if len(words) > 5:
+                    blank_pos = len(words) // 2
+                    prompt_template = ' '.join(words[:blank_pos]) + ' [____] ' + ' '.join(words[blank_pos+1:])
+                    blank_options = [words[blank_pos], 'alternative1', 'alternative2', 'alternative3']
+                    correct_index = 0
+                else:
+                    prompt_template = base_prompt + ' with [____]'
+                    blank_options = ['clear criteria', 'vague terms', 'buzzwords', 'jargon']
+                    correct_index = 0
+
+            step['prompt_template'] = prompt_template
+            step['blank_options'] = blank_options
+            step['correct_answer_index'] = correct_index
+
+        elif question_type == 'violated_principles':
+            # Use worst option as problematic prompt
+            problematic = original_options[-1] if len(original_options) > 1 else 'Write a job description.'
+
+            # Extract principles from theory key_points
+            principles = theory.get('key_points', [])
+            if not principles:
+                principles = [
+                    'Be specific and clear',
+                    'Use inclusive language',
+                    'Set clear constraints',
+                    'Avoid jargon and buzzwords'
+                ]
+
+            # Mark which are violated (for simple case, mark last 2)
+            violated = [len(principles) - 2, len(principles) - 1] if len(principles) >= 2 else [0]
+
+            step['problematic_prompt'] = problematic
+            step['available_principles'] = principles
+            step['violated_principle_indices'] = violated
+
+        yield step_idx, step
+
+
+def apply_overlay(step, new_content):
+    """Patch a single step in place with its V4 content overlay."""
+    # Update Theory (Mentor Notes)
+    step['theory_content'] = new_content['theory']
+
+    # Update Questions
+    step['interaction_type'] = new_content['interaction_type']
+    step['instruction_question'] = new_content['instruction_question']
+    step['outcomes'] = new_content['outcomes']
+    step['immediate_feedback'] = new_content['immediate_feedback']
+
+    # Handle Clickable Prompt
+    if new_content['interaction_type'] == 'clickable_prompt':
+        step['prompt_text'] = new_content['prompt_text']
+        step['clickable_options'] = new_content['clickable_options']
+        # Remove fill_blank fields if present
+        step.pop('prompt_template', None)
+        step.pop('blank_options', None)
+        step.pop('correct_answer_index', None)
+        # Add explanation usually found
+        step['explain_this_question'] = new_content['outcomes']['correct']  # Fallback
+
+    # Handle Fill Blank
+    elif new_content['interaction_type'] == 'fill_blank':
+        step['prompt_template'] = new_content['prompt_template']
+        step['blank_options'] = new_content['blank_options']
+        step['correct_answer_index'] = new_content['correct_answer_index']
+        # Remove clickable fields if present
+        step.pop('prompt_text', None)
+        step.pop('clickable_options', None)
+        step.pop('segments', None)
+        step['explain_this_question'] = new_content['outcomes']['correct']
+    return step
+
+
+def overlay_stage(content):
+    """V3 -> V4: build a stage that patches steps from a {sim_id: {step_id: overlay}} map.
+
+    See overlay_import.StreamingOverlay for the variant that reads the map
+    row by row from a sheet.
+    """
+    def stage(simulation, steps):
+        overlays = content.get(simulation_id(simulation), {})
+        for step_idx, step in steps:
+            new_content = overlays.get(step['step_id'])
+            if new_content:
+                apply_overlay(step, new_content)
+            yield step_idx, step
+
+    def step_input(simulation, step):
+        return content.get(simulation_id(simulation), {}).get(step.get('step_id'))
+
+    stage.step_input = step_input
+    return stage
+
+
+# {{n}}phrase{{/n}} marks clickable option n in a clickable_prompt's prompt_text
+PROMPT_MARKER = re.compile(r'\{\{(\d+)\}\}(.*?)\{\{/(\d+)\}\}', re.S)
+
+
+def parse_prompt_segments(prompt_text):
+    """Split marked-up prompt_text into [{"text"}, {"text", "option"}, ...] spans."""
+    segments = []
+    last = 0
+    for match in PROMPT_MARKER.finditer(prompt_text):
+        if match.group(1) != match.group(3):
+            continue
+        if match.start() > last:
+            segments.append({'text': prompt_text[last:match.start()]})
+        segments.append({'text': match.group(2), 'option': int(match.group(1))})
+        last = match.end()
+    if last < len(prompt_text):
+        segments.append({'text': prompt_text[last:]})
+    return segments
+
+
+def segment_prompts(simulation, steps):
+    """Parse clickable_prompt markup once at build time into `prompt_segments`."""
+    for step_idx, step in steps:
+        if step.get('interaction_type') == 'clickable_prompt' and isinstance(step.get('prompt_text'), str):
+            step['prompt_segments'] = parse_prompt_segments(step['prompt_text'])
+        else:
+            step.pop('prompt_segments', None)
+        yield step_idx, step
+
+
+def default_stages():
+    from generate_v4 import V4_OVERLAYS
+    from overlay_import import load_overlays
+    from step_analytics import calibration_stage, load_report
+    from step_timings import load_sketches, timings_stage
+    from validate_path import validate_stage
+    return {
+        'rotate': rotate_question_types,
+        'overlay': overlay_stage(load_overlays(V4_OVERLAYS)),
+        'segments': segment_prompts,
+        'validate': validate_stage,
+        'timings': timings_stage(load_sketches()),
+        'calibrate': calibration_stage(load_report()),
+    }
+
+
+if __name__ == '__main__':
+    from build_cache import StepCache
+
+    # Usage: python compile_path.py [src] [dst] [stage,stage,...]
+    src = sys.argv[1] if len(sys.argv) > 1 else 'simulation_v2_1-5.json'
+    dst = sys.argv[2] if len(sys.argv) > 2 else 'simulation_v4_1-5.json'
+    names = sys.argv[3].split(',') if len(sys.argv) > 3 else ['rotate', 'overlay', 'segments', 'validate', 'timings', 'calibrate']
+
+    available = default_stages()
+    stages = [available[name] for name in names]
+    cache = StepCache(src, dst, stages)
+    summary = compile_path(src, dst, stages, cache=cache)
+    cache.save()
+
+    print(f'✅ Compiled {src} -> {dst} ({" -> ".join(names)})')
+    print(f'{cache.misses} steps rebuilt, {cache.hits} reused from cache')
+    print(f'Total simulations: {len(summary)}')
+    for idx, (sim_id, count) in enumerate(summary):
+        print(f'  Simulation {idx+1} ({sim_id}): {count} steps')
@@ -0,0 +1,343 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from build_cache import CACHE_DIR
+from compile_path import discover_paths, iter_path, simulation_id, step_key
+
+# Authoring-time full-text search over simulation content.
+#
+# Every step of every indexed path becomes one document. Its text fields are
+# flattened to dotted names (instruction_question, theory_content.key_points,
+# outcomes.correct, blank_options, ...) and tokenised into a positional
+# inverted index kept in SQLite (.build_cache/content_index.sqlite):
+#
+#     postings(term, doc, field, positions)    one row per term per field
+#
+# so a query only reads the postings of its own terms. Results are ranked
+# with BM25 (FIELD_WEIGHTS boosts questions and titles). Each file is indexed
+# as a unit and re-indexed only when its contents change; every query first
+# refreshes files whose size or mtime moved, so results are never stale.
+#
+# Query syntax (all clauses must match):
+#
+#     disparate impact            words, anywhere in the step
+#     "explicitly avoid"          phrase
+#     outcomes:bias               word or phrase in a field or field group
+#                                 (outcomes matches outcomes.correct, ...;
+#                                 options matches every option list)
+#     type:fill_blank  sim:SIM_02  file:v4      step filters
+#
+# Usage: python content_index.py update [path.json ...]   (default: every path config here)
+#        python content_index.py query '<query>' [--limit N]
+
+INDEX_FILE = os.path.join(CACHE_DIR, 'content_index.sqlite')
+INDEX_VERSION = 1
+# Derived or non-text step data
+SKIP_FIELDS = {'prompt_segments', 'step_index', 'response_times', 'state_spec', 'step_id', 'scenario_id',
+               'interaction_type', 'candidate_pool'}
+FIELD_GROUPS = {
+    'options': ('options_inputs', 'blank_options', 'clickable_options', 'available_principles'),
+    'question': ('instruction_question',),
+    'theory': ('theory_content',),
+}
+FIELD_WEIGHTS = {'instruction_question': 2.0, 'theory_content.title': 1.5, 'theory_content.key_points': 1.2}
+FILTERS = ('type', 'sim', 'file')
+K1 = 1.2
+B = 0.75
+SNIPPET = 100
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_CLAUSE = re.compile(r'(?:(\w[\w.]*):)?(?:"([^"]*)"|(\S+))')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, sha TEXT);
+CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, path TEXT, sim_id TEXT, step_id TEXT,
+                                 interaction_type TEXT, length INTEGER);
+CREATE TABLE IF NOT EXISTS fields (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+CREATE TABLE IF NOT EXISTS texts (doc INTEGER, field INTEGER, text TEXT);
+CREATE TABLE IF NOT EXISTS postings (term TEXT, doc INTEGER, field INTEGER, positions TEXT);
+CREATE INDEX IF NOT EXISTS postings_term ON postings (term);
+CREATE INDEX IF NOT EXISTS docs_path ON docs (path);
+CREATE INDEX IF NOT EXISTS texts_doc ON texts (doc);
+"""
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def step_fields(node, prefix=''):
+    """Yield (dotted field name, text) for every string in a step, list items sharing their field."""
+    if isinstance(node, str):
+        if prefix:
+            yield prefix, node
+    elif isinstance(node, list):
+        for item in node:
+            yield from step_fields(item, prefix)
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            if not prefix and key in SKIP_FIELDS:
+                continue
+            yield from step_fields(value, f'{prefix}.{key}' if prefix else key)
+
+
+def iter_documents(src):
+    """Yield (simulation_id, step_id, interaction_type, step) for every step of a path config."""
+    with open(src, 'r') as f:
+        text = f.read()
+    for key, value in iter_path(text):
+        if key != 'simulations':
+            continue
+        for sim_position, simulation in enumerate(value):
+            sim_id = simulation_id(simulation) or f'#{sim_position + 1}'
+            for position, step in enumerate(simulation.get(step_key(simulation), [])):
+                yield sim_id, str(step.get('step_id', position + 1)), step.get('interaction_type'), step
+
+
+def parse_query(query):
+    """-> (clauses [(field or None, tokens, is_phrase)], filters {name: value})."""
+    clauses, filters = [], {}
+    for field, phrase, word in _CLAUSE.findall(query):
+        if field in FILTERS:
+            filters[field] = phrase or word
+            continue
+        tokens = tokenize(phrase or word)
+        if not tokens:
+            continue
+        if phrase and len(tokens) > 1:
+            clauses.append((field or None, tokens, True))
+        else:
+            clauses.extend((field or None, [token], False) for token in tokens)
+    return clauses, filters
+
+
+class ContentIndex:
+    """Positional inverted index over the steps of a set of path files."""
+
+    def __init__(self, path=INDEX_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        version = None
+        try:
+            version = self.db.execute("SELECT value FROM meta WHERE key = 'v'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        if version != (str(INDEX_VERSION),):
+            # New index, or one written by an older layout: start over
+            self.db.executescript(
+                'DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS docs; '
+                'DROP TABLE IF EXISTS fields; DROP TABLE IF EXISTS texts; DROP TABLE IF EXISTS postings;')
+            self.db.executescript(SCHEMA)
+            self.db.execute("INSERT INTO meta VALUES ('v', ?)", (str(INDEX_VERSION),))
+            self.db.commit()
+        self._fields = dict(self.db.execute('SELECT name, id FROM fields'))
+
+    def _field_id(self, name):
+        if name not in self._fields:
+            self._fields[name] = self.db.execute('INSERT INTO fields (name) VALUES (?)', (name,)).lastrowid
+        return self._fields[name]
+
+    def _remove(self, path):
+        docs = 'SELECT id FROM docs WHERE path = ?'
+        self.db.execute(f'DELETE FROM postings WHERE doc IN ({docs})', (path,))
+        self.db.execute(f'DELETE FROM texts WHERE doc IN ({docs})', (path,))
+        self.db.execute('DELETE FROM docs WHERE path = ?', (path,))
+        self.db.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def _index_file(self, path, stat, sha):
+        self._remove(path)
+        for sim_id, step_id, interaction_type, step in iter_documents(path):
+            doc = self.db.execute('INSERT INTO docs (path, sim_id, step_id, interaction_type, length) '
+                                  'VALUES (?, ?, ?, ?, 0)', (path, sim_id, step_id, interaction_type)).lastrowid
+            length = 0
+            texts, postings, offsets = {}, {}, {}
+            for field, text in step_fields(step):
+                field_id = self._field_id(field)
+                texts.setdefault(field_id, []).append(text)
+                # Positions run on across the items of a list field; a gap keeps
+                # phrases from matching across two items
+                offset = offsets.get(field_id, 0)
+                tokens = tokenize(text)
+                for position, token in enumerate(tokens, offset):
+                    postings.setdefault((token, field_id), []).append(position)
+                offsets[field_id] = offset + len(tokens) + 1
+                length += len(tokens)
+            self.db.executemany('INSERT INTO texts VALUES (?, ?, ?)',
+                                [(doc, field_id, '\n'.join(items)) for field_id, items in texts.items()])
+            self.db.executemany('INSERT INTO postings VALUES (?, ?, ?, ?)',
+                                [(term, doc, field_id, ','.join(map(str, positions)))
+                                 for (term, field_id), positions in postings.items()])
+            self.db.execute('UPDATE docs SET length = ? WHERE id = ?', (length, doc))
+        self.db.execute('INSERT INTO files VALUES (?, ?, ?, ?)', (path, stat.st_size, stat.st_mtime_ns, sha))
+
+    def update(self, paths=None):
+        """Re-index the files that changed (default: every file already indexed). Returns their paths."""
+        known = {row[0]: row[1:] for row in self.db.execute('SELECT path, size, mtime, sha FROM files')}
+        paths = [os.path.normpath(p) for p in paths] if paths is not None else list(known)
+        updated = []
+        for path in paths:
+            if not os.path.exists(path):
+                if path in known:
+                    self._remove(path)
+                    updated.append(path)
+                continue
+            stat = os.stat(path)
+            previous = known.get(path)
+            if previous and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+                continue
+            with open(path, 'rb') as f:
+                sha = hashlib.sha1(f.read()).hexdigest()
+            if previous and previous[2] == sha:
+                self.db.execute('UPDATE files SET size = ?, mtime = ? WHERE path = ?', (stat.st_size, stat.st_mtime_ns, path))
+                continue
+            self._index_file(path, stat, sha)
+            updated.append(path)
+        self.db.commit()
+        return updated
+
+    def _field_ids(self, field):
+        if field is None:
+            return None
+        prefixes = FIELD_GROUPS.get(field, (field,))
+        return {fid for name, fid in self._fields.items()
+                if any(name == p or name.startswith(p + '.') for p in prefixes)}
+
+    def _matches(self, field, tokens, is_phrase):
+        """{doc: {field_id: occurrences}} for one clause."""
+        allowed = self._field_ids(field)
+        per_token = []
+        for token in tokens:
+            rows = {}
+            for doc, field_id, positions in self.db.execute(
+                    'SELECT doc, field, positions FROM postings WHERE term = ?', (token,)):
+                if allowed is None or field_id in allowed:
+                    rows[(doc, field_id)] = positions
+            per_token.append(rows)
+
+        matches = {}
+        if not is_phrase:
+            for (doc, field_id), positions in per_token[0].items():
+                matches.setdefault(doc, {})[field_id] = positions.count(',') + 1
+            return matches
+
+        # Phrase: every token at consecutive positions in the same field
+        for key in set(per_token[0]).intersection(*per_token[1:]):
+            starts = {int(p) for p in per_token[0][key].split(',')}
+            for offset, rows in enumerate(per_token[1:], 1):
+                starts &= {int(p) - offset for p in rows[key].split(',')}
+            if starts:
+                matches.setdefault(key[0], {})[key[1]] = len(starts)
+        return matches
+
+    def search(self, query, limit=20):
+        """Ranked [(score, doc row, best field name, snippet)] for a query string."""
+        clauses, filters = parse_query(query)
+        if not clauses and not filters:
+            return []
+
+        docs = None
+        clause_matches = []
+        for field, tokens, is_phrase in clauses:
+            matches = self._matches(field, tokens, is_phrase)
+            clause_matches.append(matches)
+            docs = set(matches) if docs is None else docs & set(matches)
+            if not docs:
+                return []
+
+        where, params = [], []
+        if 'type' in filters:
+            where.append('interaction_type = ?')
+            params.append(filters['type'])
+        if 'sim' in filters:
+            where.append('sim_id = ?')
+            params.append(filters['sim'])
+        if 'file' in filters:
+            where.append('path LIKE ?')
+            params.append(f"%{filters['file']}%")
+        source = 'docs'
+        if docs is not None:
+            # Candidate ids go through a temp table: no SQLITE_MAX_VARIABLE_NUMBER limit
+            self.db.execute('CREATE TEMP TABLE IF NOT EXISTS candidates (id INTEGER PRIMARY KEY)')
+            self.db.execute('DELETE FROM temp.candidates')
+            self.db.executemany('INSERT INTO temp.candidates (id) VALUES (?)', ((doc,) for doc in docs))
+            source = 'docs JOIN temp.candidates USING (id)'
+        rows = {row[0]: row for row in self.db.execute(
+            f'SELECT id, path, sim_id, step_id, interaction_type, length FROM {source}'
+            + (' WHERE ' + ' AND '.join(where) if where else ''), params)}
+
+        total, avg_length = self.db.execute('SELECT COUNT(*), AVG(length) FROM docs').fetchone()
+        names = {fid: name for name, fid in self._fields.items()}
+        scored = []
+        for doc, row in rows.items():
+            score, contributions = 0.0, {}
+            for matches in clause_matches:
+                df = len(matches)
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                fields = matches[doc]
+                weighted = {fid: count * FIELD_WEIGHTS.get(names[fid], 1.0) for fid, count in fields.items()}
+                tf = sum(weighted.values())
+                clause_score = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * row[5] / (avg_length or 1)))
+                score += clause_score
+                # Each field gets its share of the clause's score
+                for fid, value in weighted.items():
+                    contributions[fid] = contributions.get(fid, 0.0) + clause_score * value / tf
+            best = max(contributions, key=lambda fid: (contributions[fid], -fid)) if contributions else None
+            scored.append((score, row, best))
+        scored.sort(key=lambda item: (-item[0], item[1][0]))
+
+        results = []
+        for score, row, field_id in scored[:limit]:
+            if field_id is None:
+                text = self.db.execute('SELECT field, text FROM texts WHERE doc = ? LIMIT 1', (row[0],)).fetchone()
+                field_id, text = text if text else (None, '')
+            else:
+                text = self.db.execute('SELECT text FROM texts WHERE doc = ? AND field = ?',
+                                       (row[0], field_id)).fetchone()[0]
+            results.append((score, row, names.get(field_id, ''), _snippet(text, clauses)))
+        return results
+
+
+def _snippet(text, clauses):
+    text = ' '.join(text.split())
+    lower = text.lower()
+    hits = [lower.find(' '.join(tokens)) for _, tokens, _ in clauses]
+    at = min([hit for hit in hits if hit >= 0], default=0)
+    start = max(0, at - SNIPPET // 3)
+    return ('…' if start else '') + text[start:start + SNIPPET] + ('…' if start + SNIPPET < len(text) else '')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    command = args.pop(0) if args else 'update'
+    index = ContentIndex()
+
+    if command == 'update':
+        start = time.perf_counter()
+        updated = index.update(args or discover_paths('.'))
+        docs = index.db.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+        print(f'✅ {docs} steps indexed in {INDEX_FILE}; re-indexed {len(updated)} changed file(s) '
+              f'in {(time.perf_counter() - start) * 1000:.0f}ms')
+        for path in updated:
+            print(f'  {path}')
+    elif command == 'query' and args:
+        limit = 20
+        if '--limit' in args:
+            limit = int(args[args.index('--limit') + 1])
+            del args[args.index('--limit'):args.index('--limit') + 2]
+        index.update()
+        start = time.perf_counter()
+        results = index.search(' '.join(args), limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for score, (_, path, sim_id, step_id, interaction_type, _), field, snippet in results:
+            print(f'{score:6.2f}  {path}::{sim_id}::{step_id}  [{interaction_type}]  {field}')
+            print(f'        {snippet}')
+        print(f'{len(results)} result(s) in {elapsed:.1f}ms')
+    else:
+        print("Usage: python content_index.py update [path.json ...] | query '<query>' [--limit N]")
+        sys.exit(1)
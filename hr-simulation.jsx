@@ -1,5 +1,20 @@
 // React and hooks are available globally via CDN in index.html
-const { useState, useEffect, useCallback } = React;
+const { useState, useEffect, useCallback, useRef, useMemo } = React;
+
+// A callback with a fixed identity that always runs the latest `fn`, so the
+// memoized step artefacts aren't re-rendered just because a handler was re-created
+function useStableCallback(fn) {
+  const ref = useRef(fn);
+  ref.current = fn;
+  return useCallback((...args) => ref.current(...args), []);
+}
+
+// Legacy slider artefact (Sim 1 V1)
+const TRADE_OFF_METERS = [
+  { label: 'Hiring Speed', initial: 70 },
+  { label: 'Quality Bar', initial: 80 },
+  { label: 'Internal Trust', initial: 60 }
+];
 
 // Helper components defined as window properties to ensure they are available to each other
 window.ProgressTimer = ({ duration, color, onComplete }) => {
@@ -21,7 +36,7 @@ window.ProgressTimer = ({ duration, color, onComplete }) => {
   );
 };
 
-window.CandidateCard = ({ candidate, selected, onSelect, showRisks, selectedRisks, onRiskToggle, compact }) => {
+window.CandidateCard = React.memo(({ candidate, selected, onSelect, showRisks, selectedRisks, onRiskToggle, compact }) => {
   const COLORS = window.COLORS;
   const RISK_FLAGS = window.RISK_FLAGS;
   const matchColor = candidate.match >= 80 ? COLORS.success : candidate.match >= 60 ? '#F59E0B' : COLORS.warning;
@@ -32,6 +47,7 @@ window.CandidateCard = ({ candidate, selected, onSelect, showRisks, selectedRisk
           <div style={{ display: 'flex', alignItems: 'center', gap: '10px', marginBottom: '4px' }}>
             <span style={{ fontWeight: 600, fontSize: '15px', color: COLORS.text }}>{candidate.name}</span>
             {selected && !showRisks && <span style={{ background: COLORS.highlight, color: COLORS.text, fontSize: '10px', fontWeight: 600, padding: '2px 8px', borderRadius: '4px' }}>SELECTED</span>}
+            {candidate.riskFlags && candidate.riskFlags.map(flag => <span key={flag.id} title={flag.label} style={{ fontSize: '12px', color: COLORS.warning }}>{flag.icon}</span>)}
           </div>
           <div style={{ fontSize: '13px', color: COLORS.textMuted, marginBottom: '6px' }}>{candidate.role} · {candidate.company}</div>
         </div>
@@ -40,8 +56,127 @@ window.CandidateCard = ({ candidate, selected, onSelect, showRisks, selectedRisk
       {showRisks && <div style={{ marginTop: '12px', display: 'flex', flexWrap: 'wrap', gap: '8px' }}>{RISK_FLAGS.map(flag => { const isSelected = selectedRisks[candidate.id]?.includes(flag.id); return <button key={flag.id} onClick={() => onRiskToggle(candidate.id, flag.id)} style={{ background: isSelected ? COLORS.warningBg : COLORS.bgLight, border: `1px solid ${isSelected ? COLORS.warning : 'transparent'}`, color: isSelected ? COLORS.warning : COLORS.textMuted, fontSize: '11px', padding: '6px 10px', borderRadius: '6px', cursor: 'pointer', display: 'flex', alignItems: 'center', gap: '4px', transition: 'all 0.15s ease' }}><span>{flag.icon}</span>{flag.label}</button>; })}</div>}
     </div>
   );
+});
+
+// --- Candidate Pools ---
+// Generated pools (candidate_pool.py) are fetched once per pool through the
+// manifest. Rows are sorted by match score and the prebuilt flag / skill
+// indexes hold ascending row numbers, so a filter is a lookup (or a merge of
+// two sorted lists) and yields rows already in display order.
+window.candidatePools = (() => {
+  const loaded = {};
+  const simId = () => new URLSearchParams(window.location.search).get('sim') || 'v4';
+
+  const load = (poolId) => {
+    if (!loaded[poolId]) {
+      loaded[poolId] = Promise.resolve(window.simManifest || {})
+        .then(manifest => {
+          const entry = manifest.pools && manifest.pools[simId()] && manifest.pools[simId()][poolId];
+          if (!entry) throw new Error(`Candidate pool ${poolId} is not built (run candidate_pool.py)`);
+          return fetch(`dist/${entry.file}`);
+        })
+        .then(r => {
+          if (!r.ok) throw new Error(`HTTP error! status: ${r.status}`);
+          return r.json();
+        })
+        .then(pool => ({ ...pool, rows: new Array(pool.size) }))
+        .catch(err => {
+          delete loaded[poolId];
+          throw err;
+        });
+    }
+    return loaded[poolId];
+  };
+
+  // Row -> candidate object for CandidateCard, built on first display and kept
+  // so memoized cards see the same object
+  const candidate = (pool, row) => {
+    if (!pool.rows[row]) {
+      const c = pool.columns;
+      const flagsById = Object.fromEntries(window.RISK_FLAGS.map(f => [f.id, f]));
+      pool.rows[row] = {
+        id: row,
+        name: c.name[row],
+        role: c.role[row],
+        company: `${c.company[row]} · ${c.experience[row]}`,
+        match: c.match[row],
+        mustHave: c.must_have[row],
+        riskFlags: c.flags[row].map(id => flagsById[id]).filter(Boolean),
+        skills: c.skills[row].map(idx => pool.skills[idx])
+      };
+    }
+    return pool.rows[row];
+  };
+
+  const intersect = (a, b) => {
+    const out = [];
+    for (let i = 0, j = 0; i < a.length && j < b.length;) {
+      if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+      else if (a[i] < b[j]) i++;
+      else j++;
+    }
+    return out;
+  };
+
+  // Rows matching a risk flag id and/or skill index (null = any), best match first
+  const filterRows = (pool, flag, skill) => {
+    const byFlag = flag ? pool.index.flags[flag] || [] : null;
+    const bySkill = skill !== null ? pool.index.skills[skill] || [] : null;
+    if (byFlag && bySkill) return intersect(byFlag, bySkill);
+    if (byFlag || bySkill) return byFlag || bySkill;
+    if (!pool.allRows) pool.allRows = Array.from({ length: pool.size }, (_, i) => i);
+    return pool.allRows;
+  };
+
+  return { load, candidate, filterRows };
+})();
+
+// Fixed-row-height windowed list: only the rows in view (plus `overscan` on
+// each side) are mounted, whatever `count` is
+window.VirtualList = ({ count, rowHeight, height, overscan = 4, renderRow }) => {
+  const [scrollTop, setScrollTop] = useState(0);
+  const viewport = Math.min(height, count * rowHeight);
+  const first = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan);
+  const last = Math.min(count, Math.ceil((scrollTop + viewport) / rowHeight) + overscan);
+  const rows = [];
+  for (let i = first; i < last; i++) {
+    rows.push(<div key={i} style={{ position: 'absolute', top: i * rowHeight, left: 0, right: 0, height: rowHeight }}>{renderRow(i)}</div>);
+  }
+  return (
+    <div onScroll={e => setScrollTop(e.currentTarget.scrollTop)} style={{ height: viewport, overflowY: 'auto', position: 'relative', paddingRight: '12px' }}>
+      <div style={{ height: count * rowHeight, position: 'relative' }}>{rows}</div>
+    </div>
+  );
 };
 
+window.CandidatePoolPicker = React.memo(({ pool, selected, onSelect }) => {
+  const COLORS = window.COLORS;
+  const CandidateCard = window.CandidateCard;
+  const [flag, setFlag] = useState(null);
+  const [skill, setSkill] = useState(null);
+  const rows = useMemo(() => window.candidatePools.filterRows(pool, flag, skill), [pool, flag, skill]);
+  const chip = (active) => ({ background: active ? COLORS.warningBg : COLORS.bgLight, border: `1px solid ${active ? COLORS.warning : 'transparent'}`, color: active ? COLORS.warning : COLORS.textMuted, fontSize: '11px', padding: '6px 10px', borderRadius: '6px', cursor: 'pointer', display: 'flex', alignItems: 'center', gap: '4px' });
+  return (
+    <div>
+      <div style={{ display: 'flex', flexWrap: 'wrap', gap: '8px', marginBottom: '10px' }}>
+        {window.RISK_FLAGS.map(f => (
+          <button key={f.id} onClick={() => setFlag(flag === f.id ? null : f.id)} style={chip(flag === f.id)}><span>{f.icon}</span>{f.label}</button>
+        ))}
+        <select value={skill === null ? '' : skill} onChange={e => setSkill(e.target.value === '' ? null : +e.target.value)} style={{ background: COLORS.bgLight, color: COLORS.textMuted, border: 'none', borderRadius: '6px', fontSize: '11px', padding: '6px 10px' }}>
+          <option value="">Any skill</option>
+          {pool.skills.map((name, idx) => <option key={name} value={idx}>{name}</option>)}
+        </select>
+      </div>
+      <div style={{ fontSize: '11px', color: COLORS.textDim, marginBottom: '8px' }}>{rows.length} of {pool.size} candidates</div>
+      {/* Keyed by filter so a new result set starts scrolled to the top */}
+      <window.VirtualList key={`${pool.id}:${flag}:${skill}`} count={rows.length} rowHeight={86} height={420} renderRow={i => {
+        const c = window.candidatePools.candidate(pool, rows[i]);
+        return <CandidateCard candidate={c} selected={selected.includes(c.id)} onSelect={onSelect} compact />;
+      }} />
+    </div>
+  );
+});
+
 window.EmailPreview = ({ from, subject, body, isReply, critical }) => {
   const COLORS = window.COLORS;
   return (
@@ -177,7 +312,7 @@ window.TheoryCard = ({ theoryContent }) => {
 };
 
 // V3 Question Type Components
-window.FindErrorQuestion = ({ segments, onAnswer, disabled }) => {
+window.FindErrorQuestion = React.memo(({ segments, onAnswer, disabled }) => {
   const COLORS = window.COLORS;
   const [selected, setSelected] = React.useState(null);
 
@@ -223,9 +358,9 @@ window.FindErrorQuestion = ({ segments, onAnswer, disabled }) => {
       </div>
     </div>
   );
-};
+});
 
-window.FillBlankQuestion = ({ promptTemplate, blankOptions, onAnswer, disabled }) => {
+window.FillBlankQuestion = React.memo(({ promptTemplate, blankOptions, onAnswer, disabled }) => {
   const COLORS = window.COLORS;
   const [selected, setSelected] = React.useState(null);
 
@@ -319,9 +454,9 @@ window.FillBlankQuestion = ({ promptTemplate, blankOptions, onAnswer, disabled }
       )}
     </div>
   );
-};
+});
 
-window.ViolatedPrinciplesQuestion = ({ problematicPrompt, availablePrinciples, onAnswer, disabled }) => {
+window.ViolatedPrinciplesQuestion = React.memo(({ problematicPrompt, availablePrinciples, onAnswer, disabled }) => {
   const COLORS = window.COLORS;
   const [selectedPrinciples, setSelectedPrinciples] = React.useState([]);
 
@@ -429,11 +564,11 @@ window.ViolatedPrinciplesQuestion = ({ problematicPrompt, availablePrinciples, o
       )}
     </div>
   );
-};
+});
 
 // New V3 Question Type: Clickable Prompt
 // Shows a prompt card with clickable underlined phrases - clicking one proceeds to next question
-window.ClickablePromptQuestion = ({ scenarioContext, promptText, clickableOptions, onAnswer, disabled }) => {
+window.ClickablePromptQuestion = React.memo(({ scenarioContext, promptText, promptSegments, clickableOptions, onAnswer, disabled }) => {
   const COLORS = window.COLORS;
   const [hoveredIndex, setHoveredIndex] = React.useState(null);
 
@@ -445,7 +580,8 @@ window.ClickablePromptQuestion = ({ scenarioContext, promptText, clickableOption
   // Parse the promptText to identify clickable segments
   // Format: Use {{option_index}} to mark clickable phrases
   // Example: "Please {{0}}review{{/0}} or {{1}}schedule{{/1}}"
-  const renderPrompt = () => {
+  // Only used when the step has no build-time prompt_segments
+  const parsePromptText = () => {
     // 1. Find all occurrences of all markers
     const segments = [];
     
@@ -504,6 +640,17 @@ window.ClickablePromptQuestion = ({ scenarioContext, promptText, clickableOption
       });
     }
     
+    return parts;
+  };
+
+  const renderPrompt = () => {
+    // prompt_segments are parsed once at build time (compile_path.segment_prompts)
+    const parts = promptSegments
+      ? promptSegments.map((seg, i) => seg.option === undefined
+        ? { type: 'text', content: seg.text, key: `text-${i}` }
+        : { type: 'clickable', content: seg.text, optionIndex: seg.option, key: `clickable-${seg.option}` })
+      : parsePromptText();
+
     return parts.map(part => {
       if (part.type === 'text') {
         return <span key={part.key}>{part.content}</span>;
@@ -591,7 +738,7 @@ window.ClickablePromptQuestion = ({ scenarioContext, promptText, clickableOption
       </div>
     </div>
   );
-};
+});
 
 
 // Tap Sequence Question Components
@@ -947,7 +1094,7 @@ window.FlagAndReplaceSequence = ({ promptText, options, requiredFlags, requiredR
   );
 };
 
-window.TapSequenceQuestion = ({ step, onComplete, disabled }) => {
+window.TapSequenceQuestion = React.memo(({ step, onComplete, disabled }) => {
   // Detect variant based on step data
   if (step.artefact_prompt_template && step.blank_order) {
     // Variant 1: Fill Blanks
@@ -976,7 +1123,7 @@ window.TapSequenceQuestion = ({ step, onComplete, disabled }) => {
   }
 
   return null;
-};
+});
 
 
 window.FeedbackPanel = ({ type, message, points, outcomeText, percentile, onComplete }) => {
@@ -1028,7 +1175,7 @@ window.FeedbackPanel = ({ type, message, points, outcomeText, percentile, onComp
   );
 };
 
-window.TradeOffMeters = function ({ meters, onComplete }) {
+window.TradeOffMeters = React.memo(function ({ meters, onComplete }) {
   const COLORS = window.COLORS;
   const { useState } = React;
   const [values, setValues] = useState(meters.map(m => m.initial || 50));
@@ -1053,9 +1200,9 @@ window.TradeOffMeters = function ({ meters, onComplete }) {
       </div>
     </div>
   );
-};
+});
 
-window.RationaleBuilder = function ({ pool, minSelection = 3, maxSelection = 5, onComplete }) {
+window.RationaleBuilder = React.memo(function ({ pool, minSelection = 3, maxSelection = 5, onComplete }) {
   const COLORS = window.COLORS;
   const { useState } = React;
   const [selected, setSelected] = useState([]);
@@ -1085,6 +1232,274 @@ window.RationaleBuilder = function ({ pool, minSelection = 3, maxSelection = 5,
       )}
     </div>
   );
+});
+
+// --- Response-time percentile ---
+// Share of learners (0-99) who answered slower than `seconds`, from the
+// step's precomputed `response_times` sketch (see step_timings.py): a binary
+// search over its log-scale buckets, interpolating inside the bucket.
+// Returns null when the step has no sketch yet.
+const RESPONSE_BUCKETS = 64; // step_timings.BUCKETS: slower answers share the last bucket
+
+window.responsePercentile = (sketch, seconds) => {
+  if (!sketch || !sketch.n) return null;
+  const { n, t0, g, b, c } = sketch;
+  const target = seconds <= t0 ? 0 : Math.min(RESPONSE_BUCKETS - 1, Math.ceil(Math.log(seconds / t0) / Math.log(g) - 1e-9));
+
+  let lo = 0, hi = b.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (b[mid] < target) lo = mid + 1; else hi = mid;
+  }
+  const below = lo > 0 ? c[lo - 1] : 0;
+  let faster = below;
+  if (lo < b.length && b[lo] === target) {
+    // Assume answers are spread evenly across the bucket
+    const lower = target === 0 ? 0 : t0 * Math.pow(g, target - 1);
+    const upper = t0 * Math.pow(g, target);
+    faster += (c[lo] - below) * Math.min(1, Math.max(0, (seconds - lower) / (upper - lower)));
+  }
+  return Math.max(0, Math.min(99, Math.floor(100 * (n - faster) / n)));
+};
+
+// --- Simulation Clock ---
+// The elapsed-time clock lives outside React state: its once-a-second tick
+// re-renders only <window.SimClock>, not HRSimulationApp and the current
+// step artefact. It pauses after 5 minutes without a click or tap.
+window.simClock = (() => {
+  const IDLE_LIMIT = 5 * 60 * 1000;
+  const listeners = new Set();
+  let elapsed = 0;
+  let lastActivity = Date.now();
+  let interval = null;
+
+  const emit = () => listeners.forEach(listener => listener(elapsed));
+  const pause = () => {
+    clearInterval(interval);
+    interval = null;
+  };
+
+  return {
+    getElapsed: () => elapsed,
+    subscribe: (listener) => {
+      listeners.add(listener);
+      return () => listeners.delete(listener);
+    },
+    start: () => {
+      lastActivity = Date.now();
+      if (interval) return;
+      interval = setInterval(() => {
+        if (Date.now() - lastActivity > IDLE_LIMIT) {
+          // Idle for 5 min — pause until the next activity
+          pause();
+          return;
+        }
+        elapsed += 1;
+        emit();
+      }, 1000);
+    },
+    reset: () => {
+      elapsed = 0;
+      emit();
+    },
+    // Record a click/tap; resume the clock if it is paused and `resume` is set
+    activity: (resume) => {
+      lastActivity = Date.now();
+      if (resume && !interval) window.simClock.start();
+    },
+  };
+})();
+
+window.SimClock = () => {
+  const COLORS = window.COLORS;
+  const [elapsed, setElapsed] = useState(window.simClock.getElapsed);
+  useEffect(() => window.simClock.subscribe(setElapsed), []);
+
+  const m = Math.floor(elapsed / 60).toString().padStart(2, '0');
+  const s = (elapsed % 60).toString().padStart(2, '0');
+  return (
+    <span style={{ color: COLORS.textDim, fontSize: '11px', fontFamily: 'monospace', background: 'rgba(56, 130, 202, 0.15)', padding: '3px 8px', borderRadius: '6px' }}>
+      ⏰ {m}<span style={{ opacity: elapsed % 2 === 0 ? 1 : 0 }}>:</span>{s}
+    </span>
+  );
+};
+
+// --- Render Timing ---
+// Artefact mounts are measured as 'sim:artefact-mount' (reported by
+// analytics.js): from the render that shows a new step's artefact to its
+// layout effects, i.e. render + commit of the whole artefact subtree.
+window.ArtefactTimer = ({ name, mountKey, children }) => {
+  const timing = useRef({ key: null, start: 0 });
+  if (timing.current.key !== mountKey) timing.current = { key: mountKey, start: performance.now() };
+  React.useLayoutEffect(() => {
+    window.measurePhase('artefact-mount', timing.current.start, performance.now(), { artefact: name });
+  }, [mountKey]);
+  return children;
+};
+
+// ?profile=1 (index.html loads the profiling ReactDOM): React.Profiler commit
+// durations per wrapped component, shown by <window.ProfilerOverlay>
+window.profileStats = (() => {
+  const stats = {};
+  const listeners = new Set();
+  let scheduled = false;
+
+  const emit = () => {
+    scheduled = false;
+    listeners.forEach(listener => listener({ ...stats }));
+  };
+
+  return {
+    record: (id, phase, actualDuration) => {
+      const s = stats[id] || (stats[id] = { commits: 0, mounts: 0, last: 0, max: 0, total: 0 });
+      s.commits += 1;
+      if (phase === 'mount') s.mounts += 1;
+      s.last = actualDuration;
+      s.max = Math.max(s.max, actualDuration);
+      s.total += actualDuration;
+      // The overlay re-renders at most twice a second, never inside a profiled commit
+      if (!scheduled) {
+        scheduled = true;
+        setTimeout(emit, 500);
+      }
+    },
+    subscribe: (listener) => {
+      listeners.add(listener);
+      return () => listeners.delete(listener);
+    },
+  };
+})();
+
+window.Profiled = ({ id, children }) => window.PROFILE
+  ? <React.Profiler id={id} onRender={window.profileStats.record}>{children}</React.Profiler>
+  : children;
+
+window.ProfilerOverlay = () => {
+  const [stats, setStats] = useState({});
+  useEffect(() => window.profileStats.subscribe(setStats), []);
+  const rows = Object.entries(stats).sort((a, b) => b[1].total - a[1].total);
+  const ms = (value) => value.toFixed(1);
+  return (
+    <div style={{ position: 'fixed', left: '8px', bottom: '8px', zIndex: 1000, background: 'rgba(0, 0, 0, 0.8)', color: '#FFFFFF', fontFamily: 'monospace', fontSize: '10px', padding: '8px', borderRadius: '6px', pointerEvents: 'none' }}>
+      <div style={{ fontWeight: 700, marginBottom: '4px' }}>React commits (ms): last / max / total · commits</div>
+      {rows.length === 0 && <div>No commits yet</div>}
+      {rows.map(([id, s]) => (
+        <div key={id}>{id}: {ms(s.last)} / {ms(s.max)} / {ms(s.total)} · {s.commits}</div>
+      ))}
+    </div>
+  );
+};
+
+// --- Progress Snapshots ---
+// Durable resume: a compact snapshot of the learner's progress through a path,
+// kept in IndexedDB under the path's simId and read once at startup (see
+// AppWrapper). Positions are stored as simulation_id / step_id rather than
+// indices, and review history without the step texts, so a snapshot still
+// applies after the path is regenerated; whatever no longer resolves is dropped.
+// `results` are the attempts on the current step (stepResults), same shape.
+//
+//     { v: 1, path, sim_id, sim_index, step_id, screen, score, streak,
+//       history: [{ stepId, scenarioId, type, points, percentile, userAnswer, correctAnswer }],
+//       results: [...] }
+//
+// IndexedDB is async, so a localStorage flag (HOOK_FLAG + path) also records
+// whether the learner is past the start screen of simulation 1: index.html
+// reads it synchronously to skip the prerendered Start Hook Card.
+window.progressStore = (() => {
+  const VERSION = 1;
+  const DB_NAME = 'progress';
+  const STORE = 'snapshots';
+  const SAVE_DELAY = 800;  // ms; answers in quick succession are written once
+  const HOOK_FLAG = 'progress-resumed:';
+  let dbPromise = null;
+  let pending = null;
+  let timer = null;
+
+  const openDb = () => {
+    if (!window.indexedDB) return Promise.resolve(null);
+    if (!dbPromise) {
+      dbPromise = new Promise(resolve => {
+        const request = indexedDB.open(DB_NAME, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(STORE);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(null);
+      });
+    }
+    return dbPromise;
+  };
+
+  const flush = () => {
+    clearTimeout(timer);
+    timer = null;
+    if (!pending) return;
+    const snapshot = pending;
+    pending = null;
+    openDb().then(db => db && db.transaction(STORE, 'readwrite').objectStore(STORE).put(snapshot, snapshot.path));
+  };
+
+  // A tab killed in the background never gets to run the timer
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flush();
+  });
+  window.addEventListener('pagehide', flush);
+
+  const atStart = (snapshot) => !snapshot || (snapshot.sim_index === 0 && snapshot.screen === 'start');
+
+  return {
+    atStart,
+    read: (path) => openDb().then(db => db && new Promise(resolve => {
+      const request = db.transaction(STORE).objectStore(STORE).get(path);
+      request.onsuccess = () => resolve(request.result && request.result.v === VERSION ? request.result : null);
+      request.onerror = () => resolve(null);
+    })),
+    save: (snapshot) => {
+      pending = { ...snapshot, v: VERSION, saved_at: Date.now() };
+      try {
+        if (atStart(snapshot)) localStorage.removeItem(HOOK_FLAG + snapshot.path);
+        else localStorage.setItem(HOOK_FLAG + snapshot.path, '1');
+      } catch (e) { /* Storage disabled: the hook is dropped by AppWrapper instead */ }
+      clearTimeout(timer);
+      timer = setTimeout(flush, SAVE_DELAY);
+    },
+  };
+})();
+
+const RESUMABLE_SCREENS = ['start', 'step', 'sim_result', 'results'];
+
+const compactHistoryItem = (item) => ({
+  stepId: item.stepId, scenarioId: item.scenarioId, type: item.type, points: item.points,
+  percentile: item.percentile, userAnswer: item.userAnswer, correctAnswer: item.correctAnswer
+});
+
+// Rebuild review history from a snapshot against the current steps
+const hydrateHistory = (items, steps) => (items || []).flatMap(item => {
+  const step = steps.find(s => s.step_id === item.stepId);
+  if (!step) return [];
+  const outcomes = step.outcomes || {};
+  return [{
+    ...item,
+    message: step.immediate_feedback || "Your decision has been recorded.",
+    outcomeText: (item.type === 'correct' ? outcomes.correct : item.type === 'partial' ? outcomes.partially_correct : outcomes.incorrect) || "",
+    question: step.instruction_question,
+    explanation: step.explain_this_question
+  }];
+});
+
+// Snapshot -> { simIndex, stepId, screen, score, streak, history, results }, or
+// null if its simulation is no longer in the path
+const resolveProgress = (snapshot, simulations) => {
+  if (!snapshot) return null;
+  const simIndex = simulations.findIndex(s => s.simulation_metadata.simulation_id === snapshot.sim_id);
+  if (simIndex === -1) return null;
+  return {
+    simIndex,
+    stepId: snapshot.step_id,
+    screen: RESUMABLE_SCREENS.includes(snapshot.screen) ? snapshot.screen : 'start',
+    score: snapshot.score || 0,
+    streak: snapshot.streak || 0,
+    history: snapshot.history || [],
+    results: snapshot.results || []
+  };
 };
 
 // --- Bonus Timer Component ---
@@ -1238,7 +1653,7 @@ window.CandidateComparisonTable = ({ options, onSelect }) => {
   );
 };
 
-window.ChatResponseSelector = ({ incomingMessage, options, onSelect }) => {
+window.ChatResponseSelector = React.memo(({ incomingMessage, options, onSelect }) => {
   const COLORS = window.COLORS;
   return (
     <div style={{ background: COLORS.bgCard, borderRadius: '16px', padding: '16px', display: 'flex', flexDirection: 'column', gap: '12px' }}>
@@ -1254,9 +1669,9 @@ window.ChatResponseSelector = ({ incomingMessage, options, onSelect }) => {
       ))}
     </div>
   );
-};
+});
 
-window.TimelineVisualizer = ({ options, onSelect }) => {
+window.TimelineVisualizer = React.memo(({ options, onSelect }) => {
   const COLORS = window.COLORS;
   return (
     <div style={{ background: COLORS.bgCard, borderRadius: '16px', padding: '20px' }}>
@@ -1280,9 +1695,9 @@ window.TimelineVisualizer = ({ options, onSelect }) => {
       </div>
     </div>
   );
-};
+});
 
-window.VideoCallProfile = ({ options, onSelect }) => {
+window.VideoCallProfile = React.memo(({ options, onSelect }) => {
   const COLORS = window.COLORS;
   return (
     <div style={{ background: COLORS.bgCard, borderRadius: '16px', overflow: 'hidden' }}>
@@ -1300,9 +1715,9 @@ window.VideoCallProfile = ({ options, onSelect }) => {
       </div>
     </div>
   );
-};
+});
 
-window.CandidateComparisonTable = ({ options, onSelect }) => {
+window.CandidateComparisonTable = React.memo(({ options, onSelect }) => {
   const COLORS = window.COLORS;
   return (
     <div style={{ display: 'flex', flexDirection: 'column', gap: '16px' }}>
@@ -1328,9 +1743,9 @@ window.CandidateComparisonTable = ({ options, onSelect }) => {
       </div>
     </div>
   );
-};
+});
 
-window.ApprovalNoteBuilder = ({ options, onSelect }) => {
+window.ApprovalNoteBuilder = React.memo(({ options, onSelect }) => {
   const COLORS = window.COLORS;
   const { useState } = React;
   const [selected, setSelected] = useState(null);
@@ -1361,9 +1776,9 @@ window.ApprovalNoteBuilder = ({ options, onSelect }) => {
       </div>
     </div>
   );
-};
+});
 
-window.MemoStructureBuilder = ({ options, onSelect }) => {
+window.MemoStructureBuilder = React.memo(({ options, onSelect }) => {
   const COLORS = window.COLORS;
   return (
     <div style={{ display: 'grid', gridTemplateColumns: '1.2fr 0.8fr', gap: '20px' }}>
@@ -1390,9 +1805,9 @@ window.MemoStructureBuilder = ({ options, onSelect }) => {
       </div>
     </div>
   );
-};
+});
 
-window.ClosureProofPacket = ({ options, onSelect }) => {
+window.ClosureProofPacket = React.memo(({ options, onSelect }) => {
   const COLORS = window.COLORS;
   return (
     <div style={{ background: COLORS.bgCard, borderRadius: '16px', padding: '24px', textAlign: 'center' }}>
@@ -1410,7 +1825,7 @@ window.ClosureProofPacket = ({ options, onSelect }) => {
       </div>
     </div>
   );
-};
+});
 
 window.downloadBadge = (badgeTitle) => {
   const canvas = document.createElement('canvas');
@@ -1829,7 +2244,7 @@ window.SimulationResult = ({ simulation, score, onContinue, nextSimTitle, histor
 // ReviewPage Removed
 
 
-window.HRSimulationApp = function ({ simulationData, uiVersion }) {
+window.HRSimulationApp = function ({ simulationData, uiVersion, loadSimulation, initialProgress, progressKey }) {
   const COLORS = window.COLORS;
   const OptionButton = window.OptionButton;
   const CandidateCard = window.CandidateCard;
@@ -1849,16 +2264,38 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
     initialScreen = 'start';
   }
 
-  const [currentSimulationIndex, setCurrentSimulationIndex] = useState(initialSimIndex);
-  const [screen, setScreen] = useState(initialScreen);
+  // Resume the saved snapshot unless the URL deep-links somewhere. The step
+  // (and review history) are resolved once the simulation's steps are loaded.
+  const [resume] = useState(() => (urlParams.has('sim_index') || urlParams.has('step_index'))
+    ? null
+    : resolveProgress(initialProgress, simulationData?.simulations || []));
+  const pendingResume = useRef(resume);
+
+  const [currentSimulationIndex, setCurrentSimulationIndex] = useState(resume ? resume.simIndex : initialSimIndex);
+  const [screen, setScreen] = useState(resume ? resume.screen : initialScreen);
   const [currentStep, setCurrentStep] = useState(initialStepIndex);
   const [isExplainExpanded, setIsExplainExpanded] = useState(false);
   const [isFeedbackVisible, setIsFeedbackVisible] = useState(false);
-  const [score, setScore] = useState(0);
-  const [streak, setStreak] = useState(0);
+  const [score, setScore] = useState(resume ? resume.score : 0);
+  const [streak, setStreak] = useState(resume ? resume.streak : 0);
   const [shuffledOptions, setShuffledOptions] = useState([]);
   const [bonusDuration, setBonusDuration] = useState(30);
 
+  // 'sim:first-render' / 'sim:step-transition': from the render that shows a
+  // new screen or step until its effects run (after paint)
+  const viewKey = `${currentSimulationIndex}:${screen}:${currentStep}`;
+  const viewTiming = useRef({ key: null, start: 0, first: true });
+  if (viewTiming.current.key !== viewKey) {
+    viewTiming.current = { key: viewKey, start: performance.now(), first: viewTiming.current.key === null };
+  }
+  useEffect(() => {
+    const { start, first } = viewTiming.current;
+    const now = performance.now();
+    const detail = { screen, simulation: currentSimulationIndex + 1, step: currentStep + 1 };
+    window.measurePhase(first ? 'first-render' : 'step-transition', start, now, detail);
+    if (first) window.measurePhase('app-ready', 0, now);
+  }, [viewKey]);
+
   // Helper to calculate question complexity/duration
   const calculateBonusDuration = (stepObj, optionsArr) => {
     if (!stepObj) return 30;
@@ -1874,40 +2311,16 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
 
   // New State for Review & Timing
   const [userHistory, setUserHistory] = useState([]);
+  const [stepResults, setStepResults] = useState([]);
   const [startTime, setStartTime] = useState(null);
 
-  // Simulation Timer
-  const [simElapsed, setSimElapsed] = useState(0);
-  const [simTimerPaused, setSimTimerPaused] = useState(true);
-  const [lastActivity, setLastActivity] = useState(Date.now());
-  const [colonVisible, setColonVisible] = useState(true);
-
   const [previousOutcome, setPreviousOutcome] = useState(null);
   const [learningMode, setLearningMode] = useState('guided'); // 'guided' or 'assessment'
 
-  // Timer interval: ticks every second, pauses after 5min idle
-  useEffect(() => {
-    if (simTimerPaused) return;
-    const interval = setInterval(() => {
-      const now = Date.now();
-      if (now - lastActivity > 5 * 60 * 1000) {
-        // Idle for 5 min — pause
-        setSimTimerPaused(true);
-        return;
-      }
-      setSimElapsed(prev => prev + 1);
-      setColonVisible(prev => !prev);
-    }, 1000);
-    return () => clearInterval(interval);
-  }, [simTimerPaused, lastActivity]);
-
-  // Track user activity to resume timer
+  // Track user activity to resume the simulation clock (see window.simClock)
   useEffect(() => {
     const handleActivity = () => {
-      setLastActivity(Date.now());
-      if (simTimerPaused && (screen === 'step' || screen === 'scenario')) {
-        setSimTimerPaused(false);
-      }
+      window.simClock.activity(screen === 'step' || screen === 'scenario');
     };
     window.addEventListener('click', handleActivity);
     window.addEventListener('touchstart', handleActivity);
@@ -1915,13 +2328,7 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
       window.removeEventListener('click', handleActivity);
       window.removeEventListener('touchstart', handleActivity);
     };
-  }, [simTimerPaused, screen]);
-
-  const formatTimer = (totalSeconds) => {
-    const m = Math.floor(totalSeconds / 60).toString().padStart(2, '0');
-    const s = (totalSeconds % 60).toString().padStart(2, '0');
-    return { m, s };
-  };
+  }, [screen]);
 
   useEffect(() => {
     window.scrollTo(0, 0);
@@ -1957,6 +2364,19 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
     }
   }, [screen, currentSimulationIndex, score, simulationData]);
 
+  // Chunked paths: make sure the current simulation is loaded, and fetch the
+  // next one in the background while the learner works through this one or
+  // reads its result (the service worker keeps it for offline play)
+  const warmNext = screen === 'step' || screen === 'sim_result';
+  useEffect(() => {
+    if (!loadSimulation) return;
+    loadSimulation(currentSimulationIndex);
+    if (warmNext) {
+      const whenIdle = window.requestIdleCallback || ((cb) => setTimeout(cb, 200));
+      whenIdle(() => loadSimulation(currentSimulationIndex + 1));
+    }
+  }, [currentSimulationIndex, warmNext, loadSimulation]);
+
   const simulations = simulationData?.simulations || [];
   const currentSim = simulations[currentSimulationIndex];
   if (!currentSim) return <div style={{ color: COLORS.text, padding: '40px' }}>Simulation not found.</div>;
@@ -1967,6 +2387,37 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
   const steps = currentSim.step_level_design || [];
   const step = steps[currentStep];
 
+  // Apply the resumed step and history before the first paint of the loaded simulation
+  React.useLayoutEffect(() => {
+    const pending = pendingResume.current;
+    if (!pending || currentSim._chunk) return;
+    pendingResume.current = null;
+    const stepIndex = steps.findIndex(s => s.step_id === pending.stepId);
+    if (stepIndex === -1 && pending.screen === 'step') {
+      setScreen('start'); // The step is gone from this path version: restart the simulation
+    } else if (stepIndex > 0) {
+      setCurrentStep(stepIndex);
+    }
+    setUserHistory(hydrateHistory(pending.history, steps));
+    setStepResults(hydrateHistory(pending.results, steps));
+  }, [currentSim]);
+
+  // Snapshot progress on every answer and move (debounced, see window.progressStore)
+  useEffect(() => {
+    if (!progressKey || currentSim._chunk || pendingResume.current) return;
+    window.progressStore.save({
+      path: progressKey,
+      sim_id: currentSim.simulation_metadata.simulation_id,
+      sim_index: currentSimulationIndex,
+      step_id: step ? step.step_id : null,
+      screen,
+      score,
+      streak,
+      history: userHistory.map(compactHistoryItem),
+      results: stepResults.map(compactHistoryItem)
+    });
+  }, [currentSim, currentSimulationIndex, step, screen, score, streak, userHistory, stepResults, progressKey]);
+
   useEffect(() => {
     if (step && step.options_inputs && Array.isArray(step.options_inputs) && step.options_inputs.length > 0) {
       // Create indices array [0, 1, 2, ...]
@@ -1979,15 +2430,15 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
       setOptionIndices(indices);
       setShuffledOptions(indices.map(i => step.options_inputs[i]));
 
-      // Calculate Bonus Duration
-      const duration = calculateBonusDuration(step, step.options_inputs);
+      // Calculate Bonus Duration (calibrated from real answer times when available, see step_analytics.py)
+      const duration = step.bonus_duration || calculateBonusDuration(step, step.options_inputs);
       setBonusDuration(duration);
     } else {
       setShuffledOptions([]);
       setOptionIndices([]);
       // Default duration if no options
       if (step) {
-        setBonusDuration(calculateBonusDuration(step, []));
+        setBonusDuration(step.bonus_duration || calculateBonusDuration(step, []));
       }
     }
     setHasAttemptedCurrentStep(false);
@@ -1995,9 +2446,27 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
   }, [step]);
 
   const [selectedCandidates, setSelectedCandidates] = useState([]);
+  const [candidatePool, setCandidatePool] = useState(null);
+  const [failedPool, setFailedPool] = useState(null);
+
+  // Generated candidate pool of a screening step (candidate_pool.py), if it
+  // names one; a pool that can't be loaded falls back to MOCK_CANDIDATES
+  useEffect(() => {
+    if (!step || !step.candidate_pool) return;
+    let current = true;
+    window.candidatePools.load(step.candidate_pool)
+      .then(pool => current && setCandidatePool(pool))
+      .catch(err => {
+        console.error('Failed to load candidate pool:', err);
+        if (current) setFailedPool(step.candidate_pool);
+      });
+    return () => { current = false; };
+  }, [step]);
+  const activePool = candidatePool && step && candidatePool.id === step.candidate_pool ? candidatePool : null;
+  const usePool = !!(step && step.candidate_pool) && failedPool !== step.candidate_pool;
+  const shortlistSize = activePool ? activePool.select : 5;
   const [selectedRisks, setSelectedRisks] = useState({});
   const [selectedOption, setSelectedOption] = useState(null);
-  const [stepResults, setStepResults] = useState([]);
 
   const handleCandidateSelect = (id) => {
     if (isFeedbackVisible) return;
@@ -2007,7 +2476,7 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
     setSelectedCandidates(updated);
 
     // Auto-evaluate if selection is complete (e.g. 5 candidates for Sim 1 Step 1)
-    if (currentSimulationIndex === 0 && currentStep === 0 && updated.length === 5) {
+    if ((step.candidate_pool || (currentSimulationIndex === 0 && currentStep === 0)) && updated.length === shortlistSize) {
       evaluateStep(null, updated);
     }
   };
@@ -2050,15 +2519,10 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
     // Streak Bonus Rule: Correct/Partial answer within dynamic bonus duration
     const isTimedBonus = (type === 'correct' || type === 'partial') && timeTaken <= bonusDuration;
 
-    // Calculate Percentile
-    // Base: 60%. Max: 98%.
-    // Formula: (bonusDuration - timeTaken) / bonusDuration * 38 + 60
-    let percentile = 0;
-    if (timeTaken < bonusDuration) {
-      percentile = Math.min(98, Math.max(60, Math.floor(60 + ((bonusDuration - timeTaken) / bonusDuration) * 38)));
-    } else {
-      percentile = Math.floor(Math.random() * (60 - 40) + 40); // 40-60% for slow answers
-    }
+    // Calculate Percentile: from recorded answer times (response_times, built
+    // by step_timings.py). Null when the step has no sketch yet, which hides
+    // the speed line in FeedbackPanel rather than showing a made-up figure
+    const percentile = window.responsePercentile(step.response_times, timeTaken);
 
     // Points & Streak Logic
     let points = 0;
@@ -2124,8 +2588,14 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
     }
 
     // Construct Correct Answer Text based on Step Type
+    // (steps validated at build time carry a step_index with the correct answer)
     let correctAnswerText = null;
-    if (step.interaction_type === 'violated_principles' && step.violated_principle_indices) {
+    const stepIndex = step.step_index;
+    if (stepIndex && stepIndex.type === 'violated_principles') {
+      correctAnswerText = stepIndex.correct_index.map(idx => step.available_principles[idx]).join(", ");
+    } else if (stepIndex && stepIndex.type === 'fill_blank') {
+      correctAnswerText = step.blank_options[stepIndex.correct_index];
+    } else if (step.interaction_type === 'violated_principles' && step.violated_principle_indices) {
       correctAnswerText = step.violated_principle_indices
         .map(idx => step.available_principles && step.available_principles[idx])
         .filter(Boolean)
@@ -2153,6 +2623,17 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
       explanation: step.explain_this_question // Capture explanation for review
     };
 
+    // Raw step-level data for our own event log (see ingest_events.py); GA only gets the aggregates
+    window.trackEvent('step_answer', {
+      simulation_id: currentSim.simulation_metadata.simulation_id,
+      step_id: step.step_id,
+      interaction_type: step.interaction_type || null,
+      result: type,
+      attempt: attemptCount + 1,
+      time_taken: startTime ? timeTaken : null,
+      points: points
+    });
+
     // Record to history if first attempt
     console.log("Evaluating step:", step.step_id, "Scenario:", step.scenario_id, "Attempted:", hasAttemptedCurrentStep);
     if (!hasAttemptedCurrentStep) {
@@ -2234,11 +2715,115 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
     }
   };
 
+  // Step artefacts are React.memo'd: give them stable handlers and derived
+  // props so score/streak/feedback updates don't re-render the artefact
+  const onOptionSelect = useStableCallback(handleOptionSelect);
+  const onCandidateSelect = useStableCallback(handleCandidateSelect);
+  const onRationaleComplete = useStableCallback((selected) => evaluateStep(selected[0]));
+  const onTradeOffComplete = useStableCallback(() => evaluateStep(0));
+  const onClickableAnswer = useStableCallback((selectedIndex) => {
+    // Direct evaluation - no shuffling for this type
+    evaluateStep(selectedIndex);
+  });
+
+  const onFindErrorAnswer = useStableCallback((segmentId) => {
+    // Find if the selected segment is an error
+    const selectedSegment = step.segments.find(s => s.id === segmentId);
+    const isCorrect = selectedSegment && selectedSegment.is_error;
+    const correctSegment = step.segments.find(s => s.is_error);
+    const correctIndex = correctSegment ? correctSegment.id : 0;
+    evaluateStep(isCorrect ? 0 : 1, correctIndex);
+  });
+
+  const onFillBlankAnswer = useStableCallback((selectedIndex) => {
+    // selectedIndex is the VISUAL index (shuffled)
+    // evaluateStep handles mapping visual -> original via optionIndices
+    const validated = !!(step && step.step_index);
+    evaluateStep(selectedIndex, validated ? step.step_index.correct_index : (step.correct_answer_index || 0));
+  });
+
+  const onTapSequenceComplete = useStableCallback((result) => {
+    // Auto-proceed on completion
+    console.log('Tap sequence completed:', result);
+    evaluateStep(0); // Success for learning flow
+  });
+
+  const onViolatedPrinciplesAnswer = useStableCallback((selectedIndices) => {
+    // selectedIndices are VISUAL (shuffled) indices.
+    // Map them back to ORIGINAL indices to check against violated_principle_indices
+    const userOriginalIndices = selectedIndices.map(idx => (optionIndices[idx] !== undefined ? optionIndices[idx] : idx));
+
+    const violated = step.violated_principle_indices || [];
+
+    // Sort for comparison
+    const userSorted = [...userOriginalIndices].sort((a, b) => a - b);
+    const violatedSorted = [...violated].sort((a, b) => a - b);
+
+    const isCorrect =
+      userSorted.length === violatedSorted.length &&
+      userSorted.every((val, index) => val === violatedSorted[index]);
+
+    // evaluateStep expects a visual index. It effectively does: original = optionIndices[visual].
+    // We need to pass a VISUAL index that maps to 0 (Correct) or 2 (Incorrect).
+    const visualCorrect = optionIndices.indexOf(0);
+    const visualIncorrect = optionIndices.indexOf(2);
+
+    // Fallback if shuffle is not active or weird
+    const finalIndex = isCorrect
+      ? (visualCorrect !== -1 ? visualCorrect : 0)
+      : (visualIncorrect !== -1 ? visualIncorrect : 2);
+
+    evaluateStep(finalIndex, userSorted);
+  });
+
+  // Synchronize shuffling: map blank_options / available_principles to match
+  // the shuffled options_inputs
+  const currentBlankOptions = useMemo(() => (
+    step && step.blank_options
+      ? (optionIndices.length === step.blank_options.length
+        ? optionIndices.map(i => step.blank_options[i])
+        : step.blank_options)
+      : []
+  ), [step, optionIndices]);
+
+  const currentPrinciples = useMemo(() => (
+    step && step.available_principles
+      ? (optionIndices.length === step.available_principles.length
+        ? optionIndices.map(i => step.available_principles[i])
+        : step.available_principles)
+      : []
+  ), [step, optionIndices]);
+
+  const startSimulation = () => {
+    window.trackEvent('simulation_start', { title: currentSim.simulation_metadata.simulation_title });
+    setUserHistory([]);
+    setStepResults([]);
+    setCurrentStep(0);
+    setSelectedOption(null);
+    setSelectedCandidates([]);
+    setIsFeedbackVisible(false);
+    window.simClock.reset();
+    window.simClock.start();
+    setScreen('step');
+  };
+
+  // Replay a click on the prerendered Start Hook Card (index.html) made before
+  // the engine was ready; the card only stands for the start of simulation 1
+  useEffect(() => {
+    if (window.startHookClicked && screen === 'start' && currentSimulationIndex === 0 && !currentSim._chunk) {
+      window.startHookClicked = false;
+      startSimulation();
+    }
+  }, [currentSim]);
+
   if (screen === 'start') {
     return (
       <div style={{ minHeight: '100vh', background: `linear-gradient(180deg, ${COLORS.bg} 0%, #091620 100%)`, display: 'flex', flexDirection: 'column', padding: '24px 20px', fontFamily: 'system-ui, -apple-system, sans-serif' }}>
         <div style={{ flex: 1, display: 'flex', flexDirection: 'column', justifyContent: 'center' }}>
           <div style={{ background: COLORS.highlightSoft, color: COLORS.highlight, fontSize: '11px', fontWeight: 600, letterSpacing: '0.5px', padding: '6px 12px', borderRadius: '20px', alignSelf: 'flex-start', marginBottom: '20px' }}>SIMULATION {currentSimulationIndex + 1} OF {simulations.length}</div>
+          {simulationData.path_title && (
+            <div style={{ fontSize: '13px', color: COLORS.textMuted, fontWeight: 500 }}>{simulationData.path_title}</div>
+          )}
           <h1 style={{ fontSize: '32px', fontWeight: 300, color: COLORS.text, lineHeight: 1.2, marginBottom: '16px' }}>{currentSim.simulation_metadata.simulation_title}</h1>
           {/* <p style={{ fontSize: '15px', color: COLORS.textMuted, lineHeight: 1.6, marginBottom: '32px' }}>{currentSim.simulation_metadata.why_this_matters_for_getting_hired}.<br /><br /><strong>Your Actions Will Solve Key Job Requirements:</strong></p> */}
           {/* Why This Matters Card */}
@@ -2269,26 +2854,14 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
             </span>
           </div>
           <div style={{ display: 'flex', alignItems: 'center', gap: '8px', color: COLORS.textDim, fontSize: '13px', marginBottom: '8px' }}>
-            <span style={{ fontSize: '16px' }}>⏱</span>{currentSim.simulation_metadata.estimated_time || '15 minutes'} · {steps.length} critical decisions
+            <span style={{ fontSize: '16px' }}>⏱</span>{currentSim.simulation_metadata.estimated_time || '15 minutes'} · {steps.length || currentSim.step_count} critical decisions
           </div>
           <div style={{ position: 'absolute', top: '24px', right: '20px', background: COLORS.highlightSoft, color: COLORS.highlight, fontSize: '13px', fontWeight: 700, padding: '8px 12px', borderRadius: '12px' }}>
             ⚡️ {score.toLocaleString()}
           </div>
         </div>
         <div style={{ position: 'sticky', bottom: 0, padding: '20px 0', background: 'linear-gradient(180deg, rgba(9, 22, 32, 0) 0%, #091620 20%)', zIndex: 10, marginTop: 'auto' }}>
-          <button id="start-simulation" onClick={() => {
-            window.trackEvent('simulation_start', { title: currentSim.simulation_metadata.simulation_title });
-            setUserHistory([]);
-            setStepResults([]);
-            setCurrentStep(0);
-            setSelectedOption(null);
-            setSelectedCandidates([]);
-            setIsFeedbackVisible(false);
-            setSimElapsed(0);
-            setSimTimerPaused(false);
-            setLastActivity(Date.now());
-            setScreen('step');
-          }} style={{ width: '100%', padding: '18px', background: COLORS.cta, border: 'none', borderRadius: '14px', cursor: 'pointer', fontSize: '16px', fontWeight: 600, color: '#0D2436', boxShadow: '0 4px 24px rgba(127, 194, 65, 0.3)' }}>Start Simulation</button>
+          <button id="start-simulation" disabled={!!currentSim._chunk} onClick={startSimulation} style={{ width: '100%', padding: '18px', background: COLORS.cta, border: 'none', borderRadius: '14px', cursor: currentSim._chunk ? 'wait' : 'pointer', opacity: currentSim._chunk ? 0.6 : 1, fontSize: '16px', fontWeight: 600, color: '#0D2436', boxShadow: '0 4px 24px rgba(127, 194, 65, 0.3)' }}>{currentSim._chunk ? 'Loading…' : 'Start Simulation'}</button>
         </div>
       </div >
     );
@@ -2297,7 +2870,11 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
 
 
   if (screen === 'step') {
+    if (currentSim._chunk) return <div style={{ color: COLORS.textMuted, padding: '40px', textAlign: 'center' }}>Loading simulation...</div>;
     let artefact = null;
+    // Steps validated at build time (validate_path.py) carry a step_index and
+    // are guaranteed to have every field their interaction type needs
+    const validated = !!(step && step.step_index);
     // COMMENTED OUT: Feedback panel between questions
     // if (isFeedbackVisible) {
     //   const result = stepResults[stepResults.length - 1];
@@ -2325,12 +2902,18 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
       if (isCandidateSelection) {
         artefact = (
           <div style={{ marginBottom: '20px' }}>
-            <div style={{ fontSize: '12px', color: COLORS.textDim, marginBottom: '10px' }}>SELECTED: {selectedCandidates.length}/5</div>
-            <div style={{ maxHeight: '420px', overflowY: 'auto', paddingRight: '12px' }}>
-              {window.MOCK_CANDIDATES.map(c => (
-                <CandidateCard key={c.id} candidate={c} selected={selectedCandidates.includes(c.id)} onSelect={handleCandidateSelect} compact />
-              ))}
-            </div>
+            <div style={{ fontSize: '12px', color: COLORS.textDim, marginBottom: '10px' }}>SELECTED: {selectedCandidates.length}/{shortlistSize}</div>
+            {usePool ? (
+              activePool
+                ? <window.CandidatePoolPicker pool={activePool} selected={selectedCandidates} onSelect={onCandidateSelect} />
+                : <div style={{ color: COLORS.textMuted, fontSize: '13px', padding: '20px 0' }}>Loading candidates…</div>
+            ) : (
+              <div style={{ maxHeight: '420px', overflowY: 'auto', paddingRight: '12px' }}>
+                {window.MOCK_CANDIDATES.map(c => (
+                  <CandidateCard key={c.id} candidate={c} selected={selectedCandidates.includes(c.id)} onSelect={onCandidateSelect} compact />
+                ))}
+              </div>
+            )}
           </div>
         );
       } else if (description.includes('chat thread')) {
@@ -2338,89 +2921,64 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
         // We try to find the scenario context to get the incoming message
         const scenario = currentSim.scenario_breakdown.find(s => s.scenario_id === step.scenario_id);
         const message = scenario ? scenario.crisis_or_decision_trigger : "How do you respond?";
-        artefact = <window.ChatResponseSelector incomingMessage={message} options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.ChatResponseSelector incomingMessage={message} options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if (description.includes('timeline')) {
         // V2 S1 Step 2: Timeline
-        artefact = <window.TimelineVisualizer options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.TimelineVisualizer options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if (description.includes('huddle')) {
         // V2 S1 Step 3: Video Call
-        artefact = <window.VideoCallProfile options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.VideoCallProfile options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if (description.includes('comparison')) {
         // V2 S1 Step 4: Comparison
-        artefact = <window.CandidateComparisonTable options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.CandidateComparisonTable options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if (description.includes('approval note')) {
         // V2 S2 Step 6: Approval Note
-        artefact = <window.ApprovalNoteBuilder options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.ApprovalNoteBuilder options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if (description.includes('one-page memo')) {
         // V2 S3 Step 9: Memo Structure
-        artefact = <window.MemoStructureBuilder options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.MemoStructureBuilder options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if (description.includes('closure proof')) {
         // V2 S3 Step 15: Closure Proof
-        artefact = <window.ClosureProofPacket options={shuffledOptions} onSelect={(idx) => { handleOptionSelect(idx); }} />;
+        artefact = <window.ClosureProofPacket options={shuffledOptions} onSelect={onOptionSelect} />;
       } else if ((step.interaction_type === 'ordering' || step.interaction_type === 'selection') && step.options_inputs) {
         // Generic multi-select / ordering builder
         artefact = (
           <window.RationaleBuilder
             pool={shuffledOptions}
             maxSelection={step.max_selection || 3}
-            onComplete={(selected) => evaluateStep(selected[0])}
+            onComplete={onRationaleComplete}
           />
         );
       } else if (step.interaction_type === 'trade-off meters' && !step.options_inputs) {
         // Legacy Slider Custom Component (Sim 1 V1)
-        const meters = [
-          { label: 'Hiring Speed', initial: 70 },
-          { label: 'Quality Bar', initial: 80 },
-          { label: 'Internal Trust', initial: 60 }
-        ];
-        artefact = <window.TradeOffMeters meters={meters} onComplete={(values) => evaluateStep(0)} />;
-      } else if (step.interaction_type === 'find_error' && step.segments) {
+        artefact = <window.TradeOffMeters meters={TRADE_OFF_METERS} onComplete={onTradeOffComplete} />;
+      } else if (step.interaction_type === 'find_error' && (validated || step.segments)) {
         // V3 Question Type: Find the Error
         artefact = (
           <window.FindErrorQuestion
             segments={step.segments}
-            onAnswer={(segmentId) => {
-              // Find if the selected segment is an error
-              const selectedSegment = step.segments.find(s => s.id === segmentId);
-              const isCorrect = selectedSegment && selectedSegment.is_error;
-              const correctSegment = step.segments.find(s => s.is_error);
-              const correctIndex = correctSegment ? correctSegment.id : 0;
-              evaluateStep(isCorrect ? 0 : 1, correctIndex);
-            }}
+            onAnswer={onFindErrorAnswer}
             disabled={isFeedbackVisible}
           />
         );
-      } else if (step.interaction_type === 'fill_blank' && step.prompt_template) {
+      } else if (step.interaction_type === 'fill_blank' && (validated || step.prompt_template)) {
         // V3 Question Type: Fill in the Blank
-        // Synchronize shuffling: Map blank_options to match the shuffled options_inputs
-        const currentBlankOptions = step.blank_options
-          ? (optionIndices.length === step.blank_options.length
-            ? optionIndices.map(i => step.blank_options[i])
-            : step.blank_options)
-          : [];
-
         artefact = (
           <window.FillBlankQuestion
             promptTemplate={step.prompt_template}
             blankOptions={currentBlankOptions}
-            onAnswer={(selectedIndex) => {
-              // selectedIndex is the VISUAL index (shuffled)
-              // evaluateStep handles mapping visual -> original via optionIndices
-              evaluateStep(selectedIndex, step.correct_answer_index || 0);
-            }}
+            onAnswer={onFillBlankAnswer}
             disabled={isFeedbackVisible}
           />
         );
-      } else if (step.interaction_type === 'clickable_prompt' && step.prompt_text) {
+      } else if (step.interaction_type === 'clickable_prompt' && (validated || step.prompt_text)) {
         // V3 Question Type: Clickable Prompt
         artefact = (
           <window.ClickablePromptQuestion
             promptText={step.prompt_text}
+            promptSegments={step.prompt_segments}
             clickableOptions={step.clickable_options || []}
-            onAnswer={(selectedIndex) => {
-              // Direct evaluation - no shuffling for this type
-              evaluateStep(selectedIndex);
-            }}
+            onAnswer={onClickableAnswer}
             disabled={isFeedbackVisible}
           />
         );
@@ -2429,54 +2987,17 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
         artefact = (
           <window.TapSequenceQuestion
             step={step}
-            onComplete={(result) => {
-              // Auto-proceed on completion
-              console.log('Tap sequence completed:', result);
-              evaluateStep(0); // Success for learning flow
-            }}
+            onComplete={onTapSequenceComplete}
             disabled={isFeedbackVisible}
           />
         );
-      } else if (step.interaction_type === 'violated_principles' && step.available_principles) {
+      } else if (step.interaction_type === 'violated_principles' && (validated || step.available_principles)) {
         // V3 Question Type: Violated Principles
-        // Synchronize shuffling for principles
-        const currentPrinciples = step.available_principles
-          ? (optionIndices.length === step.available_principles.length
-            ? optionIndices.map(i => step.available_principles[i])
-            : step.available_principles)
-          : [];
-
         artefact = (
           <window.ViolatedPrinciplesQuestion
             problematicPrompt={step.problematic_prompt}
             availablePrinciples={currentPrinciples}
-            onAnswer={(selectedIndices) => {
-              // selectedIndices are VISUAL (shuffled) indices.
-              // Map them back to ORIGINAL indices to check against violated_principle_indices
-              const userOriginalIndices = selectedIndices.map(idx => (optionIndices[idx] !== undefined ? optionIndices[idx] : idx));
-
-              const violated = step.violated_principle_indices || [];
-
-              // Sort for comparison
-              const userSorted = [...userOriginalIndices].sort((a, b) => a - b);
-              const violatedSorted = [...violated].sort((a, b) => a - b);
-
-              const isCorrect =
-                userSorted.length === violatedSorted.length &&
-                userSorted.every((val, index) => val === violatedSorted[index]);
-
-              // evaluateStep expects a visual index. It effectively does: original = optionIndices[visual].
-              // We need to pass a VISUAL index that maps to 0 (Correct) or 2 (Incorrect).
-              const visualCorrect = optionIndices.indexOf(0);
-              const visualIncorrect = optionIndices.indexOf(2);
-
-              // Fallback if shuffle is not active or weird
-              const finalIndex = isCorrect
-                ? (visualCorrect !== -1 ? visualCorrect : 0)
-                : (visualIncorrect !== -1 ? visualIncorrect : 2);
-
-              evaluateStep(finalIndex, userSorted);
-            }}
+            onAnswer={onViolatedPrinciplesAnswer}
             disabled={isFeedbackVisible}
           />
         );
@@ -2527,13 +3048,7 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
             <window.BonusTimer duration={bonusDuration} onExpire={() => { }} />
             */}
             <span style={{ color: COLORS.highlight }}>⚡️ {score.toLocaleString()}</span>
-            {(() => {
-              const t = formatTimer(simElapsed); return (
-                <span style={{ color: COLORS.textDim, fontSize: '11px', fontFamily: 'monospace', background: 'rgba(56, 130, 202, 0.15)', padding: '3px 8px', borderRadius: '6px' }}>
-                  ⏰ {t.m}<span style={{ opacity: colonVisible ? 1 : 0 }}>:</span>{t.s}
-                </span>
-              );
-            })()}
+            <window.Profiled id="SimClock"><window.SimClock /></window.Profiled>
           </div>
         </div>
 
@@ -2575,7 +3090,11 @@ window.HRSimulationApp = function ({ simulationData, uiVersion }) {
         </h3>
 
         {/* REMOVED: Explain This Question dropdown */}
-        {artefact}
+        {artefact && (
+          <window.Profiled id={`artefact:${step.interaction_type}`}>
+            <window.ArtefactTimer name={step.interaction_type} mountKey={viewKey}>{artefact}</window.ArtefactTimer>
+          </window.Profiled>
+        )}
 
       </div>
     );
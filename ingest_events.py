@@ -0,0 +1,158 @@
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ingest service for the analytics batches sent by analytics.js.
+#
+# Accepts POST /events with a JSON batch
+#
+#     {"v": 1, "session_id": "...", "sent_at": 1700000000000,
+#      "events": [{"name": "step_answer", "t": 1700000000000, "params": {...}}]}
+#
+# and appends one NDJSON line per event to gzip files in the log directory:
+#
+#     events/events-2026-10-18T10.ndjson.gz      (one file per UTC hour,
+#     events/events-2026-10-18T10.1.ndjson.gz     plus .1, .2... past MAX_BYTES)
+#
+# Every batch is written as its own gzip member, so a file is always readable
+# with gzip.open / zcat, even while it is being appended to.
+#
+# Usage: python ingest_events.py [port] [log_dir]
+
+PORT = 8787
+LOG_DIR = 'events'
+MAX_BYTES = 64 * 1024 * 1024
+MAX_BODY = 1024 * 1024
+BATCH_VERSION = 1
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_batch(body):
+    """Return the NDJSON records for one batch, or raise BatchError."""
+    try:
+        batch = json.loads(body)
+    except ValueError as e:
+        raise BatchError(f'invalid JSON: {e}')
+    if not isinstance(batch, dict) or batch.get('v') != BATCH_VERSION:
+        raise BatchError(f'expected a v{BATCH_VERSION} batch object')
+    events = batch.get('events')
+    if not isinstance(events, list):
+        raise BatchError('events should be a list')
+
+    received_at = int(time.time() * 1000)
+    records = []
+    for event in events:
+        if not isinstance(event, dict) or not isinstance(event.get('name'), str):
+            raise BatchError(f'event {event!r} needs a name')
+        records.append({
+            'name': event['name'],
+            't': event.get('t'),
+            'session_id': batch.get('session_id'),
+            'received_at': received_at,
+            'params': event.get('params') if isinstance(event.get('params'), dict) else {},
+        })
+    return records
+
+
+class EventLog:
+    """Append-only, hourly- and size-rotated gzip NDJSON log."""
+
+    def __init__(self, directory=LOG_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hour = None
+        self._part = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, hour, part):
+        suffix = f'.{part}' if part else ''
+        return os.path.join(self.directory, f'events-{hour}{suffix}.ndjson.gz')
+
+    def current_path(self):
+        hour = time.strftime('%Y-%m-%dT%H', time.gmtime())
+        if hour != self._hour:
+            self._hour, self._part = hour, 0
+        # Also picks up where a restarted server left off
+        while os.path.exists(self._path(hour, self._part)) and \
+                os.path.getsize(self._path(hour, self._part)) >= self.max_bytes:
+            self._part += 1
+        return self._path(hour, self._part)
+
+    def append(self, records):
+        if not records:
+            return
+        payload = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with self._lock:
+            with gzip.open(self.current_path(), 'at', encoding='utf-8') as f:
+                f.write(payload)
+
+
+class IngestHandler(BaseHTTPRequestHandler):
+    log = None
+
+    def _reply(self, status, message=None):
+        self.send_response(status)
+        # The app and the collector usually live on different origins
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        if message:
+            body = message.encode()
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.end_headers()
+
+    def do_OPTIONS(self):
+        self._reply(204)
+
+    def do_POST(self):
+        if self.path.split('?')[0] != '/events':
+            return self._reply(404, 'not found')
+        # The body is left unread on a rejected length, so the connection can't be reused
+        length = self.headers.get('Content-Length', '0').strip()
+        if not (length.isascii() and length.isdigit()):
+            self.close_connection = True
+            return self._reply(400, 'Content-Length must be a non-negative integer')
+        length = int(length)
+        if length > MAX_BODY:
+            self.close_connection = True
+            return self._reply(413, 'batch too large')
+        try:
+            records = parse_batch(self.rfile.read(length))
+        except BatchError as e:
+            return self._reply(400, str(e))
+        self.log.append(records)
+        self._reply(204)
+
+    def log_message(self, format, *args):
+        # One line per request is noise at beacon volumes
+        pass
+
+
+def serve(port=PORT, log_dir=LOG_DIR):
+    IngestHandler.log = EventLog(log_dir)
+    server = ThreadingHTTPServer(('', port), IngestHandler)
+    print(f'📥 Ingesting events on http://localhost:{port}/events into {log_dir}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    log_dir = sys.argv[2] if len(sys.argv) > 2 else LOG_DIR
+    serve(port, log_dir)
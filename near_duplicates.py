@@ -0,0 +1,235 @@
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+import zlib
+from array import array
+
+from build_cache import CACHE_DIR
+from compile_path import discover_paths, iter_path, simulation_id, step_key
+
+# Near-duplicate step detection across paths (MinHash + LSH).
+#
+# Every step's authored text (TEXT_FIELDS) is normalised into word 3-shingles
+# and summarised by a NUM_PERM-value MinHash signature. Signatures are split
+# into BANDS bands of ROWS values; steps that share any band land in the same
+# LSH bucket, and only bucket-mates are compared (by signature agreement,
+# an estimate of shingle Jaccard similarity). Buckets are walked against a
+# short list of representatives, so a big cluster costs one comparison per
+# member and the whole run stays roughly linear in the number of steps.
+#
+# Signatures are persisted in .build_cache/near_duplicates.json, keyed by
+# file (relative to the directory the index lives in, i.e. the repo root),
+# simulation_id and step_id together with a hash of the step's text, so a
+# rerun only shingles steps that are new or edited. Paths not named on the
+# command line stay in the index, which lets a CI run over one changed file
+# still catch copies of steps in every other path; a full run (no paths given)
+# drops the steps of files that no longer exist. By default only clusters that
+# involve a new or edited step are reported; --all reports every cluster.
+#
+# Usage: python near_duplicates.py [path.json ...] [--all] [--check] [--threshold 0.7]
+#        (default: every path config in the current directory; --check exits 1
+#        when anything is reported)
+
+INDEX_FILE = os.path.join(CACHE_DIR, 'near_duplicates.json')
+INDEX_VERSION = 2
+TEXT_FIELDS = ('instruction_question', 'prompt_template', 'prompt_text', 'blank_options')
+SHINGLE = 3
+NUM_PERM = 64
+BANDS = 16                       # 16 bands x 4 rows: ~50% LSH threshold, ~99% recall at 0.8
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7
+MERSENNE = (1 << 31) - 1
+
+_rng = random.Random(20240501)   # fixed: signatures must be comparable across runs
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE), _rng.randrange(0, MERSENNE)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def step_text(step):
+    parts = []
+    for field in TEXT_FIELDS:
+        value = step.get(field)
+        if isinstance(value, list):
+            parts.extend(v for v in value if isinstance(v, str))
+        elif isinstance(value, str):
+            parts.append(value)
+    return ' '.join(parts)
+
+
+def shingles(text):
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE:
+        return {zlib.crc32(' '.join(words).encode())} if words else set()
+    return {zlib.crc32(' '.join(words[i:i + SHINGLE]).encode()) for i in range(len(words) - SHINGLE + 1)}
+
+
+def signature(hashes):
+    return array('I', [min((a * h + b) % MERSENNE for h in hashes) for a, b in PERMUTATIONS])
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def band_keys(sig):
+    return [(band, tuple(sig[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+def source_key(src):
+    """Index key prefix of a path file: its path relative to the repo root (the working directory)."""
+    return os.path.relpath(src).replace(os.sep, '/')
+
+
+def iter_steps(src):
+    """Yield (key, step) for every step of a path config; key is 'file::simulation_id::step_id'."""
+    source = source_key(src)
+    with open(src, 'r') as f:
+        text = f.read()
+    for key, value in iter_path(text):
+        if key != 'simulations':
+            continue
+        for sim_position, simulation in enumerate(value):
+            sim_id = simulation_id(simulation) or f'#{sim_position + 1}'
+            for position, step in enumerate(simulation.get(step_key(simulation), [])):
+                step_id = step.get('step_id', position + 1)
+                yield f'{source}::{sim_id}::{step_id}', step
+
+
+class DuplicateIndex:
+    """Persisted MinHash signatures of every indexed step."""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.steps = {}
+        self.changed = set()
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get('v') == INDEX_VERSION and data.get('params') == self.params():
+            self.steps = data['steps']
+        self._signatures = {}
+
+    @staticmethod
+    def params():
+        return {'shingle': SHINGLE, 'perm': NUM_PERM, 'bands': BANDS, 'fields': list(TEXT_FIELDS)}
+
+    def update(self, src):
+        """Re-index one path file: (re)sign new or edited steps, drop removed ones."""
+        prefix = source_key(src) + '::'
+        seen = set()
+        for key, step in iter_steps(src):
+            seen.add(key)
+            text = step_text(step)
+            digest = hashlib.sha1(text.encode()).hexdigest()[:16]
+            entry = self.steps.get(key)
+            if entry and entry['h'] == digest:
+                continue
+            hashes = shingles(text)
+            if not hashes:
+                self.steps.pop(key, None)
+                continue
+            sig = signature(hashes)
+            self.steps[key] = {'h': digest, 'sig': base64.b64encode(sig.tobytes()).decode(), 'text': text[:160]}
+            self._signatures[key] = sig
+            self.changed.add(key)
+        for key in [k for k in self.steps if k.startswith(prefix) and k not in seen]:
+            del self.steps[key]
+
+    def evict_missing(self):
+        """Drop the steps of files that no longer exist. Returns the evicted keys."""
+        evicted = [key for key in self.steps if not os.path.exists(key.split('::', 1)[0])]
+        for key in evicted:
+            del self.steps[key]
+            self._signatures.pop(key, None)
+        return evicted
+
+    def signature(self, key):
+        sig = self._signatures.get(key)
+        if sig is None:
+            sig = self._signatures[key] = array('I', base64.b64decode(self.steps[key]['sig']))
+        return sig
+
+    def clusters(self, threshold=THRESHOLD):
+        """Groups of steps whose estimated similarity reaches `threshold`, largest first."""
+        parent = {}
+
+        def find(key):
+            parent.setdefault(key, key)
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        buckets = {}
+        for key in sorted(self.steps):
+            for band in band_keys(self.signature(key)):
+                buckets.setdefault(band, []).append(key)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            representatives = []
+            for key in members:
+                sig = self.signature(key)
+                for rep in representatives:
+                    if similarity(sig, self.signature(rep)) >= threshold:
+                        parent[find(key)] = find(rep)
+                        break
+                else:
+                    representatives.append(key)
+
+        groups = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=lambda g: (-len(g), g))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'v': INDEX_VERSION, 'params': self.params(), 'steps': self.steps}, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    report_all = '--all' in args
+    check = '--check' in args
+    threshold = THRESHOLD
+    if '--threshold' in args:
+        threshold = float(args[args.index('--threshold') + 1])
+        del args[args.index('--threshold'):args.index('--threshold') + 2]
+    sources = [arg for arg in args if not arg.startswith('--')]
+    full_run = not sources
+
+    start = time.perf_counter()
+    index = DuplicateIndex()
+    if full_run:
+        sources = discover_paths('.')
+        index.evict_missing()
+    for src in sources:
+        index.update(src)
+    clusters = index.clusters(threshold)
+    index.save()
+    if not report_all:
+        clusters = [group for group in clusters if index.changed.intersection(group)]
+
+    print(f'Indexed {len(index.steps)} steps ({len(index.changed)} new or edited) '
+          f'in {(time.perf_counter() - start) * 1000:.0f}ms')
+    for group in clusters:
+        first = index.signature(group[0])
+        print(f'\n{len(group)} near-duplicate steps:')
+        for key in group:
+            marker = '*' if key in index.changed else ' '
+            print(f" {marker} {key}  ({similarity(first, index.signature(key)):.2f})  {index.steps[key]['text'][:80]!r}")
+    if not clusters:
+        print('No near-duplicate steps' + ('' if report_all else ' among new or edited steps'))
+    sys.exit(1 if check and clusters else 0)
@@ -0,0 +1,216 @@
+import csv
+import sys
+
+from compile_path import apply_overlay, simulation_id
+from validate_path import validate_step
+
+try:
+    import openpyxl
+except ImportError:  # Optional: only needed for .xlsx sheets
+    openpyxl = None
+
+# Streaming import of step overlays (the V4 content rewrites) from a sheet.
+#
+# One row per (simulation_id, step_id); list cells (key points, options) hold
+# one entry per line. Rows are parsed and validated one at a time as they are
+# read, and StreamingOverlay applies them while the path streams through
+# compile_path, so only the rows of the current simulation are held in memory.
+# Rows must be grouped by simulation, in the same order as the path; rows for
+# simulations the path doesn't have are skipped (and reported as unused).
+#
+# Usage: python overlay_import.py overlays.csv   (validate only)
+
+COLUMNS = [
+    'simulation_id', 'step_id', 'interaction_type',
+    'theory_title', 'theory_key_points', 'instruction_question',
+    'prompt_text', 'clickable_options', 'correct_option_index',
+    'prompt_template', 'blank_options', 'correct_answer_index',
+    'outcome_correct', 'outcome_partially_correct', 'outcome_incorrect',
+    'immediate_feedback',
+]
+REQUIRED = ['simulation_id', 'step_id', 'interaction_type', 'theory_title', 'instruction_question',
+            'outcome_correct', 'outcome_partially_correct', 'outcome_incorrect', 'immediate_feedback']
+
+# interaction_type -> extra (column, kind) pairs copied into the overlay
+TYPE_COLUMNS = {
+    'clickable_prompt': [('prompt_text', str), ('clickable_options', list), ('correct_option_index', int)],
+    'fill_blank': [('prompt_template', str), ('blank_options', list), ('correct_answer_index', int)],
+}
+
+
+class OverlayError(ValueError):
+    pass
+
+
+def iter_rows(path):
+    """Yield (line_number, {column: text}) from a .csv or .xlsx sheet, one row at a time."""
+    if path.endswith('.xlsx'):
+        if openpyxl is None:
+            raise OverlayError(f'{path}: reading .xlsx needs openpyxl (pip install openpyxl)')
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, [])]
+        for line, values in enumerate(rows, start=2):
+            yield line, {key: '' if value is None else str(value) for key, value in zip(header, values)}
+        workbook.close()
+        return
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _lines(cell):
+    return [line.strip() for line in cell.splitlines() if line.strip()]
+
+
+def _int(cell, column, where):
+    try:
+        return int(float(cell))
+    except ValueError:
+        raise OverlayError(f'{where}: {column} should be a whole number, got {cell!r}')
+
+
+def row_to_overlay(row, where):
+    """Turn one sheet row into (simulation_id, step_id, overlay), validating it."""
+    row = {key: (value or '').strip() for key, value in row.items() if key}
+    missing = [column for column in REQUIRED if not row.get(column)]
+    if missing:
+        raise OverlayError(f'{where}: missing {", ".join(missing)}')
+
+    kind = row['interaction_type']
+    if kind not in TYPE_COLUMNS:
+        raise OverlayError(f'{where}: interaction_type must be one of {", ".join(TYPE_COLUMNS)}, got {kind!r}')
+
+    overlay = {
+        'theory': {'title': row['theory_title'], 'key_points': _lines(row.get('theory_key_points', ''))},
+        'instruction_question': row['instruction_question'],
+    }
+    for column, column_kind in TYPE_COLUMNS[kind]:
+        cell = row.get(column, '')
+        if not cell:
+            raise OverlayError(f'{where}: {kind} rows need {column}')
+        if column_kind is list:
+            overlay[column] = _lines(cell)
+        elif column_kind is int:
+            overlay[column] = _int(cell, column, where)
+        else:
+            overlay[column] = cell
+    overlay['interaction_type'] = kind
+    overlay['outcomes'] = {
+        'correct': row['outcome_correct'],
+        'partially_correct': row['outcome_partially_correct'],
+        'incorrect': row['outcome_incorrect'],
+    }
+    overlay['immediate_feedback'] = row['immediate_feedback']
+
+    # Check the step this row would produce against the engine's schema
+    step_id = _int(row['step_id'], 'step_id', where)
+    errors, _ = validate_step(apply_overlay({'step_id': step_id}, overlay))
+    if errors:
+        raise OverlayError(f'{where}: ' + '; '.join(errors))
+    return row['simulation_id'], step_id, overlay
+
+
+def iter_overlays(path):
+    """Yield validated (simulation_id, step_id, overlay) rows as they are read."""
+    for line, row in iter_rows(path):
+        if not any((value or '').strip() for value in row.values()):
+            continue
+        yield row_to_overlay(row, f'{path}:{line}')
+
+
+def load_overlays(path):
+    """Whole sheet as {simulation_id: {step_id: overlay}}, for compile_path.overlay_stage."""
+    content = {}
+    for sim_id, step_id, overlay in iter_overlays(path):
+        content.setdefault(sim_id, {})[step_id] = overlay
+    return content
+
+
+class StreamingOverlay:
+    """Compile stage that applies overlays straight from a row iterator.
+
+    `simulation_ids` lists the path's simulations in order (see
+    compile_path.path_simulation_ids). Holds the rows of the current
+    simulation plus one row of lookahead. Rows for simulations that are not
+    in the path are skipped; those and any other rows left over at the end
+    (steps missing from the path) are reported by `unused()`.
+    """
+
+    def __init__(self, overlays, simulation_ids):
+        self._rows = iter(overlays)
+        self._order = {sim_id: position for position, sim_id in enumerate(simulation_ids)}
+        self._sim = None
+        self._pending = {}
+        self._matched = set()
+        self._lookahead = None
+        self._unused = []
+
+    def _advance(self, sim_id):
+        # Simulations are compiled in order: whatever is left of the previous
+        # one was never matched, and the next group may already be waiting
+        self._unused.extend((self._sim, step_id) for step_id in self._pending if step_id not in self._matched)
+        self._pending = {}
+        self._matched = set()
+        self._sim = sim_id
+        if self._lookahead is not None and self._lookahead[0] == sim_id:
+            self._pending[self._lookahead[1]] = self._lookahead[2]
+            self._lookahead = None
+        if self._lookahead is None:
+            self._fill()
+
+    def _fill(self):
+        # Read rows of the current simulation until the group of a later one starts
+        current = self._order.get(self._sim, -1)
+        for row in self._rows:
+            sim_id, step_id, overlay = row
+            position = self._order.get(sim_id)
+            if position is None:
+                self._unused.append((sim_id, step_id))
+                continue
+            if sim_id != self._sim:
+                if position < current:
+                    raise OverlayError(f'overlay rows for {sim_id} must be grouped together, in path order')
+                self._lookahead = row
+                return
+            if step_id in self._pending:
+                raise OverlayError(f'duplicate overlay row for {sim_id} step {step_id}')
+            self._pending[step_id] = overlay
+
+    def step_input(self, simulation, step):
+        sim_id = simulation_id(simulation)
+        if sim_id != self._sim:
+            self._advance(sim_id)
+        step_id = step.get('step_id')
+        if step_id in self._pending:
+            self._matched.add(step_id)
+        return self._pending.get(step_id)
+
+    def __call__(self, simulation, steps):
+        for step_idx, step in steps:
+            new_content = self.step_input(simulation, step)
+            if new_content:
+                apply_overlay(step, new_content)
+            yield step_idx, step
+
+    def unused(self):
+        """(simulation_id, step_id) of every row that matched no step, once the path is compiled."""
+        leftover = self._unused + [(self._sim, step_id) for step_id in self._pending if step_id not in self._matched]
+        if self._lookahead is not None:
+            leftover.append(self._lookahead[:2])
+        leftover += [row[:2] for row in self._rows]
+        return leftover
+
+
+if __name__ == '__main__':
+    count = 0
+    try:
+        for src in sys.argv[1:]:
+            for count, _ in enumerate(iter_overlays(src), start=count + 1):
+                pass
+    except OverlayError as e:
+        print(f'❌ {e}')
+        sys.exit(1)
+    print(f'✅ {count} overlay rows valid')
@@ -0,0 +1,126 @@
+import html
+import os
+import re
+import sys
+
+from compile_path import iter_path, step_key
+
+# Build-time Start Hook Card.
+#
+# Renders a static HTML snapshot of each path's Start screen (path title, the
+# first simulation's metadata and the CTA) and writes it into index.html
+# between the start-hook markers, one <template id="start-hook-<simId>"> per
+# path. A small inline script in index.html clones the template for ?sim=
+# into #root as soon as the body is parsed (unless saved progress is past the
+# start of simulation 1), so the hook is on screen while the data, the engine
+# and React are still loading; AppWrapper (app.jsx) keeps showing it until
+# HRSimulationApp renders the same screen. A click on the CTA
+# before then is remembered (window.startHookClicked) and replayed.
+#
+# Keep the markup in step with the `screen === 'start'` branch of
+# hr-simulation.jsx. Colours come from window.COLORS in index.html.
+#
+# Usage: python prerender.py [simId ...]   (default: v4)
+
+PAGE = 'index.html'
+ACTIVE_PATHS = ['v4']
+BEGIN = '<!-- start-hook: generated by prerender.py -->'
+END = '<!-- /start-hook -->'
+
+
+def page_colors(page=PAGE):
+    """window.COLORS from index.html as a dict."""
+    with open(page, 'r') as f:
+        block = re.search(r'window\.COLORS = \{(.*?)\};', f.read(), re.S).group(1)
+    return dict(re.findall(r"(\w+): '([^']+)'", block))
+
+
+def path_summary(src):
+    """(path_title, first simulation_metadata, its step count, simulation count) of a path file."""
+    with open(src, 'r') as f:
+        text = f.read()
+    title, first, steps, count = None, None, 0, 0
+    for key, value in iter_path(text):
+        if key == 'path_title':
+            title = value
+        elif key == 'simulations':
+            for simulation in value:
+                if first is None:
+                    first = simulation.get('simulation_metadata', {})
+                    steps = len(simulation.get(step_key(simulation), []))
+                count += 1
+    if first is None:
+        raise ValueError(f'{src} has no simulations')
+    return title, first, steps, count
+
+
+def render_start_hook(src, colors):
+    title, meta, steps, count = path_summary(src)
+    c = colors
+    e = html.escape
+    parts = [
+        f'<div style="min-height: 100vh; background: linear-gradient(180deg, {c["bg"]} 0%, #091620 100%); display: flex; flex-direction: column; padding: 24px 20px; font-family: system-ui, -apple-system, sans-serif;">',
+        '<div style="flex: 1; display: flex; flex-direction: column; justify-content: center;">',
+        f'<div style="background: {c["highlightSoft"]}; color: {c["highlight"]}; font-size: 11px; font-weight: 600; letter-spacing: 0.5px; padding: 6px 12px; border-radius: 20px; align-self: flex-start; margin-bottom: 20px;">SIMULATION 1 OF {count}</div>',
+    ]
+    if title:
+        parts.append(f'<div style="font-size: 13px; color: {c["textMuted"]}; font-weight: 500;">{e(title)}</div>')
+    parts.append(f'<h1 style="font-size: 32px; font-weight: 300; color: {c["text"]}; line-height: 1.2; margin-bottom: 16px;">{e(meta.get("simulation_title", ""))}</h1>')
+    if meta.get('why_this_matters_for_getting_hired'):
+        parts += [
+            f'<div style="background: linear-gradient(135deg, rgba(64, 106, 255, 0.1) 0%, rgba(64, 106, 255, 0.05) 100%); border-radius: 16px; padding: 20px; margin-bottom: 24px; border: 1px solid {c["highlight"]}40; box-shadow: 0 4px 12px rgba(64, 106, 255, 0.1);">',
+            '<div style="display: flex; align-items: center; gap: 8px; margin-bottom: 10px;">',
+            '<span style="font-size: 18px;">🚀</span>',
+            f'<span style="font-size: 12px; color: {c["highlight"]}; font-weight: 700; text-transform: uppercase; letter-spacing: 0.5px;">WHY THIS MATTERS</span>',
+            '</div>',
+            f'<p style="font-size: 15px; color: {c["text"]}; line-height: 1.6; margin: 0; font-weight: 400;">{e(meta["why_this_matters_for_getting_hired"])}</p>',
+            '</div>',
+        ]
+    parts += [
+        f'<div style="display: flex; align-items: center; justify-content: flex-start; gap: 8px; margin-bottom: 40px; opacity: 0.8; background: {c["bgCard"]}; padding: 12px 16px; border-radius: 12px; border: 1px dashed {c["textDim"]};">',
+        '<span style="font-size: 18px;">🎓</span>',
+        f'<span style="font-size: 13px; color: {c["textMuted"]}; font-weight: 500; letter-spacing: 0.2px;">Certification &amp; Job Options available on completion</span>',
+        '</div>',
+        f'<div style="display: flex; align-items: center; gap: 8px; color: {c["textDim"]}; font-size: 13px; margin-bottom: 8px;">',
+        f'<span style="font-size: 16px;">⏱</span>{e(meta.get("estimated_time") or "15 minutes")} · {steps} critical decisions',
+        '</div>',
+        f'<div style="position: absolute; top: 24px; right: 20px; background: {c["highlightSoft"]}; color: {c["highlight"]}; font-size: 13px; font-weight: 700; padding: 8px 12px; border-radius: 12px;">⚡️ 0</div>',
+        '</div>',
+        '<div style="position: sticky; bottom: 0; padding: 20px 0; background: linear-gradient(180deg, rgba(9, 22, 32, 0) 0%, #091620 20%); z-index: 10; margin-top: auto;">',
+        f'<button id="start-hook-cta" style="width: 100%; padding: 18px; background: {c["cta"]}; border: none; border-radius: 14px; cursor: pointer; font-size: 16px; font-weight: 600; color: #0D2436; box-shadow: 0 4px 24px rgba(127, 194, 65, 0.3);">Start Simulation</button>',
+        '</div>',
+        '</div>',
+    ]
+    return ''.join(parts)
+
+
+def write_start_hooks(active_paths=ACTIVE_PATHS, page=PAGE):
+    """Re-render the start-hook templates in `page`. Returns the rendered simIds."""
+    colors = page_colors(page)
+    templates = []
+    for sim_id in active_paths:
+        markup = render_start_hook(f'{sim_id}.json', colors)
+        templates.append(f'    <template id="start-hook-{html.escape(sim_id)}">{markup}</template>\n')
+
+    with open(page, 'r') as f:
+        source = f.read()
+    start, end = source.find(BEGIN), source.find(END)
+    if start == -1 or end < start:
+        raise ValueError(f'{page} has no start-hook markers')
+    source = source[:start + len(BEGIN)] + '\n' + ''.join(templates) + '    ' + source[end:]
+
+    tmp = page + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(source)
+    os.replace(tmp, page)
+    return list(active_paths)
+
+
+if __name__ == '__main__':
+    paths = sys.argv[1:] or ACTIVE_PATHS
+    try:
+        write_start_hooks(paths)
+    except (FileNotFoundError, ValueError) as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    print(f'✅ Prerendered the start hook for {", ".join(paths)} into {PAGE}')
@@ -0,0 +1,303 @@
+import json
+import os
+import sys
+import time
+from itertools import compress, repeat
+
+from compile_path import simulation_id
+from step_timings import iter_log_files
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only needed to build reports, not to apply them
+    np = None
+
+# Columnar step analytics over the event logs written by ingest_events.py.
+#
+# Every log file is parsed once into NumPy columns (one row per step_answer
+# event) and cached next to it as .columns/<log name>.npz; rotated logs never
+# change, so later runs only parse new files. Everything after that is array
+# work: per (simulation_id, step_id) it computes
+#
+#     reached                distinct sessions that answered the step
+#     drop_off               share of them that answered no later step of the simulation
+#     first_attempts         sessions whose first attempt was recorded
+#     first_attempt_correct  share of those that were correct
+#     mean_attempts          answers per session on the step
+#     median_time, p75_time  first-attempt time on step (seconds)
+#
+# and calibrates
+#
+#     calibrated_difficulty  1 - first-attempt correctness, shrunk towards the
+#                            path-wide rate for steps with few answers (0..1)
+#     bonus_duration         p75 time of correct first attempts, clamped to
+#                            BONUS_RANGE; replaces the engine's length heuristic
+#
+# The report goes to content/step_report.json; `calibration_stage` copies the
+# last two onto the steps of the compiled path.
+#
+# Usage: python step_analytics.py [events/ or *.ndjson(.gz) ...]
+
+REPORT_FILE = os.path.join('content', 'step_report.json')
+COLUMN_DIR = '.columns'
+READ_BLOCK = 1 << 20       # characters read from a log at a time
+COLUMNS_VERSION = 2
+RESULTS = {'correct': 0, 'partial': 1, 'incorrect': 2}
+MIN_SAMPLES = 20          # steps with fewer first attempts are reported but not calibrated
+PRIOR_WEIGHT = 20         # pseudo-answers of the path-wide rate mixed into each step
+BONUS_RANGE = (10, 60)
+STEP_SPAN = 1 << 16       # step ids are packed with the simulation code into one int64 key
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError('step analytics needs NumPy (pip install numpy)')
+
+
+def _decode_events(lines):
+    """Decode NDJSON lines with one json.loads over the whole batch."""
+    if not lines:
+        return []
+    try:
+        return json.loads('[' + ','.join(lines) + ']')
+    except ValueError:
+        pass
+    # A torn or corrupt line: decode line by line, skipping the bad ones
+    events = []
+    for line in lines:
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events
+
+
+def _field(rows, key):
+    """Object array of `row.get(key)` for every dict in `rows` (mapped in C, no Python loop)."""
+    return np.fromiter(map(dict.get, rows, repeat(key)), dtype=object, count=len(rows))
+
+
+def _is(column, *kinds):
+    # Exact types, so True/False don't pass for numbers
+    types = np.fromiter(map(type, column), dtype=object, count=len(column))
+    return np.logical_or.reduce([types == kind for kind in kinds]) if len(column) else np.zeros(0, dtype=bool)
+
+
+def _parse_log(path):
+    """Bulk-decode a log file -> dict of column arrays for its step_answer events."""
+    import gzip
+
+    opener = gzip.open if path.endswith('.gz') else open
+    lines, tail = [], ''
+    with opener(path, 'rt', encoding='utf-8') as f:
+        # Read in blocks, keeping only answer lines (cheap pre-filter: most
+        # events are not answers); a line cut by the block end waits in `tail`
+        for block in iter(lambda: f.read(READ_BLOCK), ''):
+            block_lines = (tail + block).split('\n')
+            tail = block_lines.pop()
+            lines += [line for line in block_lines if '"step_answer"' in line]
+    if '"step_answer"' in tail:
+        lines.append(tail)
+    events = _decode_events(lines)
+    events = list(compress(events, _is(events, dict)))
+
+    # Each column is built by NumPy over all events at once
+    params = _field(events, 'params')
+    keep = (_field(events, 'name') == 'step_answer') & _is(params, dict)
+    events, params = list(compress(events, keep)), list(compress(params, keep))
+    keep = _is(_field(params, 'step_id'), int)
+    events, params = list(compress(events, keep)), list(compress(params, keep))
+
+    def text(column):
+        return np.where(_is(column, str), column, '').astype(str)
+
+    session_names, session = np.unique(text(_field(events, 'session_id')), return_inverse=True)
+    sim_names, sim = np.unique(text(_field(params, 'simulation_id')), return_inverse=True)
+    attempt = _field(params, 'attempt')
+    result = _field(params, 'result')
+    seconds = _field(params, 'time_taken')
+
+    return {
+        'v': np.array(COLUMNS_VERSION),
+        'session_names': session_names,
+        'sim_names': sim_names,
+        'session': session.astype(np.int64),
+        'sim': sim.astype(np.int64),
+        'step': _field(params, 'step_id').astype(np.int64),
+        'attempt': np.where(_is(attempt, int), attempt, 0).astype(np.int16),
+        'result': np.select([result == name for name in RESULTS], list(RESULTS.values()),
+                            RESULTS['incorrect']).astype(np.int8),
+        'seconds': np.where(_is(seconds, int, float), seconds, np.nan).astype(np.float64),
+    }
+
+
+def _columns_for(path):
+    cache = os.path.join(os.path.dirname(path), COLUMN_DIR, os.path.basename(path) + '.npz')
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        with np.load(cache) as data:
+            if int(data['v']) == COLUMNS_VERSION:
+                return {key: data[key] for key in data.files}
+    columns = _parse_log(path)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    tmp = cache + '.tmp.npz'
+    np.savez(tmp, **columns)
+    os.replace(tmp, cache)
+    return columns
+
+
+def _merge_codes(parts, names_key, codes_key):
+    # Per-file string tables -> one global table, remapping codes without a loop
+    names, inverse = np.unique(np.concatenate([part[names_key] for part in parts]), return_inverse=True)
+    codes, offset = [], 0
+    for part in parts:
+        size = len(part[names_key])
+        codes.append(inverse[offset:offset + size][part[codes_key]])
+        offset += size
+    return names, np.concatenate(codes)
+
+
+def load_columns(paths):
+    """Concatenated step_answer columns for every log under `paths`."""
+    _require_numpy()
+    parts = [_columns_for(path) for path in iter_log_files(paths)]
+    parts = [part for part in parts if len(part['step'])]
+    if not parts:
+        return None
+    columns = {key: np.concatenate([part[key] for part in parts])
+               for key in ('step', 'attempt', 'result', 'seconds')}
+    columns['session_names'], columns['session'] = _merge_codes(parts, 'session_names', 'session')
+    columns['sim_names'], columns['sim'] = _merge_codes(parts, 'sim_names', 'sim')
+    return columns
+
+
+def _group_quantile(keys, values, groups, q):
+    """q-quantile of `values` per group index in `keys` (NaN for empty groups)."""
+    out = np.full(groups, np.nan)
+    mask = ~np.isnan(values)
+    keys, values = keys[mask], values[mask]
+    if not len(keys):
+        return out
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    counts = np.bincount(keys, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    out[present] = values[starts[present] + ((counts[present] - 1) * q).astype(np.int64)]
+    return out
+
+
+def step_report(columns):
+    """Per-step metrics as {simulation_id: {step_id: {...}}}."""
+    step_key = columns['sim'] * STEP_SPAN + columns['step']
+    keys, inverse = np.unique(step_key, return_inverse=True)
+    groups = len(keys)
+
+    answers = np.bincount(inverse, minlength=groups)
+
+    # Distinct (session, step) pairs: how many learners reached each step
+    pairs = np.unique(columns['session'] * groups + inverse)
+    reached = np.bincount(pairs % groups, minlength=groups)
+
+    first = columns['attempt'] == 1
+    first_attempts = np.bincount(inverse[first], minlength=groups)
+    correct = np.bincount(inverse[first], weights=(columns['result'][first] == 0), minlength=groups)
+
+    seconds = np.where(first, columns['seconds'], np.nan)
+    median_time = _group_quantile(inverse, seconds, groups, 0.5)
+    p75_time = _group_quantile(inverse, seconds, groups, 0.75)
+    correct_seconds = np.where(first & (columns['result'] == 0), columns['seconds'], np.nan)
+    bonus = np.clip(np.round(_group_quantile(inverse, correct_seconds, groups, 0.75)), *BONUS_RANGE)
+
+    # Drop-off: sessions that answered this step but no later step of the same
+    # simulation, over the sessions that answered it. Per session, so resumes
+    # and deep links that skip steps can't push it below 0. Undefined for the
+    # last step of a simulation (keys are sorted by simulation, then step).
+    sims, steps = keys // STEP_SPAN, keys % STEP_SPAN
+    pair_group = pairs % groups
+    sim_span = int(sims.max()) + 1 if groups else 1
+    session_sims, session_sim = np.unique((pairs // groups) * sim_span + sims[pair_group], return_inverse=True)
+    last_step = np.full(len(session_sims), -1, dtype=np.int64)
+    np.maximum.at(last_step, session_sim, steps[pair_group])
+    dropped = np.bincount(pair_group[steps[pair_group] == last_step[session_sim]], minlength=groups)
+    has_next = np.append(sims[1:] == sims[:-1], False)
+    drop_off = np.where(has_next, np.clip(dropped / np.maximum(reached, 1), 0, 1), np.nan)
+
+    # Shrink small samples towards the path-wide first-attempt rate
+    prior = correct.sum() / max(first_attempts.sum(), 1)
+    difficulty = 1 - (correct + PRIOR_WEIGHT * prior) / (first_attempts + PRIOR_WEIGHT)
+
+    def number(value, digits=2):
+        return None if np.isnan(value) else round(float(value), digits)
+
+    report = {}
+    for idx in range(groups):
+        entry = {
+            'reached': int(reached[idx]),
+            'drop_off': number(drop_off[idx], 3),
+            'answers': int(answers[idx]),
+            'first_attempts': int(first_attempts[idx]),
+            'first_attempt_correct': number(correct[idx] / first_attempts[idx], 3) if first_attempts[idx] else None,
+            'mean_attempts': round(float(answers[idx] / reached[idx]), 2),
+            'median_time': number(median_time[idx], 1),
+            'p75_time': number(p75_time[idx], 1),
+        }
+        if first_attempts[idx] >= MIN_SAMPLES:
+            entry['calibrated_difficulty'] = number(difficulty[idx])
+            if not np.isnan(bonus[idx]):
+                entry['bonus_duration'] = int(bonus[idx])
+        report.setdefault(str(columns['sim_names'][sims[idx]]), {})[str(int(steps[idx]))] = entry
+    return report
+
+
+def load_report(path=REPORT_FILE):
+    """{simulation_id: {step_id: metrics}}, or {} before any report was built."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)['steps']
+
+
+def calibration_stage(report):
+    """Build a compile stage that copies calibrated_difficulty / bonus_duration onto steps."""
+
+    def stage(simulation, steps):
+        for step_idx, step in steps:
+            calibration = step_input(simulation, step)
+            if calibration:
+                step.update(calibration)
+            yield step_idx, step
+
+    def step_input(simulation, step):
+        metrics = report.get(simulation_id(simulation), {}).get(str(step.get('step_id')), {})
+        return {key: metrics[key] for key in ('calibrated_difficulty', 'bonus_duration') if key in metrics}
+
+    stage.step_input = step_input
+    return stage
+
+
+if __name__ == '__main__':
+    sources = sys.argv[1:] or ['events']
+    try:
+        start = time.perf_counter()
+        columns = load_columns(sources)
+    except RuntimeError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    if columns is None:
+        print(f'No step_answer events found in {", ".join(sources)}')
+        sys.exit(1)
+
+    report = step_report(columns)
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, 'w') as f:
+        json.dump({'v': 1, 'events': int(len(columns['step'])), 'steps': report}, f, indent=2, sort_keys=True)
+
+    print(f"✅ {len(columns['step'])} answers from {len(columns['session_names'])} sessions "
+          f"in {time.perf_counter() - start:.1f}s -> {REPORT_FILE}")
+    rows = [(sim_id, step_id, m) for sim_id, steps in report.items() for step_id, m in steps.items()]
+    rows.sort(key=lambda row: row[2].get('calibrated_difficulty') or 0, reverse=True)
+    print('Hardest steps:')
+    for sim_id, step_id, m in rows[:10]:
+        print(f"  {sim_id} step {step_id}: difficulty {m.get('calibrated_difficulty')}, "
+              f"{m['first_attempt_correct']} first-attempt correct, drop-off {m['drop_off']}, "
+              f"median {m['median_time']}s, bonus {m.get('bonus_duration')}s")
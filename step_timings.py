@@ -0,0 +1,138 @@
+import gzip
+import json
+import math
+import os
+import sys
+
+from compile_path import simulation_id
+
+# Per-step response-time sketches from recorded answers.
+#
+# Reads the step_answer events logged by ingest_events.py in one streaming
+# pass and builds a fixed log-scale histogram of first-attempt answer times
+# per (simulation_id, step_id). Bucket i holds times in (T0 * G^(i-1), T0 * G^i],
+# so a sketch is just its non-empty buckets with cumulative counts:
+#
+#     "response_times": {"n": 1840, "t0": 0.25, "g": 1.15,
+#                        "b": [9, 10, 11, ...], "c": [12, 57, 160, ..., 1840]}
+#
+# `timings_stage` attaches it to each step of the compiled path, and the
+# engine (responsePercentile in hr-simulation.jsx) binary-searches it to show
+# the share of learners who answered slower.
+#
+# Usage: python step_timings.py [events/ or *.ndjson(.gz) ...]   -> content/step_timings.json
+
+TIMINGS_FILE = os.path.join('content', 'step_timings.json')
+T0 = 0.25
+GROWTH = 1.15
+BUCKETS = 64          # up to ~28 minutes; slower answers share the last bucket (RESPONSE_BUCKETS in hr-simulation.jsx)
+MIN_SAMPLES = 20      # fewer answers than this is noise, not a percentile
+
+_LOG_GROWTH = math.log(GROWTH)
+
+
+def bucket(seconds):
+    if seconds <= T0:
+        return 0
+    return min(BUCKETS - 1, math.ceil(math.log(seconds / T0) / _LOG_GROWTH - 1e-9))
+
+
+def iter_log_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(('.ndjson', '.ndjson.gz')):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def iter_timings(files):
+    """Yield (simulation_id, step_id, seconds) for every first-attempt answer."""
+    for path in files:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                # Cheap pre-filter: most events are not answers
+                if '"step_answer"' not in line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                params = event.get('params') or {}
+                seconds = params.get('time_taken')
+                if event.get('name') != 'step_answer' or params.get('attempt') != 1 or \
+                        not isinstance(seconds, (int, float)) or seconds < 0:
+                    continue
+                yield params.get('simulation_id'), params.get('step_id'), seconds
+
+
+def build_sketches(timings):
+    """Fold (simulation_id, step_id, seconds) into {simulation_id: {step_id: sketch}}."""
+    counts = {}
+    for sim_id, step_id, seconds in timings:
+        key = (sim_id, str(step_id))
+        histogram = counts.get(key)
+        if histogram is None:
+            histogram = counts[key] = [0] * BUCKETS
+        histogram[bucket(seconds)] += 1
+
+    sketches = {}
+    for (sim_id, step_id), histogram in counts.items():
+        total = sum(histogram)
+        if total < MIN_SAMPLES:
+            continue
+        buckets, cumulative, running = [], [], 0
+        for idx, count in enumerate(histogram):
+            if count:
+                running += count
+                buckets.append(idx)
+                cumulative.append(running)
+        sketches.setdefault(sim_id, {})[step_id] = {
+            'n': total, 't0': T0, 'g': GROWTH, 'b': buckets, 'c': cumulative,
+        }
+    return sketches
+
+
+def load_sketches(path=TIMINGS_FILE):
+    """{simulation_id: {step_id: sketch}}, or {} before any timings were collected."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)['steps']
+
+
+def timings_stage(sketches):
+    """Build a compile stage that attaches `response_times` from a sketch map."""
+
+    def stage(simulation, steps):
+        for step_idx, step in steps:
+            sketch = step_input(simulation, step)
+            if sketch:
+                step['response_times'] = sketch
+            yield step_idx, step
+
+    def step_input(simulation, step):
+        return sketches.get(simulation_id(simulation), {}).get(str(step.get('step_id')))
+
+    stage.step_input = step_input
+    return stage
+
+
+if __name__ == '__main__':
+    sources = sys.argv[1:] or ['events']
+    answers = [0]
+
+    def counted(timings):
+        for timing in timings:
+            answers[0] += 1
+            yield timing
+
+    sketches = build_sketches(counted(iter_timings(iter_log_files(sources))))
+    os.makedirs(os.path.dirname(TIMINGS_FILE), exist_ok=True)
+    with open(TIMINGS_FILE, 'w') as f:
+        json.dump({'v': 1, 'steps': sketches}, f, indent=2, sort_keys=True)
+
+    steps = sum(len(s) for s in sketches.values())
+    print(f'✅ {answers[0]} first-attempt answers -> {steps} step sketches in {TIMINGS_FILE}')
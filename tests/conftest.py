@@ -0,0 +1,24 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The build scripts are top-level modules run from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def write_path(tmp_path):
+    """Write a path config {sim_id: [steps]} under tmp_path and return its path."""
+    def write(name, simulations, **top):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = dict(top, simulations=[
+            {'simulation_metadata': {'simulation_id': sim_id, 'simulation_title': sim_id}, 'step_level_design': steps}
+            for sim_id, steps in simulations.items()
+        ])
+        path.write_text(json.dumps(document, indent=2))
+        return str(path)
+    return write
@@ -0,0 +1,26 @@
+import os
+
+from build_all import build_all
+from compile_path import compile_path, rotate_question_types
+
+
+def mcq(step_id):
+    return {'step_id': step_id, 'options_inputs': [f'Best answer {step_id} is specific', 'Okay answer', 'Worst answer']}
+
+
+def test_parallel_build_matches_serial_and_reuses_cache(tmp_path, write_path):
+    for name in ('one.json', 'two.json'):
+        write_path(os.path.join('src', name), {'SIM_01': [mcq(1), mcq(2), mcq(3)], 'SIM_02': [mcq(1)]})
+    src_dir, out_dir = str(tmp_path / 'src'), str(tmp_path / 'build')
+
+    results = build_all(src_dir, out_dir, ('rotate',), workers=2)
+    assert [(os.path.basename(r['src']), r['simulations'], r['steps'], r['rebuilt']) for r in results] == [
+        ('one.json', 2, 4, 4), ('two.json', 2, 4, 4)]
+
+    serial = str(tmp_path / 'serial.json')
+    compile_path(os.path.join(src_dir, 'one.json'), serial, [rotate_question_types])
+    with open(serial, 'r') as expected, open(os.path.join(out_dir, 'one.json'), 'r') as built:
+        assert built.read() == expected.read()
+
+    again = build_all(src_dir, out_dir, ('rotate',), workers=2)
+    assert [(r['rebuilt'], r['reused']) for r in again] == [(0, 4), (0, 4)]
@@ -0,0 +1,55 @@
+import copy
+import os
+
+from build_cache import StepCache, cache_path
+from compile_path import compile_path, overlay_stage
+from conftest import ROOT
+from overlay_import import load_overlays
+
+SRC = os.path.join(ROOT, 'v3.json')
+
+
+def _build(dst, content, cached=True):
+    stages = [overlay_stage(content)]
+    cache = StepCache(SRC, dst, stages) if cached else None
+    compile_path(SRC, dst, stages, cache=cache)
+    if cache:
+        cache.save()
+    with open(dst, 'r') as f:
+        return f.read(), cache
+
+
+def test_rebuild_hits_and_overlay_edit_misses(tmp_path):
+    content = load_overlays(os.path.join(ROOT, 'content', 'v4_overlays.csv'))
+    dst = str(tmp_path / 'v4.json')
+
+    first, cache = _build(dst, content)
+    steps = cache.misses
+    assert cache.hits == 0 and steps > 0
+    assert os.path.exists(cache_path(dst))
+
+    second, cache = _build(dst, content)
+    assert (cache.hits, cache.misses) == (steps, 0)
+    assert second == first
+
+    # Editing one overlay row rebuilds exactly that step
+    edited = copy.deepcopy(content)
+    sim_id = sorted(edited)[0]
+    step_id = sorted(edited[sim_id])[0]
+    edited[sim_id][step_id]['immediate_feedback'] = 'Edited feedback.'
+    third, cache = _build(dst, edited)
+    assert (cache.hits, cache.misses) == (steps - 1, 1)
+    assert 'Edited feedback.' in third
+    assert third == _build(str(tmp_path / 'fresh.json'), edited, cached=False)[0]
+
+
+def test_cache_of_a_removed_source_is_evicted(tmp_path, write_path):
+    src = write_path('gone.json', {'SIM_01': [{'step_id': 1, 'options_inputs': ['a']}]})
+    dst = str(tmp_path / 'gone.out.json')
+    cache = StepCache(src, dst, [])
+    compile_path(src, dst, [], cache=cache)
+    cache.save()
+    os.remove(src)
+
+    StepCache(SRC, str(tmp_path / 'other.json'), [])
+    assert not os.path.exists(cache_path(dst))
@@ -0,0 +1,70 @@
+import json
+import os
+import re
+
+import pytest
+
+import build_sw
+from build_sw import SHELL, write_service_worker
+from bundle import MANIFEST, write_bundle, write_chunks
+from conftest import ROOT
+
+
+@pytest.fixture
+def dist(tmp_path, write_path, monkeypatch):
+    # cdn_scripts() reads the real index.html
+    monkeypatch.chdir(ROOT)
+    step = {'step_id': 1, 'options_inputs': ['a' * 400]}
+    src = write_path('v4.json', {'SIM_01': [step], 'SIM_02': [step], 'SIM_03': [step]})
+    out = str(tmp_path / 'dist')
+    write_chunks(src, out)
+    write_bundle(src, out)
+    return out
+
+
+def cache_name(path):
+    with open(path, 'r') as f:
+        return re.search(r'const CACHE = "([^"]+)"', f.read()).group(1)
+
+
+def test_precaches_shell_manifest_and_every_chunk(dist, tmp_path):
+    out = str(tmp_path / 'sw.js')
+    precache = write_service_worker(['v4'], out, dist)
+    with open(os.path.join(dist, MANIFEST), 'r') as f:
+        index = json.load(f)['chunked']['v4']['index']
+
+    assert precache[:len(SHELL)] == SHELL
+    assert f'{dist}/{MANIFEST}' in precache
+    assert f'{dist}/{index}' in precache
+    assert len([url for url in precache if '/v4/sim-' in url]) == 3
+    assert any(url.startswith('https://') for url in precache)
+    with open(out, 'r') as f:
+        assert json.dumps(precache, indent=2) in f.read()
+
+
+def test_large_paths_only_precache_the_first_chunk(dist, tmp_path, monkeypatch):
+    monkeypatch.setattr(build_sw, 'PRECACHE_LIMIT', 10)
+    precache = write_service_worker(['v4'], str(tmp_path / 'sw.js'), dist)
+    assert [url.rsplit('/', 1)[1][:6] for url in precache if '/v4/sim-' in url] == ['sim-01']
+
+
+def test_unchunked_paths_precache_the_bundle(dist, tmp_path):
+    with open(os.path.join(dist, MANIFEST), 'r') as f:
+        manifest = json.load(f)
+    del manifest['chunked']
+    with open(os.path.join(dist, MANIFEST), 'w') as f:
+        json.dump(manifest, f)
+    precache = write_service_worker(['v4'], str(tmp_path / 'sw.js'), dist)
+    assert f"{dist}/{manifest['paths']['v4']['file']}" in precache
+
+
+def test_cache_name_changes_only_with_outputs(dist, tmp_path, write_path):
+    out = str(tmp_path / 'sw.js')
+    write_service_worker(['v4'], out, dist)
+    first = cache_name(out)
+    write_service_worker(['v4'], out, dist)
+    assert cache_name(out) == first
+
+    write_chunks(write_path('v4.json', {'SIM_01': [{'step_id': 1, 'options_inputs': ['edited']}]}), dist)
+    write_service_worker(['v4'], out, dist)
+    assert cache_name(out) != first
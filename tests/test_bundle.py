@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from bundle import HASH_LENGTH, MANIFEST, REF_PREFIX, intern_strings, write_bundle, write_chunks, write_hashed
+from conftest import ROOT
+
+
+def inflate(node, strings):
+    # Python twin of inflateBundle in app.jsx
+    if isinstance(node, str):
+        return strings[int(node[1:])] if node.startswith(REF_PREFIX) else node
+    if isinstance(node, list):
+        return [inflate(item, strings) for item in node]
+    if isinstance(node, dict):
+        return {key: inflate(value, strings) for key, value in node.items()}
+    return node
+
+
+def test_interning_round_trips_a_real_path():
+    with open(os.path.join(ROOT, 'v4.json'), 'r') as f:
+        data = json.load(f)
+    table, tree = intern_strings(data)
+    assert table
+    assert inflate(tree, table) == data
+
+
+def test_only_repeats_that_save_bytes_are_interned():
+    long = 'Correct. Structured scoring keeps the comparison fair.'
+    data = {'a': [long, long, 'ok', 'ok', 'ok'], long: 1, 'n': 3, 'flag': True}
+    table, tree = intern_strings(data)
+    assert table == [long]
+    # Short strings stay inline and object keys are never replaced
+    assert tree == {'a': [REF_PREFIX + '0', REF_PREFIX + '0', 'ok', 'ok', 'ok'], long: 1, 'n': 3, 'flag': True}
+
+
+def test_reference_prefix_is_reserved():
+    with pytest.raises(ValueError):
+        intern_strings({'a': REF_PREFIX + 'x'})
+
+
+def test_write_bundle_outputs(tmp_path, write_path):
+    step = {'step_id': 1, 'outcomes': {'correct': 'A long repeated outcome text for every step.'}}
+    src = write_path('path.json', {'SIM_01': [step, dict(step, step_id=2)]})
+    out = str(tmp_path / 'dist')
+
+    entry = write_bundle(src, out)
+    with open(os.path.join(out, entry['file']), 'rb') as f:
+        payload = f.read()
+    bundle = json.loads(payload)
+    with open(src, 'r') as f:
+        assert inflate(bundle['d'], bundle['s']) == json.load(f)
+    assert entry['bytes'] == len(payload) and entry['strings'] == len(bundle['s']) == 1
+    with open(os.path.join(out, entry['file'] + '.gz'), 'rb') as f:
+        assert gzip.decompress(f.read()) == payload
+
+    with open(os.path.join(out, MANIFEST), 'r') as f:
+        assert json.load(f)['paths']['path'] == entry
+
+
+def test_chunks_split_a_path_into_index_and_simulations(tmp_path, write_path):
+    src = write_path('path.json', {
+        'SIM_01': [{'step_id': 1, 'options_inputs': ['a']}],
+        'SIM_02': [{'step_id': 1, 'options_inputs': ['b']}, {'step_id': 2, 'options_inputs': ['c']}],
+    }, path_title='Recruiting')
+    out = str(tmp_path / 'dist')
+
+    entry = write_chunks(src, out)
+    with open(os.path.join(out, entry['index']), 'r') as f:
+        index = json.load(f)
+    with open(src, 'r') as f:
+        source = json.load(f)
+    assert index['path'] == {'path_title': 'Recruiting'}
+    assert [(s['simulation_id'], s['step_count']) for s in index['simulations']] == [('SIM_01', 1), ('SIM_02', 2)]
+    assert entry['chunks'] == 2
+
+    chunk_dir = os.path.dirname(os.path.join(out, entry['index']))
+    for meta, simulation in zip(index['simulations'], source['simulations']):
+        with open(os.path.join(chunk_dir, meta['chunk']), 'r') as f:
+            chunk = json.load(f)
+        assert inflate(chunk['d'], chunk['s']) == simulation
+        assert meta['simulation_metadata'] == simulation['simulation_metadata']
+
+
+def _age(directory, prefix, seconds):
+    # mtime orders builds; push earlier ones back so the order doesn't depend on timer resolution
+    for name in os.listdir(directory):
+        if name.startswith(prefix):
+            path = os.path.join(directory, name)
+            os.utime(path, (os.path.getatime(path), os.path.getmtime(path) - seconds))
+
+
+def test_hashed_names_follow_content(tmp_path):
+    directory = str(tmp_path)
+    name, sizes = write_hashed(directory, 'app', b'one', '.js')
+    assert name.startswith('app.') and name.endswith('.js') and len(name) == len('app..js') + HASH_LENGTH
+    assert sizes['gzip_bytes'] == os.path.getsize(tmp_path / (name + '.gz'))
+    assert write_hashed(directory, 'app', b'one', '.js')[0] == name
+
+    _age(directory, 'app.', 20)
+    other, _ = write_hashed(directory, 'app', b'two', '.js')
+    assert other != name
+    # The previous build survives for pages still on the old manifest
+    assert sorted(f for f in os.listdir(tmp_path) if f.startswith('app.')) == sorted([name, name + '.gz', other, other + '.gz'])
+
+    _age(directory, 'app.', 10)
+    latest, _ = write_hashed(directory, 'app', b'three', '.js')
+    write_hashed(directory, 'app-extra', b'x', '.js')
+    # Only the build before it is kept; other stems are left alone
+    assert sorted(f for f in os.listdir(tmp_path) if f.startswith('app.')) == sorted([other, other + '.gz', latest, latest + '.gz'])
+    assert any(f.startswith('app-extra.') for f in os.listdir(tmp_path))
+
+
+def test_rebuilding_chunks_keeps_only_surviving_indexes(tmp_path, write_path):
+    step = {'step_id': 1, 'options_inputs': ['a']}
+    out = str(tmp_path / 'dist')
+    chunk_dir = os.path.join(out, 'path')
+    src = write_path('path.json', {'SIM_01': [step], 'SIM_02': [step], 'SIM_03': [step]})
+    write_chunks(src, out)
+    for sims in (['SIM_01', 'SIM_02'], ['SIM_01']):
+        _age(chunk_dir, '', 10)
+        write_path('path.json', {sim: [step] for sim in sims})
+        entry = write_chunks(src, out)
+
+    indexes = sorted(f for f in os.listdir(chunk_dir) if f.startswith('index.') and f.endswith('.json'))
+    assert len(indexes) == 2 and os.path.basename(entry['index']) in indexes
+    live = set(indexes)
+    for index in indexes:
+        with open(os.path.join(chunk_dir, index), 'r') as f:
+            live |= {s['chunk'] for s in json.load(f)['simulations']}
+    # The first build's index is pruned and SIM_03's chunk with it
+    assert {name.rsplit('.json', 1)[0] + '.json' for name in os.listdir(chunk_dir)} == live
+    assert len(live) == 4
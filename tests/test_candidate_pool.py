@@ -0,0 +1,74 @@
+import json
+import os
+
+from bundle import MANIFEST, write_chunks
+from candidate_pool import FLAGS, generate_pool, path_pools, pool_document, write_all_pools, write_pools
+
+SPEC = {'size': 300, 'seed': 11, 'role': 'Senior Recruiter', 'select': 4,
+        'must_have_skills': ['Full-cycle recruiting', 'Tech hiring', 'Remote onboarding']}
+
+
+def test_pools_are_deterministic_per_seed():
+    assert pool_document('S1', SPEC) == pool_document('S1', dict(SPEC))
+    assert pool_document('S1', SPEC) != pool_document('S1', dict(SPEC, seed=12))
+
+
+def test_candidates_are_sorted_and_consistent():
+    skills, candidates = generate_pool('S1', SPEC)
+    assert len(candidates) == 300
+    assert 'Remote onboarding' in skills
+    matches = [c['match'] for c in candidates]
+    assert matches == sorted(matches, reverse=True)
+    must_have = [skills.index(skill) for skill in SPEC['must_have_skills']]
+    for candidate in candidates:
+        assert 20 <= candidate['match'] <= 99
+        assert candidate['must_have'] == all(skill in candidate['skills'] for skill in must_have)
+    assert any(c['must_have'] for c in candidates)
+
+
+def test_indexes_match_the_columns():
+    document = pool_document('S1', SPEC)
+    columns, index = document['columns'], document['index']
+    assert document['size'] == len(columns['name']) == 300
+    assert document['select'] == 4
+    assert set(index['flags']) == {flag for flag, _ in FLAGS}
+    for flag, rows in index['flags'].items():
+        assert rows == [row for row, flags in enumerate(columns['flags']) if flag in flags]
+    assert len(index['skills']) == len(document['skills'])
+    for skill, rows in enumerate(index['skills']):
+        assert rows == [row for row, skills in enumerate(columns['skills']) if skill in skills]
+
+
+def test_write_pools_records_hashed_files(tmp_path, write_path):
+    src = write_path('demo.json', {'SIM_01': [{'step_id': 1, 'candidate_pool': 'S1'}]},
+                     candidate_pools={'S1': SPEC})
+    assert path_pools(src) == {'S1': SPEC}
+    out = str(tmp_path / 'dist')
+
+    entries = write_pools(src, out)
+    with open(os.path.join(out, entries['S1']['file']), 'r') as f:
+        assert json.load(f) == pool_document('S1', SPEC)
+    with open(os.path.join(out, MANIFEST), 'r') as f:
+        assert json.load(f)['pools']['demo'] == entries
+    assert write_pools(src, out) == entries
+
+    # Rebuilding the path's chunks (same directory) leaves the pool alone
+    write_chunks(src, out)
+    assert os.path.exists(os.path.join(out, entries['S1']['file']))
+
+
+def test_paths_without_pools(write_path, tmp_path):
+    src = write_path('plain.json', {'SIM_01': [{'step_id': 1}]})
+    assert write_pools(src, str(tmp_path / 'dist')) == {}
+
+
+def test_write_all_pools_covers_every_path(tmp_path, write_path):
+    write_path('src/a.json', {'SIM_01': [{'step_id': 1}]}, candidate_pools={'A': dict(SPEC, size=20)})
+    write_path('src/b.json', {'SIM_01': [{'step_id': 1}]}, candidate_pools={'B': dict(SPEC, size=30)})
+    write_path('src/plain.json', {'SIM_01': [{'step_id': 1}]})
+    out = str(tmp_path / 'dist')
+
+    built = write_all_pools(str(tmp_path / 'src'), out)
+    assert {os.path.basename(src): sorted(entries) for src, entries in built.items()} == {'a.json': ['A'], 'b.json': ['B']}
+    with open(os.path.join(out, MANIFEST), 'r') as f:
+        assert sorted(json.load(f)['pools']) == ['a', 'b']
@@ -0,0 +1,116 @@
+import json
+import os
+
+import compile_path as compile_path_module
+from compile_path import (apply_overlay, compile_path, discover_paths, iter_path, overlay_stage,
+                          parse_prompt_segments, path_simulation_ids, rotate_question_types,
+                          segment_prompts, simulation_id)
+from conftest import ROOT
+from overlay_import import load_overlays
+
+
+def _old_generator(src, transform):
+    # What generate_v3.py / generate_v4.py did before compile_path: load the
+    # whole document, patch it in memory, json.dump(indent=2)
+    with open(src, 'r') as f:
+        data = json.load(f)
+    for simulation in data['simulations']:
+        transform(simulation)
+    return json.dumps(data, indent=2)
+
+
+def test_rotate_matches_old_v3_generator(tmp_path):
+    src = os.path.join(ROOT, 'simulation_v2_1-5.json')
+    dst = str(tmp_path / 'v3.json')
+
+    def rotate(simulation):
+        steps = simulation['step_level_design']
+        simulation['step_level_design'] = [step for _, step in rotate_question_types(simulation, enumerate(steps))]
+
+    summary = compile_path(src, dst, [rotate_question_types])
+    with open(dst, 'r') as f:
+        assert f.read() == _old_generator(src, rotate)
+    assert summary and all(count > 0 for _, count in summary)
+
+
+def test_overlay_matches_old_v4_generator(tmp_path):
+    src = os.path.join(ROOT, 'v3.json')
+    dst = str(tmp_path / 'v4.json')
+    content = load_overlays(os.path.join(ROOT, 'content', 'v4_overlays.csv'))
+
+    def overlay(simulation):
+        overlays = content.get(simulation_id(simulation), {})
+        for step in simulation['step_level_design']:
+            if step['step_id'] in overlays:
+                apply_overlay(step, overlays[step['step_id']])
+
+    compile_path(src, dst, [overlay_stage(content)])
+    with open(dst, 'r') as f:
+        assert f.read() == _old_generator(src, overlay)
+
+
+def test_empty_and_non_list_values_keep_layout(tmp_path, write_path):
+    src = write_path('empty.json', {}, path_title='Empty', tags=[])
+    dst = str(tmp_path / 'out.json')
+    assert compile_path(src, dst, [rotate_question_types]) == []
+    with open(src, 'r') as f, open(dst, 'r') as out:
+        assert out.read() == f.read()
+
+
+def test_parse_prompt_segments():
+    segments = parse_prompt_segments('Write a {{0}}vague{{/0}} JD for {{1}}a role{{/1}}.')
+    assert segments == [
+        {'text': 'Write a '}, {'text': 'vague', 'option': 0},
+        {'text': ' JD for '}, {'text': 'a role', 'option': 1}, {'text': '.'},
+    ]
+    # Mismatched markers stay plain text
+    assert parse_prompt_segments('{{0}}x{{/1}}') == [{'text': '{{0}}x{{/1}}'}]
+
+
+def test_segment_prompts_only_keeps_segments_on_clickable_prompts():
+    steps = [
+        (0, {'interaction_type': 'clickable_prompt', 'prompt_text': 'Use {{0}}data{{/0}}.'}),
+        (1, {'interaction_type': 'fill_blank', 'prompt_segments': [{'text': 'stale'}]}),
+    ]
+    [(_, clickable), (_, blank)] = segment_prompts({}, steps)
+    assert clickable['prompt_segments'] == [{'text': 'Use '}, {'text': 'data', 'option': 0}, {'text': '.'}]
+    assert 'prompt_segments' not in blank
+
+
+def test_path_simulation_ids(write_path):
+    src = write_path('path.json', {'SIM_02': [{'step_id': 1}], 'SIM_01': []})
+    assert path_simulation_ids(src) == ['SIM_02', 'SIM_01']
+    assert path_simulation_ids(write_path('empty.json', {})) == []
+
+
+def _materialize(pairs):
+    return [(key, list(value) if key == 'simulations' else value) for key, value in pairs]
+
+
+def test_iter_path_reads_files_a_block_at_a_time(monkeypatch, write_path):
+    monkeypatch.setattr(compile_path_module, 'READ_SIZE', 16)
+    steps = [{'step_id': i, 'options_inputs': ['a' * i, 'é']} for i in range(1, 40)]
+    src = write_path('path.json', {'SIM_01': steps[:3], 'SIM_02': steps * 20}, version=12345, tail=[1.5e3, None])
+    with open(src, 'r') as f:
+        text = f.read()
+    with open(src, 'r') as f:
+        assert _materialize(iter_path(f)) == _materialize(iter_path(text))
+
+    # Only the first simulation has been read when it is handed out
+    with open(src, 'r') as f:
+        pairs = iter_path(f)
+        for key, value in pairs:
+            if key == 'simulations':
+                next(value)
+                assert f.tell() < len(text.encode()) / 2
+                break
+
+
+def test_discover_paths_only_returns_path_configs(tmp_path, write_path):
+    write_path('b.json', {'SIM_01': [{'step_id': 1}]})
+    write_path('a.json', {'SIM_01': [{'step_id': 1}]})
+    (tmp_path / 'empty.json').write_text('')
+    (tmp_path / 'list.json').write_text('[1, 2]')
+    (tmp_path / 'other.json').write_text('{"name": "not a path"}')
+    (tmp_path / 'notes.txt').write_text('{"simulations": []}')
+    assert discover_paths(str(tmp_path)) == [str(tmp_path / 'a.json'), str(tmp_path / 'b.json')]
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from content_index import ContentIndex, parse_query
+
+
+def step(step_id, question, kind='MCQ', **fields):
+    return dict({'step_id': step_id, 'interaction_type': kind, 'instruction_question': question}, **fields)
+
+
+@pytest.fixture
+def index(tmp_path, write_path):
+    write_path('v4.json', {
+        'SIM_01': [
+            step(1, 'Audit the shortlist for disparate impact',
+                 outcomes={'correct': 'Explicitly avoid proxies for protected groups.'}),
+            step(2, 'Rewrite the prompt with plain language',
+                 outcomes={'correct': 'Disparate wording confuses candidates; avoid it explicitly.'}),
+        ],
+        'SIM_02': [
+            step(1, 'Pick the blank', 'fill_blank', prompt_template='Avoid [____].',
+                 blank_options=['jargon', 'impact verbs'], correct_answer_index=0),
+        ],
+    })
+    content = ContentIndex(str(tmp_path / 'cache' / 'content_index.sqlite'))
+    content.update([str(tmp_path / 'v4.json')])
+    return content
+
+
+def found(results):
+    return [(row[2], row[3]) for _, row, _, _ in results]
+
+
+def test_parse_query():
+    assert parse_query('outcomes:"Explicitly avoid" impact type:fill_blank') == (
+        [('outcomes', ['explicitly', 'avoid'], True), (None, ['impact'], False)], {'type': 'fill_blank'})
+
+
+def test_bm25_ranks_weighted_fields_first(index):
+    # instruction_question is boosted over outcomes
+    results = index.search('disparate')
+    assert found(results) == [('SIM_01', '1'), ('SIM_01', '2')]
+    assert results[0][0] > results[1][0]
+    assert results[0][2] == 'instruction_question'
+    assert results[1][2] == 'outcomes.correct'
+
+
+def test_phrase_needs_consecutive_tokens(index):
+    assert found(index.search('"explicitly avoid"')) == [('SIM_01', '1')]
+    assert found(index.search('explicitly avoid')) == [('SIM_01', '1'), ('SIM_01', '2')]
+    # Positions do not run on from one list item into the next
+    assert found(index.search('"jargon impact"')) == []
+
+
+def test_field_and_filter_clauses(index):
+    assert found(index.search('options:impact')) == [('SIM_02', '1')]
+    assert found(index.search('impact type:fill_blank')) == [('SIM_02', '1')]
+    assert found(index.search('impact sim:SIM_01')) == [('SIM_01', '1')]
+    assert found(index.search('impact file:nowhere')) == []
+    assert index.search('') == []
+
+
+def test_best_field_sums_contributions_across_clauses(index):
+    # The first clause ('audit') only hits the question; the other three add up in outcomes
+    [(_, _, field, snippet)] = index.search('audit proxies protected groups')
+    assert field == 'outcomes.correct'
+    assert 'proxies for protected groups' in snippet
+
+
+def test_changed_and_removed_files_are_reindexed(index, tmp_path, write_path):
+    assert index.update() == []
+    write_path('v4.json', {'SIM_01': [step(1, 'Negotiate the offer')]})
+    assert index.update() == [os.path.normpath(str(tmp_path / 'v4.json'))]
+    assert found(index.search('negotiate')) == [('SIM_01', '1')]
+    assert index.search('disparate') == []
+
+    os.remove(tmp_path / 'v4.json')
+    index.update()
+    assert index.search('negotiate') == []
@@ -0,0 +1,106 @@
+import gzip
+import http.client
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import ingest_events
+from ingest_events import MAX_BODY, BatchError, EventLog, IngestHandler, parse_batch
+
+
+def batch(*names, **fields):
+    return dict({'v': 1, 'session_id': 's1', 'events': [{'name': name, 't': 1, 'params': {'n': 1}} for name in names]},
+                **fields)
+
+
+def read_log(directory):
+    lines = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as f:
+            lines.extend(json.loads(line) for line in f)
+    return lines
+
+
+def test_parse_batch_flattens_events():
+    [record] = parse_batch(json.dumps(batch('step_answer')))
+    assert {key: record[key] for key in ('name', 't', 'session_id', 'params')} == {
+        'name': 'step_answer', 't': 1, 'session_id': 's1', 'params': {'n': 1}}
+
+
+@pytest.mark.parametrize('body', [
+    'not json', '[]', json.dumps({'v': 2, 'events': []}), json.dumps({'v': 1, 'events': {}}),
+    json.dumps({'v': 1, 'events': [{'t': 1}]}),
+])
+def test_parse_batch_rejects_malformed_batches(body):
+    with pytest.raises(BatchError):
+        parse_batch(body)
+
+
+def test_log_rotates_past_max_bytes_and_stays_readable(tmp_path):
+    log = EventLog(str(tmp_path), max_bytes=200)
+    for i in range(20):
+        log.append(parse_batch(json.dumps(batch('step_answer', session_id=f's{i}'))))
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) > 1
+    assert all(name.startswith('events-') and name.endswith('.ndjson.gz') for name in names)
+    assert sorted(record['session_id'] for record in read_log(str(tmp_path))) == sorted(f's{i}' for i in range(20))
+
+    # Only the last part may still have room
+    full = [name for name in names if os.path.getsize(tmp_path / name) >= 200]
+    assert len(full) >= len(names) - 1
+
+    # A restarted server carries on where the running one would write next
+    assert EventLog(str(tmp_path), max_bytes=200).current_path() == log.current_path()
+
+
+def test_log_starts_a_new_file_every_hour(monkeypatch, tmp_path):
+    hour = ['2026-10-18T10']
+    monkeypatch.setattr(ingest_events.time, 'strftime', lambda fmt, t: hour[0])
+    log = EventLog(str(tmp_path))
+    log.append(parse_batch(json.dumps(batch('a'))))
+    hour[0] = '2026-10-18T11'
+    log.append(parse_batch(json.dumps(batch('b'))))
+    assert sorted(os.listdir(tmp_path)) == ['events-2026-10-18T10.ndjson.gz', 'events-2026-10-18T11.ndjson.gz']
+
+
+@pytest.fixture
+def server(tmp_path):
+    IngestHandler.log = EventLog(str(tmp_path / 'events'))
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), IngestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(server, body, path='/events', headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    connection.request('POST', path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    result = response.status, response.read().decode()
+    connection.close()
+    return result
+
+
+def test_post_appends_batch(server, tmp_path):
+    assert post(server, json.dumps(batch('step_answer', 'page_view')))[0] == 204
+    assert [record['name'] for record in read_log(str(tmp_path / 'events'))] == ['step_answer', 'page_view']
+
+
+def test_post_rejects_bad_batches_and_paths(server, tmp_path):
+    status, message = post(server, 'not json')
+    assert status == 400 and message.startswith('invalid JSON')
+    assert post(server, json.dumps(batch('x')), path='/other')[0] == 404
+    assert read_log(str(tmp_path / 'events')) == []
+
+
+@pytest.mark.parametrize('length, status', [
+    ('abc', 400), ('-1', 400), ('1_0', 400), (str(MAX_BODY + 1), 413),
+])
+def test_post_rejects_bad_content_length(server, tmp_path, length, status):
+    assert post(server, json.dumps(batch('x')), headers={'Content-Length': length})[0] == status
+    assert read_log(str(tmp_path / 'events')) == []
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from near_duplicates import DuplicateIndex, shingles, signature, similarity
+
+QUESTION = ('Your hiring manager wants a job description for a senior data scientist that avoids '
+            'invented culture claims and lists only the skills the team actually uses every day.')
+OTHER = 'Which interview question best reveals how a candidate handled a conflict with a stakeholder last year?'
+
+
+def step(step_id, text):
+    return {'step_id': step_id, 'interaction_type': 'MCQ', 'instruction_question': text, 'options_inputs': ['a']}
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    # Keys are relative to the repo root, i.e. the working directory
+    monkeypatch.chdir(tmp_path)
+    return DuplicateIndex(str(tmp_path / 'cache' / 'near_duplicates.json'))
+
+
+def test_signature_similarity_estimates_jaccard():
+    sig = signature(shingles(QUESTION))
+    assert similarity(sig, sig) == 1.0
+    assert similarity(sig, signature(shingles(OTHER))) < 0.2
+    assert similarity(sig, signature(shingles(QUESTION.replace('every day', 'each week')))) > 0.6
+
+
+def test_copies_across_files_cluster(index, write_path):
+    write_path('v4.json', {'SIM_01': [step(1, QUESTION), step(2, OTHER)]})
+    write_path('drafts/v4.json', {'SIM_05': [step(7, QUESTION.upper())]})
+    index.update('v4.json')
+    index.update(os.path.join('drafts', 'v4.json'))
+    # Same basename in two directories: keys stay apart
+    assert index.clusters() == [['drafts/v4.json::SIM_05::7', 'v4.json::SIM_01::1']]
+
+
+def test_unchanged_steps_are_not_resigned(index, write_path):
+    write_path('v4.json', {'SIM_01': [step(1, QUESTION), step(2, OTHER)]})
+    index.update('v4.json')
+    index.save()
+
+    reloaded = DuplicateIndex(index.path)
+    write_path('v4.json', {'SIM_01': [step(1, QUESTION), step(2, OTHER + ' Explain.')]})
+    reloaded.update('v4.json')
+    assert reloaded.changed == {'v4.json::SIM_01::2'}
+
+
+def test_removed_steps_and_files_drop_out(index, write_path, tmp_path):
+    write_path('v4.json', {'SIM_01': [step(1, QUESTION), step(2, OTHER)]})
+    write_path('old.json', {'SIM_01': [step(1, QUESTION)]})
+    index.update('v4.json')
+    index.update('old.json')
+
+    write_path('v4.json', {'SIM_01': [step(1, QUESTION)]})
+    index.update('v4.json')
+    assert sorted(index.steps) == ['old.json::SIM_01::1', 'v4.json::SIM_01::1']
+
+    os.remove(tmp_path / 'old.json')
+    assert index.evict_missing() == ['old.json::SIM_01::1']
+    assert index.clusters() == []
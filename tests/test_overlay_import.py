@@ -0,0 +1,128 @@
+import csv
+
+import pytest
+
+import overlay_import
+from overlay_import import COLUMNS, OverlayError, StreamingOverlay, iter_overlays, iter_rows, load_overlays
+
+ROW = {
+    'simulation_id': 'SIM_01', 'step_id': '1', 'interaction_type': 'fill_blank',
+    'theory_title': 'Bias-free language', 'theory_key_points': 'First point\nSecond point',
+    'instruction_question': 'Fill the blank.', 'prompt_template': 'Avoid [____] in a JD.',
+    'blank_options': 'jargon\nskills', 'correct_answer_index': '0',
+    'outcome_correct': 'Yes.', 'outcome_partially_correct': 'Almost.', 'outcome_incorrect': 'No.',
+    'immediate_feedback': 'Plain words.',
+}
+
+
+PATH_ORDER = ['SIM_01', 'SIM_02', 'SIM_03']
+
+
+def write_sheet(tmp_path, rows, name='overlays.csv'):
+    path = tmp_path / name
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**ROW, **row})
+    return str(path)
+
+
+def steps(*ids):
+    return [(idx, {'step_id': step_id, 'interaction_type': 'MCQ', 'options_inputs': ['a']})
+            for idx, step_id in enumerate(ids)]
+
+
+def test_rows_become_validated_overlays(tmp_path):
+    path = write_sheet(tmp_path, [{}, {'step_id': '2', 'simulation_id': 'SIM_02'}])
+    content = load_overlays(path)
+    assert sorted(content) == ['SIM_01', 'SIM_02']
+    overlay = content['SIM_01'][1]
+    assert overlay['theory'] == {'title': 'Bias-free language', 'key_points': ['First point', 'Second point']}
+    assert overlay['blank_options'] == ['jargon', 'skills']
+    assert overlay['correct_answer_index'] == 0
+
+
+def test_row_errors_name_the_sheet_line(tmp_path):
+    path = write_sheet(tmp_path, [{}, {'immediate_feedback': ''}])
+    with pytest.raises(OverlayError, match=r'overlays\.csv:\d+: missing immediate_feedback'):
+        list(iter_overlays(path))
+
+    path = write_sheet(tmp_path, [{'correct_answer_index': '5'}])
+    with pytest.raises(OverlayError, match='correct_answer_index 5 is outside blank_options'):
+        list(iter_overlays(path))
+
+    path = write_sheet(tmp_path, [{'interaction_type': 'MCQ'}])
+    with pytest.raises(OverlayError, match='interaction_type must be one of'):
+        list(iter_overlays(path))
+
+
+def test_streaming_overlay_applies_rows_in_path_order(tmp_path):
+    path = write_sheet(tmp_path, [{}, {'step_id': '9'}, {'simulation_id': 'SIM_02'}])
+    stage = StreamingOverlay(iter_overlays(path), PATH_ORDER)
+    first = [step for _, step in stage({'simulation_metadata': {'simulation_id': 'SIM_01'}}, steps(1, 2))]
+    second = [step for _, step in stage({'simulation_metadata': {'simulation_id': 'SIM_02'}}, steps(1))]
+    assert first[0]['interaction_type'] == 'fill_blank' and first[1]['interaction_type'] == 'MCQ'
+    assert second[0]['prompt_template'] == 'Avoid [____] in a JD.'
+    assert stage.unused() == [('SIM_01', 9)]
+
+
+def sim(sim_id):
+    return {'simulation_metadata': {'simulation_id': sim_id}}
+
+
+def test_streaming_overlay_skips_unknown_simulations(tmp_path):
+    # A row for a simulation the path doesn't have must not hold back later groups
+    path = write_sheet(tmp_path, [{}, {'simulation_id': 'SIM_99'}, {'simulation_id': 'SIM_03'}])
+    stage = StreamingOverlay(iter_overlays(path), PATH_ORDER)
+    compiled = {sim_id: [step for _, step in stage(sim(sim_id), steps(1))] for sim_id in PATH_ORDER}
+    assert compiled['SIM_01'][0]['interaction_type'] == 'fill_blank'
+    assert compiled['SIM_02'][0]['interaction_type'] == 'MCQ'
+    assert compiled['SIM_03'][0]['interaction_type'] == 'fill_blank'
+    assert stage.unused() == [('SIM_99', 1)]
+
+
+def test_streaming_overlay_rejects_out_of_order_sheet(tmp_path):
+    path = write_sheet(tmp_path, [{'simulation_id': 'SIM_03'}, {'simulation_id': 'SIM_02'}])
+    stage = StreamingOverlay(iter_overlays(path), PATH_ORDER)
+    list(stage(sim('SIM_01'), steps(1)))
+    list(stage(sim('SIM_02'), steps(1)))
+    with pytest.raises(OverlayError, match='overlay rows for SIM_02 must be grouped together'):
+        list(stage(sim('SIM_03'), steps(1)))
+
+
+def test_streaming_overlay_rejects_ungrouped_rows(tmp_path):
+    path = write_sheet(tmp_path, [{}, {'simulation_id': 'SIM_02'}, {'step_id': '2'}])
+    stage = StreamingOverlay(iter_overlays(path), PATH_ORDER)
+    list(stage({'simulation_metadata': {'simulation_id': 'SIM_01'}}, steps(1)))
+    with pytest.raises(OverlayError, match='overlay rows for SIM_01 must be grouped together'):
+        list(stage({'simulation_metadata': {'simulation_id': 'SIM_02'}}, steps(1)))
+
+
+def test_streaming_overlay_rejects_duplicate_rows(tmp_path):
+    path = write_sheet(tmp_path, [{}, {}])
+    stage = StreamingOverlay(iter_overlays(path), PATH_ORDER)
+    with pytest.raises(OverlayError, match='duplicate overlay row for SIM_01 step 1'):
+        list(stage({'simulation_metadata': {'simulation_id': 'SIM_01'}}, steps(1)))
+
+
+def test_xlsx_without_openpyxl(monkeypatch, tmp_path):
+    monkeypatch.setattr(overlay_import, 'openpyxl', None)
+    with pytest.raises(OverlayError, match='needs openpyxl'):
+        list(iter_rows(str(tmp_path / 'overlays.xlsx')))
+
+
+def test_xlsx_rows_match_csv(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    rows = [{}, {'step_id': '2'}]
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(COLUMNS)
+    for row in rows:
+        merged = {**ROW, **row}
+        # Numbers come back from a sheet as floats
+        sheet.append([float(merged[c]) if c in ('step_id', 'correct_answer_index') else merged.get(c, '')
+                      for c in COLUMNS])
+    path = tmp_path / 'overlays.xlsx'
+    workbook.save(path)
+    assert load_overlays(str(path)) == load_overlays(write_sheet(tmp_path, rows))
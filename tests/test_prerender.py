@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pytest
+
+from conftest import ROOT
+from prerender import BEGIN, END, page_colors, render_start_hook, write_start_hooks
+
+
+@pytest.fixture
+def page(tmp_path, monkeypatch):
+    # Path files are looked up as <simId>.json in the working directory
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(os.path.join(ROOT, 'index.html'), tmp_path / 'index.html')
+    return str(tmp_path / 'index.html')
+
+
+def simulation_steps(count):
+    return [{'step_id': i + 1, 'options_inputs': ['a']} for i in range(count)]
+
+
+def test_card_shows_path_and_first_simulation(page, write_path):
+    src = write_path('demo.json', {'SIM_01': simulation_steps(4), 'SIM_02': simulation_steps(1)},
+                     path_title='Hiring <Basics> & more')
+    markup = render_start_hook(src, page_colors(page))
+    assert 'SIMULATION 1 OF 2' in markup
+    assert 'Hiring &lt;Basics&gt; &amp; more' in markup
+    assert '4 critical decisions' in markup
+    assert 'id="start-hook-cta"' in markup
+    assert page_colors(page)['cta'] in markup
+
+
+def test_templates_replace_the_marked_block(page, write_path):
+    write_path('demo.json', {'SIM_01': simulation_steps(2)}, path_title='First')
+    write_start_hooks(['demo'], page)
+    with open(page, 'r') as f:
+        once = f.read()
+    assert once.count('<template id="start-hook-demo">') == 1
+    assert '<template id="start-hook-v4">' not in once
+
+    write_start_hooks(['demo'], page)
+    with open(page, 'r') as f:
+        assert f.read() == once
+
+    write_path('demo.json', {'SIM_01': simulation_steps(2)}, path_title='Second')
+    write_start_hooks(['demo'], page)
+    with open(page, 'r') as f:
+        text = f.read()
+    assert 'Second' in text and 'First' not in text
+    assert text.index(BEGIN) < text.index('start-hook-demo') < text.index(END)
+
+
+def test_missing_markers_or_simulations_are_errors(page, write_path, tmp_path):
+    write_path('empty.json', {})
+    with pytest.raises(ValueError, match='has no simulations'):
+        write_start_hooks(['empty'], page)
+
+    write_path('demo.json', {'SIM_01': simulation_steps(1)})
+    bare = tmp_path / 'bare.html'
+    with open(page, 'r') as f:
+        bare.write_text(f.read().replace(BEGIN, ''))
+    with pytest.raises(ValueError, match='has no start-hook markers'):
+        write_start_hooks(['demo'], str(bare))
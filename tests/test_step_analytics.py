@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from step_analytics import COLUMN_DIR, MIN_SAMPLES, calibration_stage, load_columns, step_report  # noqa: E402
+
+
+def answer(session, step, attempt=1, result='correct', seconds=10.0, sim='SIM_01'):
+    return {'name': 'step_answer', 'session_id': session, 't': 0,
+            'params': {'simulation_id': sim, 'step_id': step, 'attempt': attempt, 'result': result,
+                       'time_taken': seconds}}
+
+
+def write_log(path, events, torn=False):
+    lines = [json.dumps(event) for event in events]
+    if torn:
+        lines.insert(1, '{"name": "step_answer", "params": {')
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def report(tmp_path):
+    events = [
+        answer('a', 1), answer('a', 2), answer('a', 3),
+        answer('b', 1), answer('b', 2),
+        answer('c', 1, result='incorrect', seconds=30.0), answer('c', 1, attempt=2),
+        # d deep-linked past step 2
+        answer('d', 1, seconds=20.0), answer('d', 3),
+        {'name': 'page_view', 'session_id': 'a', 'params': {}},
+    ]
+    return step_report(load_columns([write_log(tmp_path / 'events.ndjson', events, torn=True)]))['SIM_01']
+
+
+def test_reached_answers_and_first_attempts(report):
+    assert [report[s]['reached'] for s in ('1', '2', '3')] == [4, 2, 2]
+    assert report['1']['answers'] == 5
+    assert report['1']['mean_attempts'] == 1.25
+    assert report['1']['first_attempt_correct'] == 0.75
+    assert report['1']['median_time'] == 10.0
+
+
+def test_drop_off_is_per_session(report):
+    # Step 1: only c answered no later step; step 2: b stopped there
+    assert report['1']['drop_off'] == 0.25
+    assert report['2']['drop_off'] == 0.5
+    # The last step of a simulation has nowhere to drop off to
+    assert report['3']['drop_off'] is None
+    assert all(0 <= entry['drop_off'] <= 1 for entry in report.values() if entry['drop_off'] is not None)
+
+
+def test_small_samples_are_not_calibrated(report):
+    assert 'calibrated_difficulty' not in report['1']
+
+
+def test_calibration_over_many_sessions(tmp_path):
+    events = [answer(f's{i}', 1, result='correct' if i % 4 else 'incorrect', seconds=float(10 + i % 20))
+              for i in range(MIN_SAMPLES * 2)]
+    entry = step_report(load_columns([write_log(tmp_path / 'events.ndjson', events)]))['SIM_01']['1']
+    assert entry['first_attempt_correct'] == 0.75
+    assert 0 < entry['calibrated_difficulty'] < 1
+    assert 10 <= entry['bonus_duration'] <= 60
+
+    stage = calibration_stage({'SIM_01': {'1': entry}})
+    [(_, step)] = stage({'simulation_metadata': {'simulation_id': 'SIM_01'}}, [(0, {'step_id': 1})])
+    assert step == {'step_id': 1, 'calibrated_difficulty': entry['calibrated_difficulty'],
+                    'bonus_duration': entry['bonus_duration']}
+
+
+def test_logs_are_merged_and_columns_cached(tmp_path):
+    first = write_log(tmp_path / 'a.ndjson', [answer('x', 1), answer('y', 1, sim='SIM_02')])
+    second = write_log(tmp_path / 'b.ndjson', [answer('x', 2), answer('z', 1, sim='SIM_02')])
+    columns = load_columns([str(tmp_path)])
+    assert sorted(columns['session_names']) == ['x', 'y', 'z']
+    assert (tmp_path / COLUMN_DIR / 'a.ndjson.npz').exists()
+
+    report = step_report(load_columns([first, second]))
+    assert report['SIM_01']['1']['drop_off'] == 0.0
+    assert report['SIM_02']['1']['reached'] == 2
+
+
+def test_fields_are_read_in_any_order_and_unescaped(tmp_path):
+    path = tmp_path / 'events.ndjson'
+    path.write_text('\n'.join([
+        # Compact server form, params in another order
+        '{"name":"step_answer","t":1,"session_id":"s\\u00e9","params":{"time_taken":12.5,"attempt":1,'
+        '"result":"partial","step_id":2,"simulation_id":"SIM_\\"01"}}',
+        # Missing attempt and null time
+        json.dumps({'params': {'step_id': 3, 'simulation_id': 'SIM_01', 'time_taken': None}, 'name': 'step_answer'}),
+        # Not an integer step_id, or another event naming step_answer in its params
+        json.dumps(answer('x', 1.5)),
+        json.dumps({'name': 'page_view', 'params': {'label': 'step_answer', 'step_id': 1}}),
+    ]) + '\n')
+    columns = load_columns([str(path)])
+    assert list(columns['session_names']) == ['', 'sé']
+    assert list(columns['sim_names']) == ['SIM_"01', 'SIM_01']
+    assert columns['step'].tolist() == [2, 3]
+    assert columns['attempt'].tolist() == [1, 0]
+    assert columns['result'].tolist() == [1, 2]
+    assert columns['seconds'][0] == 12.5 and np.isnan(columns['seconds'][1])
+    assert 't' not in columns
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from step_timings import (BUCKETS, GROWTH, MIN_SAMPLES, T0, bucket, build_sketches, iter_timings,
+                          timings_stage)
+
+
+def test_bucket_bounds():
+    assert bucket(0) == bucket(T0) == 0
+    # Bucket i holds (T0 * G^(i-1), T0 * G^i]
+    for i in (1, 10, 40):
+        assert bucket(T0 * GROWTH ** i) == i
+        assert bucket(T0 * GROWTH ** i * 1.001) == i + 1
+    assert bucket(T0 * GROWTH ** (BUCKETS + 5)) == BUCKETS - 1
+    assert bucket(10 ** 9) == BUCKETS - 1
+
+
+def test_sketch_buckets_and_cumulative_counts():
+    times = [1.0] * 10 + [5.0] * 15 + [60.0] * 5
+    sketches = build_sketches(('SIM_01', 3, t) for t in times)
+    sketch = sketches['SIM_01']['3']
+    assert sketch['n'] == 30
+    assert sketch['b'] == [bucket(1.0), bucket(5.0), bucket(60.0)]
+    assert sketch['c'] == [10, 25, 30]
+
+
+def test_steps_below_min_samples_have_no_sketch():
+    sketches = build_sketches(('SIM_01', 1, 2.0) for _ in range(MIN_SAMPLES - 1))
+    assert sketches == {}
+
+
+def test_only_first_attempts_are_read(tmp_path):
+    log = tmp_path / 'events.ndjson'
+    events = [
+        {'name': 'step_answer', 'params': {'simulation_id': 'S', 'step_id': 1, 'attempt': 1, 'time_taken': 4}},
+        {'name': 'step_answer', 'params': {'simulation_id': 'S', 'step_id': 1, 'attempt': 2, 'time_taken': 9}},
+        {'name': 'step_answer', 'params': {'simulation_id': 'S', 'step_id': 2, 'attempt': 1, 'time_taken': None}},
+        {'name': 'page_view', 'params': {'step_answer': True}},
+    ]
+    log.write_text('\n'.join(json.dumps(e) for e in events) + '\n{"name": "step_answer", torn\n')
+    assert list(iter_timings([str(log)])) == [('S', 1, 4)]
+
+
+@pytest.mark.parametrize('step_id', [3, '3'])
+def test_timings_stage_matches_step_ids_as_strings(step_id):
+    sketch = {'n': 20, 't0': T0, 'g': GROWTH, 'b': [4], 'c': [20]}
+    stage = timings_stage({'SIM_01': {'3': sketch}})
+    simulation = {'simulation_metadata': {'simulation_id': 'SIM_01'}}
+    [(_, step)] = stage(simulation, [(0, {'step_id': step_id})])
+    assert step['response_times'] == sketch
@@ -0,0 +1,95 @@
+import pytest
+
+from validate_path import CHECKS, SCHEMAS, step_index, validate_file, validate_stage, validate_step
+
+
+def fill_blank(**fields):
+    step = {'step_id': 1, 'interaction_type': 'fill_blank', 'prompt_template': 'Avoid [____] in a JD.',
+            'blank_options': ['jargon', 'skills'], 'correct_answer_index': 0}
+    step.update(fields)
+    return step
+
+
+def clickable(**fields):
+    step = {'step_id': 2, 'interaction_type': 'clickable_prompt',
+            'prompt_text': 'Write {{0}}a vague{{/0}} JD for {{1}}a role{{/1}}.', 'clickable_options': ['a vague', 'a role']}
+    step.update(fields)
+    return step
+
+
+def test_valid_steps_pass():
+    assert validate_step(fill_blank()) == ([], [])
+    assert validate_step(clickable()) == ([], [])
+
+
+@pytest.mark.parametrize('kind', sorted(SCHEMAS))
+def test_every_schema_field_is_required(kind):
+    for field in SCHEMAS[kind]:
+        errors, _ = validate_step({'step_id': 1, 'interaction_type': kind})
+        assert f'{kind} step is missing {field}' in errors
+
+
+def test_schema_type_errors():
+    errors, _ = validate_step(fill_blank(correct_answer_index='0'))
+    assert errors == ['correct_answer_index should be int, got str']
+    # bool is an int subclass but never a valid index
+    errors, _ = validate_step(fill_blank(correct_answer_index=True))
+    assert errors == ['correct_answer_index should be int, got bool']
+
+
+def test_checks_only_cover_known_types():
+    assert set(CHECKS) <= set(SCHEMAS)
+
+
+def test_fill_blank_checks():
+    errors, _ = validate_step(fill_blank(prompt_template='No blank here.', correct_answer_index=2))
+    assert errors == ['prompt_template has no [____] blank', 'correct_answer_index 2 is outside blank_options (0..1)']
+
+
+def test_clickable_prompt_checks():
+    errors, _ = validate_step(clickable(clickable_options=['a vague']))
+    assert errors == ['marker {{1}} has no entry in clickable_options (1 options)']
+
+    errors, _ = validate_step(clickable(clickable_options=['a vague', 'a role', 'unused']))
+    assert errors == ['clickable_options [2] have no {{n}}...{{/n}} marker in prompt_text']
+
+    errors, warnings = validate_step(clickable(clickable_options=['something else', 'a role']))
+    assert errors == []
+    assert warnings == ["marker {{0}} text 'a vague' does not match clickable_options[0] 'something else'"]
+
+    errors, _ = validate_step(clickable(prompt_segments=[{'text': 'stale'}]))
+    assert errors == ['prompt_segments is out of date with prompt_text']
+
+
+def test_violated_principles_and_find_error_checks():
+    errors, _ = validate_step({'step_id': 1, 'interaction_type': 'violated_principles', 'problematic_prompt': 'x',
+                               'available_principles': ['a', 'b'], 'violated_principle_indices': [1, 2]})
+    assert errors == ['violated_principle_indices entry 2 is outside available_principles (0..1)']
+
+    errors, _ = validate_step({'step_id': 1, 'interaction_type': 'find_error',
+                               'segments': [{'id': 0, 'text': 'x', 'is_error': False}]})
+    assert errors == ['no segment is marked is_error']
+
+
+def test_unknown_or_missing_type_only_warns():
+    assert validate_step({'step_id': 1, 'interaction_type': 'hologram'}) == (
+        [], ["unknown interaction_type 'hologram' (rendered as plain options)"])
+    assert validate_step({'options_inputs': ['a']}) == (
+        ['missing step_id'], ['missing interaction_type (rendered as plain options)'])
+
+
+def test_validate_stage_attaches_index_and_fails_on_errors():
+    simulation = {'simulation_metadata': {'simulation_id': 'SIM_01'}}
+    [(_, step)] = validate_stage(simulation, [(0, fill_blank())])
+    assert step['step_index'] == step_index(step) == {'type': 'fill_blank', 'option_count': 2, 'correct_index': 0}
+
+    with pytest.raises(ValueError, match='SIM_01 step 1: blank_options is empty'):
+        list(validate_stage(simulation, [(0, fill_blank(blank_options=[]))]))
+
+
+def test_validate_file_locates_problems(write_path):
+    src = write_path('path.json', {'SIM_01': [fill_blank(), fill_blank(step_id=2, blank_options=[])]})
+    assert validate_file(src) == [
+        ('error', 'SIM_01 step 2', 'blank_options is empty'),
+        ('error', 'SIM_01 step 2', 'correct_answer_index 0 is outside blank_options (0..-1)'),
+    ]
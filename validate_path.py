@@ -0,0 +1,218 @@
+import sys
+
+from compile_path import PROMPT_MARKER, discover_paths, iter_path, parse_prompt_segments, simulation_id, step_key
+
+# Build-time schema check for simulation configs.
+#
+# The engine in hr-simulation.jsx picks an artefact per `interaction_type`
+# and silently skips any branch whose fields are missing. Here every step is
+# checked against the schema of its interaction type instead, so broken
+# content fails the build (or CI) rather than rendering a blank artefact.
+#
+# `validate_stage` also attaches a precomputed `step_index` to each step:
+#
+#     {"type": "fill_blank", "option_count": 4, "correct_index": 0}
+#
+# where `correct_index` is a list for multi-answer types (violated_principles,
+# find_error). The engine trusts it instead of re-checking shapes.
+#
+# Usage: python validate_path.py [path.json ...]   (exit code 1 on errors)
+
+BLANK = '[____]'
+
+# interaction_type -> {field: expected type}
+SCHEMAS = {
+    'clickable_prompt': {'prompt_text': str, 'clickable_options': list},
+    'fill_blank': {'prompt_template': str, 'blank_options': list, 'correct_answer_index': int},
+    'violated_principles': {'problematic_prompt': str, 'available_principles': list, 'violated_principle_indices': list},
+    'find_error': {'segments': list},
+    'tap_sequence': {'options_inputs': list, 'required_selections': (int, dict)},
+    'MCQ': {'options_inputs': list},
+    'selection': {'options_inputs': list},
+    'ordering': {'options_inputs': list},
+    'comparison': {'options_inputs': list},
+    'fill_blanks': {'options_inputs': list},
+    'diagram completion': {'options_inputs': list},
+    'trade-off meters': {},
+}
+
+# Where each type keeps the options the learner chooses between
+OPTION_FIELDS = {
+    'clickable_prompt': 'clickable_options',
+    'fill_blank': 'blank_options',
+    'violated_principles': 'available_principles',
+    'find_error': 'segments',
+}
+
+
+def _check_clickable_prompt(step, warnings):
+    errors = []
+    options = step['clickable_options']
+    seen = set()
+    for start, text, end in PROMPT_MARKER.findall(step['prompt_text']):
+        if start != end:
+            errors.append(f'marker {{{{{start}}}}} is closed by {{{{/{end}}}}}')
+            continue
+        n = int(start)
+        if n in seen:
+            errors.append(f'marker {{{{{n}}}}} appears more than once')
+        seen.add(n)
+        if n >= len(options):
+            errors.append(f'marker {{{{{n}}}}} has no entry in clickable_options ({len(options)} options)')
+        elif options[n] != text:
+            # The engine shows the marker text, so this is only a content smell
+            warnings.append(f'marker {{{{{n}}}}} text {text!r} does not match clickable_options[{n}] {options[n]!r}')
+    missing = sorted(set(range(len(options))) - seen)
+    if missing:
+        errors.append(f'clickable_options {missing} have no {{{{n}}}}...{{{{/n}}}} marker in prompt_text')
+    if 'prompt_segments' in step and step['prompt_segments'] != parse_prompt_segments(step['prompt_text']):
+        errors.append('prompt_segments is out of date with prompt_text')
+    return errors
+
+
+def _check_fill_blank(step, warnings):
+    errors = []
+    if BLANK not in step['prompt_template']:
+        errors.append(f'prompt_template has no {BLANK} blank')
+    if not step['blank_options']:
+        errors.append('blank_options is empty')
+    if not 0 <= step['correct_answer_index'] < len(step['blank_options']):
+        errors.append(f"correct_answer_index {step['correct_answer_index']} is outside blank_options "
+                      f"(0..{len(step['blank_options']) - 1})")
+    return errors
+
+
+def _check_violated_principles(step, warnings):
+    errors = []
+    count = len(step['available_principles'])
+    if not step['violated_principle_indices']:
+        errors.append('violated_principle_indices is empty')
+    for idx in step['violated_principle_indices']:
+        if not isinstance(idx, int) or not 0 <= idx < count:
+            errors.append(f'violated_principle_indices entry {idx!r} is outside available_principles (0..{count - 1})')
+    return errors
+
+
+def _check_find_error(step, warnings):
+    errors = []
+    for segment in step['segments']:
+        if not isinstance(segment, dict) or not {'id', 'text', 'is_error'} <= set(segment):
+            errors.append(f'segment {segment!r} needs id, text and is_error')
+            return errors
+    if not any(segment['is_error'] for segment in step['segments']):
+        errors.append('no segment is marked is_error')
+    return errors
+
+
+def _check_tap_sequence(step, warnings):
+    # Two variants, see TapSequenceQuestion
+    if 'artefact_prompt_template' in step:
+        if not isinstance(step.get('blank_order'), list):
+            return ['fill-blanks variant needs a blank_order list']
+        missing = [b for b in step['blank_order'] if f'[{b}]' not in step['artefact_prompt_template']]
+        return [f'blank_order entries {missing} do not appear in artefact_prompt_template'] if missing else []
+    if 'artefact_prompt_displayed' in step:
+        required = step['required_selections']
+        if not isinstance(required, dict) or not {'flags', 'replacements'} <= set(required):
+            return ['flag-and-replace variant needs required_selections with flags and replacements']
+        return []
+    return ['needs artefact_prompt_template or artefact_prompt_displayed']
+
+
+def _check_options(step, warnings):
+    return [] if step.get('options_inputs') else ['options_inputs is empty']
+
+
+CHECKS = {
+    'clickable_prompt': _check_clickable_prompt,
+    'fill_blank': _check_fill_blank,
+    'violated_principles': _check_violated_principles,
+    'find_error': _check_find_error,
+    'tap_sequence': _check_tap_sequence,
+    'MCQ': _check_options,
+    'selection': _check_options,
+    'ordering': _check_options,
+    'comparison': _check_options,
+}
+
+
+def validate_step(step):
+    """Return (errors, warnings) for one step."""
+    errors, warnings = [], []
+    if 'step_id' not in step:
+        errors.append('missing step_id')
+
+    kind = step.get('interaction_type')
+    if kind is None:
+        warnings.append('missing interaction_type (rendered as plain options)')
+        return errors, warnings
+    if kind not in SCHEMAS:
+        warnings.append(f'unknown interaction_type {kind!r} (rendered as plain options)')
+        return errors, warnings
+
+    for field, expected in SCHEMAS[kind].items():
+        if field not in step:
+            errors.append(f'{kind} step is missing {field}')
+        elif not isinstance(step[field], expected) or isinstance(step[field], bool):
+            errors.append(f'{field} should be {getattr(expected, "__name__", expected)}, got {type(step[field]).__name__}')
+    if not errors and kind in CHECKS:
+        errors.extend(CHECKS[kind](step, warnings))
+    return errors, warnings
+
+
+def step_index(step):
+    """The precomputed {type, option_count, correct_index} for a valid step."""
+    kind = step.get('interaction_type')
+    options = step.get(OPTION_FIELDS.get(kind, 'options_inputs')) or []
+    if kind == 'fill_blank':
+        correct = step['correct_answer_index']
+    elif kind == 'violated_principles':
+        correct = sorted(step['violated_principle_indices'])
+    elif kind == 'find_error':
+        correct = [segment['id'] for segment in options if segment['is_error']]
+    else:
+        # Option 0 is the correct answer (1 partially correct) everywhere else
+        correct = 0
+    return {'type': kind, 'option_count': len(options), 'correct_index': correct}
+
+
+def validate_stage(simulation, steps):
+    """Compile stage: fail on invalid steps, attach `step_index` to valid ones."""
+    sim_id = simulation_id(simulation)
+    for step_idx, step in steps:
+        errors, _ = validate_step(step)
+        if errors:
+            raise ValueError(f"{sim_id} step {step.get('step_id', step_idx + 1)}: " + '; '.join(errors))
+        step['step_index'] = step_index(step)
+        yield step_idx, step
+
+
+def validate_file(path):
+    """Return a list of (level, location, message) for every problem in a path file."""
+    with open(path, 'r') as f:
+        text = f.read()
+    problems = []
+    for key, value in iter_path(text):
+        if key != 'simulations' or isinstance(value, list):
+            continue
+        for simulation in value:
+            sim_id = simulation_id(simulation)
+            for step_idx, step in enumerate(simulation.get(step_key(simulation), [])):
+                location = f"{sim_id} step {step.get('step_id', step_idx + 1)}"
+                errors, warnings = validate_step(step)
+                problems.extend(('error', location, message) for message in errors)
+                problems.extend(('warning', location, message) for message in warnings)
+    return problems
+
+
+if __name__ == '__main__':
+    sources = sys.argv[1:] or discover_paths('.')
+    error_count = 0
+    for src in sources:
+        problems = validate_file(src)
+        errors = [p for p in problems if p[0] == 'error']
+        error_count += len(errors)
+        print(f"{'❌' if errors else '✅'} {src}: {len(errors)} errors, {len(problems) - len(errors)} warnings")
+        for level, location, message in problems:
+            print(f'  {level}: {location}: {message}')
+    sys.exit(1 if error_count else 0)